@@ -125,5 +125,9 @@ admin.site.unregister(OutstandingToken)
 
 @admin.register(OutstandingToken)
 class OutstandingTokenAdmin(_OutstandingTokenAdmin):
+    # 토큰은 갱신할 때마다 쌓이므로, 유저 순 정렬과 전체 개수 조회를 하지 않습니다.
+    ordering = ("-id",)
+    show_full_result_count = False
+
     def has_delete_permission(self, *args, **kwargs):
         return True
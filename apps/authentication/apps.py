@@ -5,3 +5,6 @@ class AuthenticationConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.authentication"
     verbose_name = "Authentication"
+
+    def ready(self):
+        from apps.authentication import schema, signals  # noqa: F401
@@ -0,0 +1,55 @@
+"""
+요청마다 유저를 조회하지 않는 JWT 인증입니다.
+
+기본 JWTAuthentication 은 인증된 모든 요청에서 토큰의 uuid 로 유저를 조회합니다.
+Access Token 의 유효 기간은 짧으므로(5분), 토큰에 담긴 pk, uuid, is_staff, is_active 로
+유저를 만들고 나머지 필드는 지연 로딩(deferred)합니다.
+다른 필드를 처음 사용할 때 한 번의 쿼리로 나머지 필드를 모두 조회합니다. (User.refresh_from_db)
+
+토큰의 claim 은 발급 시점의 값입니다. 토큰을 갱신할 때마다 유저를 조회하여 비활성화된 유저는
+거부하고 새 토큰에 현재 값을 담으므로(apps.authentication.serializers.RefreshSerializer),
+is_staff, is_active 의 변경은 이미 발급된 Access Token 이 만료되면(ACCESS_TOKEN_LIFETIME) 반영됩니다.
+"""
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from apps.authentication.tokens import IS_ACTIVE_CLAIM, USER_CLAIMS
+
+
+def build_token_user(validated_token):
+    """
+    토큰의 claim 으로 유저를 만듭니다. claim 에 없는 필드는 deferred 상태가 됩니다.
+    """
+    User = get_user_model()
+    values = {field: validated_token[claim] for claim, field in USER_CLAIMS.items()}
+    values[api_settings.USER_ID_FIELD] = uuid.UUID(
+        validated_token[api_settings.USER_ID_CLAIM]
+    )
+    fields = [
+        field.attname for field in User._meta.concrete_fields if field.attname in values
+    ]
+    return User.from_db(
+        router.db_for_read(User), fields, [values[field] for field in fields]
+    )
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    토큰의 claim 으로 유저를 만드는 JWT 인증입니다.
+    claim 이 없는 이전에 발급된 토큰은 기본 JWTAuthentication 처럼 유저를 조회합니다.
+    """
+
+    def get_user(self, validated_token):
+        claims = (api_settings.USER_ID_CLAIM, *USER_CLAIMS)
+        if any(claim not in validated_token for claim in claims):
+            return super().get_user(validated_token)
+
+        if not validated_token[IS_ACTIVE_CLAIM]:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return build_token_user(validated_token)
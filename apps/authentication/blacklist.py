@@ -0,0 +1,200 @@
+"""
+Refresh Token 블랙리스트 확인 앞에 두는, 프로세스 메모리 안의 Bloom filter 입니다.
+
+토큰을 갱신하거나 로그아웃할 때마다 Refresh Token 이 블랙리스트에 있는지 확인합니다.
+블랙리스트에 추가된 토큰의 jti 를 Bloom filter 에 담아 두고, Bloom filter 에 없는
+토큰은 데이터베이스를 조회하지 않고 블랙리스트에 없다고 판단합니다.
+Bloom filter 에 있는 토큰만 데이터베이스에서 확인하므로, 오탐은 쿼리 한 번으로 끝납니다.
+
+- 토큰이 블랙리스트에 추가되면 signal 을 통해 이 프로세스의 Bloom filter 에 바로 추가되고,
+  트랜잭션이 커밋된 뒤 Django 캐시(ALIAS)의 버전이 새로운 값으로 바뀝니다.
+  (apps.authentication.signals)
+- 모든 프로세스는 확인할 때마다 버전을 읽고, 버전이 바뀌었다면 마지막으로 읽은 id 이후의
+  BlacklistedToken 을 읽어 Bloom filter 에 추가합니다. 따라서 다른 프로세스에서 추가된 토큰은
+  버전이 바뀐 직후의 확인부터 거부됩니다.
+- 먼저 id 를 받았지만 늦게 커밋된 행을 놓치지 않도록, 읽은 id 사이의 빈 id 를 최대 MAX_GAPS 개
+  기억해 두고 TTL 초 동안 함께 읽습니다.
+- 캐시에서 버전이 사라지더라도 새로운 버전을 만들어 다시 읽으며, TTL 초가 지나면 버전과
+  관계없이 다시 읽습니다.
+- ALIAS 가 프로세스 메모리 캐시(LocMemCache 등)라면 다른 프로세스에 버전이 전달되지 않으므로,
+  Bloom filter 를 사용하지 않고 항상 데이터베이스에서 확인합니다.
+- 블랙리스트는 삭제되지 않는 한 줄어들지 않으므로, Bloom filter 도 항목을 제거하지 않습니다.
+  만료되어 삭제된 토큰(purge_tokens)은 오탐만 늘리며, 추가된 항목이 용량을 넘으면
+  데이터베이스에서 다시 만듭니다.
+"""
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Max, Min, Q
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from core.utils.bloom import BloomFilter
+from core.utils.cache import is_shared_cache
+
+
+class TokenBlacklistFilter:
+    """
+    jti 가 블랙리스트에 있는지 확인하는 Bloom filter 와, 다른 프로세스와의 동기화입니다.
+    """
+
+    VERSION_KEY = "token-blacklist:version"
+
+    def __init__(
+        self, alias: str, capacity: int, error_rate: float, ttl: float, max_gaps: int
+    ):
+        self.alias = alias
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.ttl = ttl
+        self.max_gaps = max_gaps
+        self.skipped = self.lookups = self.false_positives = self.syncs = 0
+        self._bloom: BloomFilter | None = None
+        self._last_id = 0
+        self._gaps: dict[int, float] = {}
+        self._version = None
+        self._synced_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    @property
+    def enabled(self) -> bool:
+        """
+        다른 프로세스와 버전을 나눌 수 있어 Bloom filter 를 사용할 수 있는지 반환합니다.
+        """
+        return is_shared_cache(self.alias)
+
+    def is_blacklisted(self, jti: str) -> bool:
+        """
+        jti 가 블랙리스트에 있는지 반환합니다.
+        Bloom filter 에 있을 때에만 데이터베이스를 조회합니다.
+        """
+        if self.enabled:
+            self.sync()
+        with self._lock:
+            if self.enabled and self._bloom is not None and jti not in self._bloom:
+                self.skipped += 1
+                return False
+            self.lookups += 1
+
+        blacklisted = BlacklistedToken.objects.filter(token__jti=jti).exists()
+        if not blacklisted:
+            with self._lock:
+                self.false_positives += 1
+        return blacklisted
+
+    def add(self, jti: str):
+        """
+        이 프로세스에서 블랙리스트에 추가된 jti 를 Bloom filter 에 추가합니다.
+        """
+        with self._lock:
+            if self._bloom is not None:
+                self._add(jti)
+
+    def bump_version(self):
+        """
+        다른 프로세스가 블랙리스트를 다시 읽도록 버전을 바꿉니다.
+
+        캐시에 따라 incr 은 원자적이지 않으므로(파일 캐시 등), 동시에 바꾸더라도 읽은 버전과
+        겹치지 않는 새로운 값을 저장합니다. 이 프로세스도 다음 확인에서 다시 읽습니다.
+        """
+        if self.enabled:
+            self.shared.set(self.VERSION_KEY, uuid.uuid4().hex, None)
+
+    def sync(self):
+        """
+        버전이 바뀌었거나 TTL 이 지났다면, 새로 추가된 BlacklistedToken 을 읽습니다.
+        """
+        version = self.shared.get(self.VERSION_KEY)
+        if version is None:
+            # 버전이 없다면, 사라진 버전과 겹치지 않는 새로운 버전으로 시작합니다.
+            self.shared.add(self.VERSION_KEY, uuid.uuid4().hex, None)
+            version = self.shared.get(self.VERSION_KEY)
+        with self._lock:
+            if (
+                self._bloom is not None
+                and not self._bloom.saturated
+                and version == self._version
+                and time.monotonic() - self._synced_at < self.ttl
+            ):
+                return
+
+            if self._bloom is None or self._bloom.saturated:
+                self._rebuild()
+
+            now = time.monotonic()
+            rows = (
+                BlacklistedToken.objects.filter(
+                    Q(id__gt=self._last_id) | Q(id__in=list(self._gaps))
+                )
+                .order_by("id")
+                .values_list("id", "token__jti")
+            )
+            for token_id, jti in rows.iterator():
+                self._add(jti)
+                self._gaps.pop(token_id, None)
+                if token_id > self._last_id:
+                    gaps = token_id - self._last_id - 1
+                    if self._last_id and len(self._gaps) + gaps <= self.max_gaps:
+                        for gap in range(self._last_id + 1, token_id):
+                            self._gaps[gap] = now
+                    self._last_id = token_id
+
+            self._gaps = {
+                gap: found_at
+                for gap, found_at in self._gaps.items()
+                if now - found_at < self.ttl
+            }
+            self._version = version
+            self._synced_at = now
+            self.syncs += 1
+
+    def clear(self):
+        """
+        Bloom filter 와 통계를 모두 제거합니다. 다음 확인에서 데이터베이스를 다시 읽습니다.
+        """
+        with self._lock:
+            self._bloom = None
+            self._last_id = 0
+            self._gaps = {}
+            self._version = None
+            self.skipped = self.lookups = self.false_positives = self.syncs = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            checks = self.skipped + self.lookups
+            return {
+                "skipped": self.skipped,
+                "lookups": self.lookups,
+                "false_positives": self.false_positives,
+                "syncs": self.syncs,
+                "entries": self._bloom.count if self._bloom else 0,
+                "skip_rate": self.skipped / checks if checks else 0,
+            }
+
+    def _rebuild(self):
+        # 블랙리스트의 행 수는 id 의 범위를 넘지 않으므로, 테이블을 세지 않고 크기를 정합니다.
+        ids = BlacklistedToken.objects.aggregate(min_id=Min("id"), max_id=Max("id"))
+        rows = ids["max_id"] - ids["min_id"] + 1 if ids["max_id"] else 0
+        self._bloom = BloomFilter(max(self.capacity, rows * 2), self.error_rate)
+        self._last_id = 0
+        self._gaps = {}
+
+    def _add(self, jti: str):
+        # 다시 읽은 jti 는 다시 세지 않습니다.
+        if jti not in self._bloom:
+            self._bloom.add(jti)
+
+
+blacklist_filter = TokenBlacklistFilter(
+    alias=settings.TOKEN_BLACKLIST_FILTER["ALIAS"],
+    capacity=settings.TOKEN_BLACKLIST_FILTER["CAPACITY"],
+    error_rate=settings.TOKEN_BLACKLIST_FILTER["ERROR_RATE"],
+    ttl=settings.TOKEN_BLACKLIST_FILTER["TTL"],
+    max_gaps=settings.TOKEN_BLACKLIST_FILTER["MAX_GAPS"],
+)
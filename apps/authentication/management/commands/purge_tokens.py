@@ -0,0 +1,80 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+
+class Command(BaseCommand):
+    help = """
+    만료된 OutstandingToken 과 그 BlacklistedToken 을 삭제합니다.
+
+    토큰을 갱신할 때마다 두 테이블에 행이 추가되므로, 주기적으로 실행해야 합니다.
+    만료된 토큰은 블랙리스트와 관계없이 사용할 수 없으므로 삭제해도 안전합니다.
+
+    simplejwt 의 flushexpiredtokens 는 만료된 토큰을 한 번에 메모리로 읽어 삭제하므로,
+    이 명령어는 id 순서로 batch-size 개씩 나누어 각각 하나의 트랜잭션에서 삭제합니다.
+    토큰은 발급된 순서로 만료되므로, 만료된 토큰은 앞쪽 id 에 모여 있습니다.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="운영 중인 데이터베이스의 부하를 줄이기 위해 batch 사이에 쉬는 시간(초)입니다.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="삭제하지 않고, 삭제할 토큰의 수만 셉니다.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        dry_run = options["dry_run"]
+        now = timezone.now()
+
+        last_id = outstanding_count = blacklisted_count = 0
+        while True:
+            ids = list(
+                OutstandingToken.objects.filter(id__gt=last_id, expires_at__lte=now)
+                .order_by("id")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+
+            if dry_run:
+                blacklisted_count += BlacklistedToken.objects.filter(
+                    token_id__in=ids
+                ).count()
+                outstanding_count += len(ids)
+            else:
+                # BlacklistedToken 은 CASCADE 로 같은 트랜잭션에서 함께 삭제됩니다.
+                # 삭제할 행은 id 만 읽어, 저장된 토큰 문자열을 메모리로 읽지 않습니다.
+                outstanding = OutstandingToken.objects.filter(id__in=ids).only("id")
+                _, deleted = outstanding.delete()
+                blacklisted_count += deleted.get(BlacklistedToken._meta.label, 0)
+                outstanding_count += deleted.get(OutstandingToken._meta.label, 0)
+
+            last_id = ids[-1]
+            self.stdout.write(
+                f"{outstanding_count} outstanding, {blacklisted_count} blacklisted "
+                f"tokens (last id {last_id})."
+            )
+
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        verb = "would be deleted" if dry_run else "were deleted"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{outstanding_count} outstanding and {blacklisted_count} "
+                f"blacklisted tokens {verb}."
+            )
+        )
@@ -43,3 +43,15 @@ class User(AbstractBaseUser, UUID4Mixin, TimeStampedMixin, PermissionsMixin):
 
     def __str__(self) -> str:
         return f"User {self.mobile}"
+
+    def refresh_from_db(self, using=None, fields=None):
+        """
+        deferred 필드 하나를 사용할 때, 나머지 deferred 필드도 한 번에 조회합니다.
+        토큰으로 만든 유저(apps.authentication.authentication)가 필드마다 쿼리를 실행하지 않도록 합니다.
+        """
+        if fields is not None:
+            fields = set(fields)
+            deferred_fields = self.get_deferred_fields()
+            if fields.intersection(deferred_fields):
+                fields = fields.union(deferred_fields)
+        super().refresh_from_db(using, fields)
@@ -0,0 +1,168 @@
+"""
+토큰 갱신(Refresh Token Rotation)의 블랙리스트 쓰기를 모아서 저장하는 write-behind 입니다.
+
+토큰을 갱신할 때마다 사용된 Refresh Token 의 OutstandingToken 과 BlacklistedToken 이
+저장됩니다. 교대 시간처럼 많은 단말기가 한꺼번에 토큰을 갱신하면, 이 쓰기들이 같은
+테이블에서 경합합니다.
+
+TOKEN_ROTATION 의 WRITE_BEHIND 가 켜져 있으면, 사용된 토큰은 먼저 프로세스 메모리에
+기록되어 바로 다시 사용할 수 없게 되고, 백그라운드 스레드가 FLUSH_INTERVAL 초마다
+(또는 BATCH_SIZE 개가 모이면) bulk_create 로 한 번에 저장합니다.
+저장된 토큰은 Bloom filter(apps.authentication.blacklist)에 추가되고, 공유 캐시의 버전이
+바뀌어 다른 프로세스도 다음 확인에서 다시 읽습니다.
+
+- 저장되기 전까지 다른 프로세스는 사용된 토큰을 알지 못하므로, 토큰이 기록된 뒤
+  batch 가 커밋되고 버전이 바뀔 때까지(최대 FLUSH_INTERVAL 초와 저장에 걸리는 시간)
+  다른 프로세스에서 다시 사용될 수 있습니다. 저장에 실패하면 다음 주기까지 늘어납니다.
+- 버전은 공유 캐시로만 전달되므로, Bloom filter 를 사용할 수 없는 프로세스 메모리 캐시에서는
+  WRITE_BEHIND 가 켜져 있더라도 사용된 토큰을 바로 저장합니다.
+- 프로세스가 비정상 종료되면 저장되지 않은 토큰은 블랙리스트에 추가되지 않습니다.
+  이 토큰들도 Refresh Token 의 만료 시간이 지나면 사용할 수 없습니다.
+"""
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from apps.authentication.blacklist import blacklist_filter
+
+logger = logging.getLogger(__name__)
+
+
+class RotationWriter:
+    """
+    사용된 Refresh Token 을 메모리에 기록해 두고, 블랙리스트에 모아서 저장합니다.
+    background 가 False 이면 스레드를 시작하지 않으며, flush() 를 직접 호출해야 합니다.
+    """
+
+    def __init__(self, batch_size: int, interval: float, background: bool = True):
+        self.batch_size = batch_size
+        self.interval = interval
+        self.background = background
+        self.flushed = self.batches = self.failures = 0
+        self._pending: dict[str, OutstandingToken] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    @property
+    def enabled(self) -> bool:
+        """
+        사용된 토큰을 모아서 저장할 수 있는지 반환합니다.
+        """
+        return settings.TOKEN_ROTATION["WRITE_BEHIND"] and blacklist_filter.enabled
+
+    def rotate(self, token) -> bool:
+        """
+        사용된 토큰을 기록합니다.
+        이미 사용되어 저장을 기다리는 토큰이라면 False 를 반환합니다.
+        """
+        jti = token[api_settings.JTI_CLAIM]
+        with self._lock:
+            if jti in self._pending:
+                return False
+            self._pending[jti] = OutstandingToken(
+                jti=jti,
+                token=str(token),
+                expires_at=datetime_from_epoch(token["exp"]),
+            )
+            full = len(self._pending) >= self.batch_size
+
+        if self.background:
+            self._start()
+            if full:
+                self._wakeup.set()
+        return True
+
+    def is_pending(self, jti: str) -> bool:
+        with self._lock:
+            return jti in self._pending
+
+    def flush(self) -> int:
+        """
+        기록된 토큰을 블랙리스트에 저장하고, 저장한 토큰의 수를 반환합니다.
+        """
+        with self._flush_lock:
+            with self._lock:
+                tokens = list(self._pending.values())
+            if not tokens:
+                return 0
+
+            for start in range(0, len(tokens), self.batch_size):
+                self._write(tokens[start : start + self.batch_size])
+
+            # Bloom filter 에 추가한 뒤에 메모리에서 제거하므로, 확인에서 빠지는 순간이 없습니다.
+            for token in tokens:
+                blacklist_filter.add(token.jti)
+            blacklist_filter.bump_version()
+            with self._lock:
+                for token in tokens:
+                    self._pending.pop(token.jti, None)
+                self.flushed += len(tokens)
+            return len(tokens)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "flushed": self.flushed,
+                "batches": self.batches,
+                "failures": self.failures,
+            }
+
+    def _write(self, tokens):
+        jtis = [token.jti for token in tokens]
+        with transaction.atomic():
+            # 로그인으로 발급된 토큰은 이미 OutstandingToken 이 있습니다.
+            OutstandingToken.objects.bulk_create(tokens, ignore_conflicts=True)
+            token_ids = OutstandingToken.objects.filter(jti__in=jtis).values_list(
+                "id", flat=True
+            )
+            BlacklistedToken.objects.bulk_create(
+                [BlacklistedToken(token_id=token_id) for token_id in token_ids],
+                ignore_conflicts=True,
+            )
+        with self._lock:
+            self.batches += 1
+
+    def _start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            if self._thread is None:
+                # 종료할 때 남아 있는 토큰을 저장합니다.
+                atexit.register(self.flush)
+            self._thread = threading.Thread(
+                target=self._run, name="token-rotation-writer", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            close_old_connections()
+            try:
+                self.flush()
+            except Exception:
+                # 저장하지 못한 토큰은 메모리에 남아 있으므로 다음 주기에 다시 저장합니다.
+                with self._lock:
+                    self.failures += 1
+                logger.exception("Failed to flush rotated refresh tokens.")
+
+
+rotation_writer = RotationWriter(
+    batch_size=settings.TOKEN_ROTATION["BATCH_SIZE"],
+    interval=settings.TOKEN_ROTATION["FLUSH_INTERVAL"],
+)
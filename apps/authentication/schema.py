@@ -0,0 +1,10 @@
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+
+
+class StatelessJWTScheme(SimpleJWTScheme):
+    """
+    StatelessJWTAuthentication 도 JWTAuthentication 과 같은 Bearer 인증(jwtAuth)으로 문서화합니다.
+    drf-spectacular 는 인증 클래스의 하위 클래스를 찾지 않으므로 따로 등록합니다.
+    """
+
+    target_class = "apps.authentication.authentication.StatelessJWTAuthentication"
@@ -1,6 +1,16 @@
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, TokenError
+from rest_framework_simplejwt.serializers import (
+    TokenBlacklistSerializer,
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
 
 from apps.authentication.models import User
+from apps.authentication.rotation import rotation_writer
+from apps.authentication.tokens import USER_CLAIMS, CafehereRefreshToken
 
 
 class RegisterSerializer(serializers.ModelSerializer):
@@ -18,3 +28,68 @@ class RegisterSerializer(serializers.ModelSerializer):
         user.set_password(validated_data["password"])
         user.save()
         return user
+
+
+class LoginSerializer(TokenObtainPairSerializer):
+    """
+    유저의 pk, is_staff, is_active 를 담은 토큰을 발급합니다.
+    """
+
+    token_class = CafehereRefreshToken
+
+
+class RefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresh Token 으로 토큰을 갱신합니다.
+
+    Access Token 으로 인증할 때는 유저를 조회하지 않으므로(StatelessJWTAuthentication),
+    갱신할 때마다 유저를 조회하여 없거나 비활성화된 유저의 토큰은 거부하고,
+    새로 발급하는 토큰에는 유저의 현재 is_staff, is_active 를 담습니다.
+
+    블랙리스트는 Bloom filter 로 먼저 확인하며, TOKEN_ROTATION 의 WRITE_BEHIND 가 켜져 있고
+    공유 캐시를 사용한다면, 사용된 토큰을 바로 저장하지 않고 rotation_writer 에 기록합니다.
+    """
+
+    token_class = CafehereRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        refresh.set_user_claims(self.get_user(refresh))
+        data = {"access": str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                self.blacklist(refresh)
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data["refresh"] = str(refresh)
+        return data
+
+    @staticmethod
+    def get_user(refresh) -> User:
+        try:
+            # 토큰에 담는 필드만 조회합니다.
+            user = User.objects.only(*USER_CLAIMS.values()).get(
+                **{api_settings.USER_ID_FIELD: refresh[api_settings.USER_ID_CLAIM]}
+            )
+        except (KeyError, User.DoesNotExist):
+            raise AuthenticationFailed(
+                _("No active account found for the given token."),
+                code="no_active_account",
+            )
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
+
+    @staticmethod
+    def blacklist(refresh):
+        if not rotation_writer.enabled:
+            refresh.blacklist()
+        # 같은 토큰으로 동시에 들어온 요청은 하나만 갱신됩니다.
+        elif not rotation_writer.rotate(refresh):
+            raise TokenError(_("Token is blacklisted"))
+
+
+class LogoutSerializer(TokenBlacklistSerializer):
+    token_class = CafehereRefreshToken
@@ -0,0 +1,17 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from apps.authentication.blacklist import blacklist_filter
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def add_to_blacklist_filter(sender, instance: BlacklistedToken, created, **kwargs):
+    """
+    토큰이 블랙리스트에 추가되면 이 프로세스의 Bloom filter 에 바로 추가하고,
+    커밋된 뒤 다른 프로세스가 다시 읽도록 버전을 올립니다.
+    """
+    if created:
+        blacklist_filter.add(instance.token.jti)
+        transaction.on_commit(blacklist_filter.bump_version)
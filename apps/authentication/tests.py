@@ -1,13 +1,38 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from drf_spectacular.generators import SchemaGenerator
 from rest_framework import status
 from rest_framework.reverse import reverse
-
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from apps.authentication.authentication import build_token_user
+from apps.authentication.blacklist import TokenBlacklistFilter, blacklist_filter
+from apps.authentication.rotation import rotation_writer
+from apps.authentication.tokens import (
+    IS_ACTIVE_CLAIM,
+    IS_STAFF_CLAIM,
+    USER_PK_CLAIM,
+    CafehereRefreshToken,
+)
 from core.utils.test import BaseAPITestCase
 
 REGISTER_URL_NAME = "register"
 LOGIN_URL_NAME = "login"
 REFRESH_URL_NAME = "refresh"
 LOGOUT_URL_NAME = "logout"
+CAFE_LIST_URL_NAME = "cafe-list"
 
 User = get_user_model()
 
@@ -207,3 +232,380 @@ class LogoutTestCase(BaseAPITestCase):
         refresh_response = self.client.post(refresh_url, data=refresh_data)
         self._test_response_format(refresh_response)
         self.assertEqual(refresh_response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class StatelessJWTAuthenticationTestCase(BaseAPITestCase):
+    """
+    토큰의 claim 으로 유저를 만드는 JWT 인증 테스트
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            mobile="+82-1012345678", password="test_password"
+        )
+        self.url = reverse(CAFE_LIST_URL_NAME)
+
+    def login(self):
+        response = self.client.post(
+            reverse(LOGIN_URL_NAME),
+            data={"mobile": "+82-1012345678", "password": "test_password"},
+        )
+        return response.data["data"]
+
+    def test_token_claims(self):
+        """
+        Access Token 과 갱신된 Access Token 은 유저의 pk 와 상태를 가져야 합니다.
+        """
+        tokens = self.login()
+        access = AccessToken(tokens["access"])
+        self.assertEqual(access[USER_PK_CLAIM], self.user.pk)
+        self.assertTrue(access[IS_ACTIVE_CLAIM])
+
+        response = self.client.post(
+            reverse(REFRESH_URL_NAME), data={"refresh": tokens["refresh"]}
+        )
+        access = AccessToken(response.data["data"]["access"])
+        self.assertEqual(access[USER_PK_CLAIM], self.user.pk)
+
+    def test_no_user_query(self):
+        """
+        인증된 요청은 유저를 조회하지 않아야 합니다.
+        """
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.login()['access']}")
+        # 카페 목록 조회 외에는 쿼리가 실행되지 않아야 합니다.
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_lazy_user_fields(self):
+        """
+        토큰에 없는 필드는 처음 사용할 때 한 번의 쿼리로 모두 조회해야 합니다.
+        """
+        user = build_token_user(AccessToken(self.login()["access"]))
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertEqual(user.uuid, self.user.uuid)
+        self.assertTrue(user.is_authenticated)
+        with self.assertNumQueries(1):
+            self.assertEqual(user.mobile, self.user.mobile)
+            self.assertEqual(user.password, self.user.password)
+            self.assertFalse(user.is_superuser)
+
+    def test_inactive_user(self):
+        self.user.is_active = False
+        self.user.save()
+        token = CafehereRefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_refresh_checks_user(self):
+        """
+        토큰을 갱신할 때는 유저를 조회하여, 비활성화된 유저는 거부하고
+        새 토큰에는 유저의 현재 상태를 담아야 합니다.
+        """
+        tokens = self.login()
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.post(
+            reverse(REFRESH_URL_NAME), data={"refresh": tokens["refresh"]}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(AccessToken(response.data["data"]["access"])[IS_STAFF_CLAIM])
+
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.post(
+            reverse(REFRESH_URL_NAME),
+            data={"refresh": response.data["data"]["refresh"]},
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self._test_response_format(response)
+
+        refresh = CafehereRefreshToken.for_user(self.user)
+        self.user.delete()
+        response = self.client.post(
+            reverse(REFRESH_URL_NAME), data={"refresh": str(refresh)}
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_openapi_security_scheme(self):
+        """
+        API 문서에 JWT 의 Bearer 인증이 있어야 합니다.
+        """
+        schema = SchemaGenerator().get_schema(request=None, public=True)
+        self.assertIn("jwtAuth", schema["components"]["securitySchemes"])
+        operation = schema["paths"]["/api/v1/cafes/"]["get"]
+        self.assertIn({"jwtAuth": []}, operation["security"])
+
+    def test_token_without_claims(self):
+        """
+        claim 이 없는 이전에 발급된 토큰은 유저를 조회하여 인증해야 합니다.
+        """
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class TokenBlacklistFilterTestCase(BaseAPITestCase):
+    """
+    Refresh Token 블랙리스트 확인의 Bloom filter 테스트
+    """
+
+    def setUp(self):
+        self.use_shared_cache()
+        blacklist_filter.clear()
+        self.user = User.objects.create_user(
+            mobile="+82-1012345678", password="test_password"
+        )
+
+    def refresh(self, token):
+        return self.client.post(reverse(REFRESH_URL_NAME), data={"refresh": token})
+
+    @staticmethod
+    def count_blacklist_checks(context):
+        # 블랙리스트 확인은 jti 로 BlacklistedToken 을 조회합니다.
+        return sum(
+            "token_blacklist_blacklistedtoken" in query["sql"] and "jti" in query["sql"]
+            for query in context.captured_queries
+        )
+
+    def test_skip_database(self):
+        """
+        블랙리스트에 없는 토큰은 데이터베이스에서 블랙리스트를 확인하지 않아야 합니다.
+        """
+        token = str(CafehereRefreshToken.for_user(self.user))
+        self.refresh(str(CafehereRefreshToken.for_user(self.user)))
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.refresh(token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.count_blacklist_checks(context), 0)
+        self.assertEqual(blacklist_filter.stats()["skipped"], 2)
+
+    def test_blacklisted(self):
+        """
+        갱신이나 로그아웃으로 블랙리스트에 추가된 토큰은 사용할 수 없어야 합니다.
+        """
+        token = str(CafehereRefreshToken.for_user(self.user))
+        rotated = self.refresh(token).data["data"]["refresh"]
+        self.assertEqual(self.refresh(token).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        response = self.client.post(reverse(LOGOUT_URL_NAME), data={"refresh": rotated})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.refresh(rotated).status_code, status.HTTP_401_UNAUTHORIZED
+        )
+
+    def test_process_local_cache(self):
+        """
+        프로세스 메모리 캐시를 사용하면, Bloom filter 대신 데이터베이스에서 확인해야 합니다.
+        """
+        with override_settings(
+            CACHES={
+                "default": {
+                    "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                }
+            }
+        ):
+            token = str(CafehereRefreshToken.for_user(self.user))
+            with CaptureQueriesContext(connection) as context:
+                self.refresh(token)
+            self.assertEqual(self.count_blacklist_checks(context), 1)
+            self.assertEqual(
+                self.refresh(token).status_code, status.HTTP_401_UNAUTHORIZED
+            )
+
+        stats = blacklist_filter.stats()
+        self.assertEqual((stats["skipped"], stats["lookups"]), (0, 2))
+        self.assertEqual(stats["syncs"], 0)
+
+    def test_sync_other_process(self):
+        """
+        다른 프로세스에서 블랙리스트에 추가된 토큰은, 버전이 올라가면 다시 읽어야 합니다.
+        """
+        other = TokenBlacklistFilter(
+            alias="default", capacity=1000, error_rate=0.001, ttl=60, max_gaps=10
+        )
+        token = CafehereRefreshToken.for_user(self.user)
+        self.assertFalse(other.is_blacklisted(token["jti"]))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            token.blacklist()
+        self.assertTrue(other.is_blacklisted(token["jti"]))
+        self.assertEqual(other.stats()["syncs"], 2)
+
+    def test_late_commit(self):
+        """
+        늦게 커밋된, 마지막으로 읽은 id 보다 작은 id 도 읽어야 합니다.
+        """
+        other = TokenBlacklistFilter(
+            alias="default", capacity=1000, error_rate=0.001, ttl=60, max_gaps=10
+        )
+        first, second, third = (
+            OutstandingToken.objects.get(
+                jti=CafehereRefreshToken.for_user(self.user)["jti"]
+            )
+            for _ in range(3)
+        )
+        BlacklistedToken.objects.create(id=4, token=third)
+        BlacklistedToken.objects.create(id=10, token=second)
+        other.sync()
+
+        # 먼저 id 를 받았지만 늦게 커밋된 행입니다.
+        BlacklistedToken.objects.create(id=5, token=first)
+        other.bump_version()
+        self.assertTrue(other.is_blacklisted(first.jti))
+        self.assertTrue(other.is_blacklisted(second.jti))
+
+
+@override_settings(
+    TOKEN_ROTATION={"WRITE_BEHIND": True, "BATCH_SIZE": 2, "FLUSH_INTERVAL": 0.5}
+)
+class WriteBehindRotationTestCase(BaseAPITestCase):
+    """
+    사용된 토큰을 모아서 저장하는 토큰 갱신 테스트
+    """
+
+    def setUp(self):
+        self.use_shared_cache()
+        blacklist_filter.clear()
+        # 테스트에서는 백그라운드 스레드 대신 flush() 를 직접 호출합니다.
+        for name, value in {"background": False, "batch_size": 2}.items():
+            patcher = mock.patch.object(rotation_writer, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(rotation_writer.flush)
+        self.user = User.objects.create_user(
+            mobile="+82-1012345678", password="test_password"
+        )
+
+    def refresh(self, token):
+        return self.client.post(reverse(REFRESH_URL_NAME), data={"refresh": token})
+
+    def test_reject_before_flush(self):
+        """
+        사용된 토큰은 저장되기 전에도 다시 사용할 수 없어야 합니다.
+        """
+        token = str(CafehereRefreshToken.for_user(self.user))
+        blacklist_filter.sync()
+        # 유저 조회 외에는 블랙리스트를 확인하거나 저장하지 않아야 합니다.
+        with self.assertNumQueries(1):
+            response = self.refresh(token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(BlacklistedToken.objects.exists())
+
+        response = self.refresh(token)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_flush(self):
+        """
+        저장된 토큰은 블랙리스트에 있어야 하고, 계속 사용할 수 없어야 합니다.
+        """
+        tokens = [str(CafehereRefreshToken.for_user(self.user)) for _ in range(2)]
+        rotated = self.refresh(tokens[0]).data["data"]["refresh"]
+        self.refresh(tokens[1])
+        self.refresh(rotated)
+
+        # batch 마다 OutstandingToken 저장, id 조회, BlacklistedToken 저장 (2개의 batch)
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(rotation_writer.flush(), 3)
+        queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith(("INSERT", "SELECT"))
+        ]
+        self.assertEqual(len(queries), 2 * 3)
+        self.assertEqual(BlacklistedToken.objects.count(), 3)
+        self.assertEqual(OutstandingToken.objects.count(), 3)
+        self.assertEqual(rotation_writer.stats()["pending"], 0)
+
+        for token in tokens + [rotated]:
+            response = self.refresh(token)
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_other_process_after_flush(self):
+        """
+        다른 프로세스는 저장된 뒤의 확인부터 사용된 토큰을 거부해야 합니다.
+        """
+        other = TokenBlacklistFilter(
+            alias="default", capacity=1000, error_rate=0.001, ttl=60, max_gaps=10
+        )
+        token = CafehereRefreshToken.for_user(self.user)
+        self.refresh(str(token))
+        self.assertFalse(other.is_blacklisted(token["jti"]))
+
+        rotation_writer.flush()
+        self.assertTrue(other.is_blacklisted(token["jti"]))
+
+    def test_process_local_cache(self):
+        """
+        프로세스 메모리 캐시를 사용하면, 사용된 토큰을 바로 저장해야 합니다.
+        """
+        token = str(CafehereRefreshToken.for_user(self.user))
+        with override_settings(
+            CACHES={
+                "default": {
+                    "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                }
+            }
+        ):
+            self.assertEqual(self.refresh(token).status_code, status.HTTP_200_OK)
+        self.assertEqual(rotation_writer.stats()["pending"], 0)
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
+
+    def test_rotate_once(self):
+        """
+        같은 토큰은 한 번만 기록되어야 합니다.
+        """
+        token = CafehereRefreshToken.for_user(self.user)
+        self.assertTrue(rotation_writer.rotate(token))
+        self.assertFalse(rotation_writer.rotate(token))
+        self.assertEqual(rotation_writer.flush(), 1)
+        self.assertEqual(rotation_writer.flush(), 0)
+
+
+class PurgeTokensTestCase(BaseAPITestCase):
+    """
+    만료된 토큰 삭제 명령어 테스트
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            mobile="+82-1012345678", password="test_password"
+        )
+        now = timezone.now()
+        self.expired = [self.create_token(now - timedelta(days=1)) for _ in range(5)]
+        self.live = [self.create_token(now + timedelta(days=1)) for _ in range(3)]
+        for token in self.expired[:3] + self.live[:1]:
+            BlacklistedToken.objects.create(token=token)
+
+    def create_token(self, expires_at):
+        token = CafehereRefreshToken.for_user(self.user)
+        outstanding = OutstandingToken.objects.get(jti=token["jti"])
+        outstanding.expires_at = expires_at
+        outstanding.save()
+        return outstanding
+
+    def test_purge(self):
+        # batch 마다 id 조회, 삭제할 행의 id 조회와 두 번의 DELETE 를 실행합니다.
+        with self.assertNumQueries(3 * 4 + 1):
+            call_command("purge_tokens", batch_size=2, stdout=StringIO())
+        self.assertCountEqual(
+            OutstandingToken.objects.values_list("id", flat=True),
+            [token.id for token in self.live],
+        )
+        self.assertEqual(
+            list(BlacklistedToken.objects.values_list("token_id", flat=True)),
+            [self.live[0].id],
+        )
+
+    def test_dry_run(self):
+        out = StringIO()
+        call_command("purge_tokens", batch_size=2, dry_run=True, stdout=out)
+        self.assertIn(
+            "5 outstanding and 3 blacklisted tokens would be deleted", out.getvalue()
+        )
+        self.assertEqual(OutstandingToken.objects.count(), 8)
+        self.assertEqual(BlacklistedToken.objects.count(), 4)
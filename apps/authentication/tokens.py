@@ -0,0 +1,50 @@
+"""
+카페히어에서 발급하는 JWT 입니다.
+
+Refresh Token 에 유저의 pk, is_staff, is_active 를 함께 담습니다.
+Access Token 은 Refresh Token 의 claim 을 복사하여 만들어지므로, 두 토큰 모두 이 claim 들을 가집니다.
+StatelessJWTAuthentication 은 이 claim 들로 유저를 만들어, 요청마다 유저를 조회하지 않습니다.
+토큰을 갱신할 때는 유저를 조회하여, 새로 발급하는 토큰에 유저의 현재 값을 담습니다.
+(apps.authentication.serializers.RefreshSerializer)
+
+Refresh Token 의 블랙리스트 확인은 저장을 기다리는 사용된 토큰(apps.authentication.rotation)과
+Bloom filter(apps.authentication.blacklist)를 먼저 거칩니다.
+"""
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.authentication.blacklist import blacklist_filter
+from apps.authentication.rotation import rotation_writer
+
+USER_PK_CLAIM = "user_pk"
+IS_STAFF_CLAIM = "is_staff"
+IS_ACTIVE_CLAIM = "is_active"
+
+# 토큰의 claim 과 유저 필드의 대응입니다.
+USER_CLAIMS = {
+    USER_PK_CLAIM: "id",
+    IS_STAFF_CLAIM: "is_staff",
+    IS_ACTIVE_CLAIM: "is_active",
+}
+
+
+class CafehereRefreshToken(RefreshToken):
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token.set_user_claims(user)
+        return token
+
+    def set_user_claims(self, user):
+        """
+        유저의 pk, is_staff, is_active 를 토큰에 담습니다.
+        """
+        for claim, field in USER_CLAIMS.items():
+            self[claim] = getattr(user, field)
+
+    def check_blacklist(self):
+        jti = self.payload[api_settings.JTI_CLAIM]
+        if rotation_writer.is_pending(jti) or blacklist_filter.is_blacklisted(jti):
+            raise TokenError(_("Token is blacklisted"))
@@ -8,7 +8,12 @@ from rest_framework_simplejwt.views import TokenObtainPairView as _TokenObtainPa
 from rest_framework_simplejwt.views import TokenRefreshView as _TokenRefreshView
 
 from apps.authentication.models import User
-from apps.authentication.serializers import RegisterSerializer
+from apps.authentication.serializers import (
+    LoginSerializer,
+    LogoutSerializer,
+    RefreshSerializer,
+    RegisterSerializer,
+)
 
 TAG = "Authentication API"
 
@@ -52,6 +57,8 @@ class RegisterAPIView(CreateAPIView):
 """,
 )
 class LogoutAPIView(_TokenBlacklistView):
+    serializer_class = LogoutSerializer
+
     def post(self, request: Request, *args, **kwargs) -> Response:
         return super().post(request, *args, **kwargs)
 
@@ -71,6 +78,8 @@ class LogoutAPIView(_TokenBlacklistView):
 """,
 )
 class LoginAPIView(_TokenObtainPairView):
+    serializer_class = LoginSerializer
+
     def post(self, request: Request, *args, **kwargs) -> Response:
         return super().post(request, *args, **kwargs)
 
@@ -85,4 +94,4 @@ class LoginAPIView(_TokenObtainPairView):
 """,
 )
 class RefreshAPIVIew(_TokenRefreshView):
-    pass
+    serializer_class = RefreshSerializer
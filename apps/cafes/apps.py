@@ -5,3 +5,6 @@ class CafesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.cafes"
     verbose_name = "Cafes"
+
+    def ready(self):
+        from apps.cafes import signals  # noqa: F401
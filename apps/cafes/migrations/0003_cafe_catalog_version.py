@@ -0,0 +1,17 @@
+# Generated by Django 3.2.25 on 2026-10-18 10:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("cafes", "0002_cafe_unique_cafe_name_per_user"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="cafe",
+            name="catalog_version",
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -1,13 +1,28 @@
 from django.db import models
+from django.db.models import F
 
 from core.utils.models import TimeStampedMixin, UUID4Mixin
 
 
+class CafeQuerySet(models.QuerySet):
+    def bump_catalog_version(self) -> int:
+        """
+        카페들의 카탈로그 버전을 1 올립니다.
+        다른 요청과 동시에 올리더라도 값을 잃지 않도록 데이터베이스에서 계산합니다.
+        """
+        return self.update(catalog_version=F("catalog_version") + 1)
+
+
 class Cafe(UUID4Mixin, TimeStampedMixin):
     name = models.CharField(max_length=30)
     owner = models.ForeignKey(
         "authentication.User", on_delete=models.CASCADE, related_name="cafes"
     )
+    catalog_version = models.PositiveBigIntegerField(
+        default=0, editable=False
+    )  # 카페의 상품, 카테고리, 옵션이 바뀔 때마다 올라가는 버전입니다. (apps.products.signals)
+
+    objects = CafeQuerySet.as_manager()
 
     class Meta:
         """
@@ -0,0 +1,138 @@
+"""
+카페 uuid -> (카페 id, owner id) 의 캐시입니다.
+
+카페의 모든 상품, 카테고리, 옵션 그룹 API 는 권한 확인(IsCafeOwner)에서 카페의 owner 를
+확인합니다. 카페의 owner 는 거의 바뀌지 않으므로, 이 대응을 캐시하여 데이터베이스 없이
+권한을 확인합니다.
+
+- 프로세스 메모리 안의 LRU 를 먼저 확인하고, 없으면 Django 캐시(ALIAS)를 확인합니다.
+  ALIAS 가 여러 프로세스(worker)가 함께 사용하는 캐시(settings.CACHES)라면, 한 프로세스가
+  조회한 카페는 다른 프로세스에서도 데이터베이스 없이 확인할 수 있습니다.
+- 카페가 저장되거나 삭제되면 signal 을 통해 두 캐시에서 모두 제거됩니다. (apps.cafes.signals)
+- 다른 프로세스의 메모리에 남은 항목은 제거되지 않으므로, 메모리의 항목은 ttl 초 후에
+  Django 캐시에서 다시 읽습니다.
+- ALIAS 가 프로세스 메모리 캐시라면 다른 프로세스의 제거가 전달되지 않으므로 사용하지 않고,
+  ttl 초가 지난 항목은 데이터베이스에서 다시 읽습니다.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+from core.utils.cache import is_shared_cache
+
+
+class CafeOwnership(NamedTuple):
+    id: int
+    owner_id: int
+
+
+class CafeOwnershipCache:
+    """
+    카페 uuid 로 CafeOwnership 을 찾는 2단계(프로세스 메모리, Django 캐시) 캐시입니다.
+    """
+
+    def __init__(self, alias: str, max_entries: int, ttl: float, timeout: int):
+        self.alias = alias
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.timeout = timeout
+        self.hits = self.shared_hits = self.misses = self.evictions = 0
+        self._entries: OrderedDict[str, tuple[CafeOwnership, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def shared(self):
+        """
+        여러 프로세스가 함께 사용하는 Django 캐시입니다. 없으면 None 입니다.
+        """
+        return caches[self.alias] if is_shared_cache(self.alias) else None
+
+    @staticmethod
+    def make_key(cafe_uuid) -> str:
+        return f"cafe-ownership:{cafe_uuid}"
+
+    def get(self, cafe_uuid) -> CafeOwnership | None:
+        """
+        캐시된 카페의 CafeOwnership 을 반환합니다. 캐시에 없으면 None 을 반환합니다.
+        """
+        key = str(cafe_uuid)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.monotonic() - entry[1] < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+        shared = self.shared
+        value = shared.get(self.make_key(key)) if shared else None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.shared_hits += 1
+            ownership = CafeOwnership(*value)
+            self._store(key, ownership)
+        return ownership
+
+    def set(self, cafe) -> CafeOwnership:
+        """
+        데이터베이스에서 조회한 카페를 캐시에 저장합니다.
+        """
+        ownership = CafeOwnership(cafe.id, cafe.owner_id)
+        key = str(cafe.uuid)
+        shared = self.shared
+        if shared:
+            shared.set(self.make_key(key), tuple(ownership), self.timeout)
+        with self._lock:
+            self._store(key, ownership)
+        return ownership
+
+    def invalidate(self, cafe_uuid):
+        """
+        카페를 두 캐시에서 모두 제거합니다.
+        """
+        key = str(cafe_uuid)
+        shared = self.shared
+        if shared:
+            shared.delete(self.make_key(key))
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """
+        프로세스 메모리의 항목과 통계를 모두 제거합니다.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.shared_hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "hit_rate": (self.hits + self.shared_hits) / lookups if lookups else 0,
+            }
+
+    def _store(self, key, ownership):
+        self._entries[key] = (ownership, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+ownership_cache = CafeOwnershipCache(
+    alias=settings.CAFE_OWNERSHIP_CACHE["ALIAS"],
+    max_entries=settings.CAFE_OWNERSHIP_CACHE["MAX_ENTRIES"],
+    ttl=settings.CAFE_OWNERSHIP_CACHE["TTL"],
+    timeout=settings.CAFE_OWNERSHIP_CACHE["TIMEOUT"],
+)
@@ -0,0 +1,69 @@
+"""
+요청 URL 의 카페를 요청마다 한 번만 조회하는 resolver 입니다.
+
+한 번의 요청에서 권한 확인(IsCafeOwner), serializer 의 검증, ETag 확인과
+perform_create 가 모두 URL 의 카페를 필요로 합니다.
+처음 조회한 카페를 Django 의 HttpRequest 에 저장해 두고, 이후에는 같은 객체를 반환합니다.
+DRF 의 Request 는 요청마다 HttpRequest 를 감싸는 객체이므로, 감싸진 HttpRequest 에 저장합니다.
+
+카페의 id 와 owner 만 필요한 곳은 get_cafe_ownership() 을 사용합니다.
+캐시(apps.cafes.ownership)에 있다면 카페를 조회하지 않습니다.
+"""
+from apps.cafes.models import Cafe
+from apps.cafes.ownership import CafeOwnership, ownership_cache
+
+REQUEST_CAFES_ATTRIBUTE = "_cafehere_cafes"
+REQUEST_OWNERSHIPS_ATTRIBUTE = "_cafehere_cafe_ownerships"
+
+
+def _get_request_storage(request, attribute) -> dict:
+    http_request = getattr(request, "_request", request)
+    return http_request.__dict__.setdefault(attribute, {})
+
+
+def get_request_cafe(request, cafe_uuid) -> Cafe | None:
+    """
+    uuid 의 카페를 반환합니다. 카페가 없으면 None 을 반환합니다.
+    같은 요청에서 다시 호출되면 데이터베이스를 조회하지 않습니다.
+    """
+    cafes = _get_request_storage(request, REQUEST_CAFES_ATTRIBUTE)
+    key = str(cafe_uuid)
+    if key not in cafes:
+        cafes[key] = Cafe.objects.filter(uuid=cafe_uuid).first()
+    return cafes[key]
+
+
+def get_cafe_ownership(request, cafe_uuid) -> CafeOwnership | None:
+    """
+    uuid 의 카페의 (id, owner id) 를 반환합니다. 카페가 없으면 None 을 반환합니다.
+    캐시에 없을 때에만 카페를 조회하고, 조회한 카페는 요청과 캐시에 저장됩니다.
+    """
+    ownerships = _get_request_storage(request, REQUEST_OWNERSHIPS_ATTRIBUTE)
+    key = str(cafe_uuid)
+    if key not in ownerships:
+        ownership = ownership_cache.get(cafe_uuid)
+        if ownership is None:
+            cafe = get_request_cafe(request, cafe_uuid)
+            ownership = ownership_cache.set(cafe) if cafe else None
+        ownerships[key] = ownership
+    return ownerships[key]
+
+
+def get_owned_cafe_id(request, cafe_uuid) -> int | None:
+    """
+    요청한 유저가 owner 인 경우에만 카페의 id 를 반환합니다.
+    """
+    ownership = get_cafe_ownership(request, cafe_uuid)
+    if ownership is None or ownership.owner_id != request.user.pk:
+        return None
+    return ownership.id
+
+
+def get_owned_cafe(request, cafe_uuid) -> Cafe | None:
+    """
+    요청한 유저가 owner 인 경우에만 카페를 반환합니다.
+    """
+    cafe = get_request_cafe(request, cafe_uuid)
+    if cafe is None or cafe.owner_id != request.user.pk:
+        return None
+    return cafe
@@ -0,0 +1,29 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.cafes.models import Cafe
+from apps.cafes.ownership import ownership_cache
+
+
+@receiver(post_save, sender=Cafe)
+@receiver(post_delete, sender=Cafe)
+def invalidate_ownership(sender, instance: Cafe, **kwargs):
+    """
+    카페가 저장되거나 삭제되면, 캐시된 카페의 owner 를 제거합니다.
+    """
+    ownership_cache.invalidate(instance.uuid)
+
+
+@receiver(post_save, sender=Cafe)
+def bump_catalog_version_on_rename(
+    sender, instance: Cafe, created, update_fields, **kwargs
+):
+    """
+    메뉴 트리(apps.products.menu)에 카페 이름이 포함되므로, 카페의 이름이 저장되면
+    카탈로그 버전을 올려 캐시된 메뉴와 ETag 를 바꿉니다.
+    """
+    if created or (update_fields is not None and "name" not in update_fields):
+        return
+    Cafe.objects.filter(id=instance.id).bump_catalog_version()
+    # 이 인스턴스를 다시 저장할 때 이전 버전으로 덮어쓰지 않도록 버전을 다시 읽습니다.
+    instance.refresh_from_db(fields=["catalog_version"])
@@ -1,8 +1,20 @@
+import uuid
+
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
 from rest_framework import status
+from rest_framework.request import Request
 from rest_framework.reverse import reverse
+from rest_framework.test import APIRequestFactory
 
 from apps.cafes.models import Cafe
+from apps.cafes.ownership import CafeOwnershipCache, ownership_cache
+from apps.cafes.resolvers import (
+    get_cafe_ownership,
+    get_owned_cafe,
+    get_owned_cafe_id,
+    get_request_cafe,
+)
 from apps.cafes.urls import CAFE_DETAIL_URL_NAME, CAFE_LIST_URL_NAME, CAFE_URL_KEYWORD
 from core.utils.test import BaseAPITestCase
 
@@ -34,7 +46,7 @@ class CafeCreateTestCase(BaseAPITestCase):
         before_count = Cafe.objects.count()
 
         # 로그인 한 사용자만 카페를 생성할 수 있습니다.
-        self.client.force_login(self.cafe_owner_james)
+        self.authenticate(self.cafe_owner_james)
         response = self.client.post(url, data=valid_data)
         self._test_response_format(response)
 
@@ -56,7 +68,7 @@ class CafeCreateTestCase(BaseAPITestCase):
         before_count = Cafe.objects.count()
 
         # 로그인 한 사용자만 카페를 생성할 수 있습니다.
-        self.client.force_login(self.cafe_owner_james)
+        self.authenticate(self.cafe_owner_james)
         response = self.client.post(url, data=invalid_data)
         self._test_response_format(response)
 
@@ -103,7 +115,7 @@ class CafeCreateTestCase(BaseAPITestCase):
         }
 
         # 로그인 한 사용자만 카페를 생성할 수 있습니다.
-        self.client.force_login(self.cafe_owner_james)
+        self.authenticate(self.cafe_owner_james)
         response = self.client.post(url, data=invalid_data)
         self._test_response_format(response)
 
@@ -111,7 +123,7 @@ class CafeCreateTestCase(BaseAPITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
         # 하지만, 다른 사용자 jenny는 같은 이름으로 카페를 생성할 수 있습니다.
-        self.client.force_login(self.cafe_owner_jenny)
+        self.authenticate(self.cafe_owner_jenny)
         response = self.client.post(url, data=invalid_data)
         self._test_response_format(response)
 
@@ -151,7 +163,7 @@ class CafeListTestCase(BaseAPITestCase):
         url = reverse(CAFE_LIST_URL_NAME)
 
         # James는 James의 카페만 조회할 수 있습니다.
-        self.client.force_login(self.cafe_owner_james)
+        self.authenticate(self.cafe_owner_james)
         response = self.client.get(url)
         self._test_response_format(response)
 
@@ -206,7 +218,7 @@ class CafeRetrieveTestCase(BaseAPITestCase):
         url = reverse(CAFE_DETAIL_URL_NAME, kwargs={CAFE_URL_KEYWORD: james_cafe.uuid})
 
         # James는 James의 카페만 조회할 수 있습니다.
-        self.client.force_login(self.cafe_owner_james)
+        self.authenticate(self.cafe_owner_james)
         response = self.client.get(url)
         self._test_response_format(response)
 
@@ -215,7 +227,7 @@ class CafeRetrieveTestCase(BaseAPITestCase):
         self.assertEqual(response.data["data"]["name"], james_cafe.name)
 
         # Jenny는 James의 카페를 조회할 수 없습니다.
-        self.client.force_login(self.cafe_owner_jenny)
+        self.authenticate(self.cafe_owner_jenny)
         response = self.client.get(url)
         self._test_response_format(response)
 
@@ -272,7 +284,7 @@ class CafeUpdateTestCase(BaseAPITestCase):
         url = reverse(CAFE_DETAIL_URL_NAME, kwargs={CAFE_URL_KEYWORD: james_cafe.uuid})
 
         # James는 James의 카페만 수정할 수 있습니다.
-        self.client.force_login(self.cafe_owner_james)
+        self.authenticate(self.cafe_owner_james)
         response = self.client.put(url, data={"name": "James Cafe 2"})
         self._test_response_format(response)
 
@@ -281,7 +293,7 @@ class CafeUpdateTestCase(BaseAPITestCase):
         self.assertEqual(response.data["data"]["name"], "James Cafe 2")
 
         # Jenny는 James의 카페를 수정할 수 없습니다.
-        self.client.force_login(self.cafe_owner_jenny)
+        self.authenticate(self.cafe_owner_jenny)
         response = self.client.put(url, data={"name": "James Cafe 3"})
         self._test_response_format(response)
 
@@ -319,7 +331,7 @@ class CafeUpdateTestCase(BaseAPITestCase):
         url = reverse(CAFE_DETAIL_URL_NAME, kwargs={CAFE_URL_KEYWORD: james_cafe.uuid})
 
         # James는 James의 카페만 수정할 수 있습니다.
-        self.client.force_login(self.cafe_owner_james)
+        self.authenticate(self.cafe_owner_james)
         response = self.client.put(
             url,
             data={
@@ -359,7 +371,7 @@ class CafeDestroyTestCase(BaseAPITestCase):
         url = reverse(CAFE_DETAIL_URL_NAME, kwargs={CAFE_URL_KEYWORD: james_cafe.uuid})
 
         # James는 James의 카페만 삭제할 수 있습니다.
-        self.client.force_login(self.cafe_owner_james)
+        self.authenticate(self.cafe_owner_james)
         response = self.client.delete(url)
         self._test_response_format(response)
 
@@ -367,7 +379,7 @@ class CafeDestroyTestCase(BaseAPITestCase):
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
 
         # Jenny는 James의 카페를 삭제할 수 없습니다.
-        self.client.force_login(self.cafe_owner_jenny)
+        self.authenticate(self.cafe_owner_jenny)
         response = self.client.delete(url)
         self._test_response_format(response)
 
@@ -394,3 +406,181 @@ class CafeDestroyTestCase(BaseAPITestCase):
 
         # 전해진 권한 정보가 없으므로 401 UNAUTHORIZED가 반환되어야 합니다.
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class CafeQueryBudgetTestCase(BaseAPITestCase):
+    """
+    카페 API 의 쿼리 수 테스트
+
+    쿼리 수는 카페의 수와 관계없이 일정해야 합니다.
+    JWT 인증은 쿼리를 실행하지 않습니다.
+    """
+
+    def setUp(self):
+        self.cafe_owner_james = User.objects.create_user(
+            mobile="+82-1012345678", password="test_password"
+        )
+        self.cafes = [
+            Cafe.objects.create(
+                name=f"James's Cafe {index}", owner=self.cafe_owner_james
+            )
+            for index in range(10)
+        ]
+        self.authenticate(self.cafe_owner_james)
+
+    def test_list(self):
+        with self.assertMaxQueries(1):
+            response = self.client.get(reverse(CAFE_LIST_URL_NAME))
+        self.assertEqual(len(response.data["data"]), 10)
+
+    def test_retrieve(self):
+        url = reverse(
+            CAFE_DETAIL_URL_NAME, kwargs={CAFE_URL_KEYWORD: self.cafes[0].uuid}
+        )
+        with self.assertMaxQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class CafeResolverTestCase(BaseAPITestCase):
+    """
+    요청마다 카페를 한 번만 조회하는 resolver 테스트
+    """
+
+    def setUp(self):
+        self.cafe_owner_james = User.objects.create_user(
+            mobile="+82-1012345678", password="test_password"
+        )
+        self.cafe_owner_jenny = User.objects.create_user(
+            mobile="+82-1012345679", password="test_password"
+        )
+        self.cafe = Cafe.objects.create(name="James Cafe", owner=self.cafe_owner_james)
+        self.http_request = APIRequestFactory().get("/")
+
+    def test_cached_per_request(self):
+        """
+        같은 요청을 감싼 DRF Request 들은 조회한 카페를 공유해야 합니다.
+        """
+        with self.assertNumQueries(1):
+            cafe = get_request_cafe(Request(self.http_request), self.cafe.uuid)
+            self.assertEqual(
+                get_request_cafe(Request(self.http_request), self.cafe.uuid), cafe
+            )
+            self.assertIs(get_request_cafe(self.http_request, self.cafe.uuid), cafe)
+        self.assertEqual(cafe, self.cafe)
+
+        with self.assertNumQueries(1):
+            get_request_cafe(APIRequestFactory().get("/"), self.cafe.uuid)
+
+    def test_missing_cafe(self):
+        missing_uuid = uuid.uuid4()
+        with self.assertNumQueries(1):
+            self.assertIsNone(get_request_cafe(self.http_request, missing_uuid))
+            self.assertIsNone(get_request_cafe(self.http_request, missing_uuid))
+
+    def test_owned_cafe(self):
+        self.http_request.user = self.cafe_owner_james
+        self.assertEqual(get_owned_cafe(self.http_request, self.cafe.uuid), self.cafe)
+
+        self.http_request.user = self.cafe_owner_jenny
+        self.assertIsNone(get_owned_cafe(self.http_request, self.cafe.uuid))
+
+
+class CafeOwnershipCacheTestCase(BaseAPITestCase):
+    """
+    카페 uuid -> (카페 id, owner id) 캐시 테스트
+    """
+
+    def setUp(self):
+        self.cafe_owner_james = User.objects.create_user(
+            mobile="+82-1012345678", password="test_password"
+        )
+        self.cafe_owner_jenny = User.objects.create_user(
+            mobile="+82-1012345679", password="test_password"
+        )
+        self.cafes = [
+            Cafe.objects.create(name=f"James Cafe {index}", owner=self.cafe_owner_james)
+            for index in range(3)
+        ]
+        self.cache = CafeOwnershipCache(
+            alias="default", max_entries=2, ttl=60, timeout=60
+        )
+
+    def tearDown(self):
+        for cafe in self.cafes:
+            self.cache.invalidate(cafe.uuid)
+
+    def test_get_and_set(self):
+        cafe = self.cafes[0]
+        self.assertIsNone(self.cache.get(cafe.uuid))
+        self.cache.set(cafe)
+        ownership = self.cache.get(cafe.uuid)
+        self.assertEqual(ownership, (cafe.id, self.cafe_owner_james.id))
+
+        stats = self.cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_shared_between_processes(self):
+        """
+        다른 프로세스의 캐시도 Django 캐시에 저장된 항목을 사용해야 합니다.
+        """
+        self.use_shared_cache()
+        self.cache.set(self.cafes[0])
+        other = CafeOwnershipCache(alias="default", max_entries=2, ttl=60, timeout=60)
+        with self.assertNumQueries(0):
+            self.assertEqual(other.get(self.cafes[0].uuid).id, self.cafes[0].id)
+        self.assertEqual(other.stats()["shared_hits"], 1)
+        self.assertEqual(other.stats()["entries"], 1)
+
+    def test_process_local_cache(self):
+        """
+        Django 캐시가 프로세스 메모리 캐시라면, 다른 프로세스의 제거가 전달되지 않으므로
+        Django 캐시를 사용하지 않아야 합니다.
+        """
+        self.cache.set(self.cafes[0])
+        self.assertIsNone(
+            caches["default"].get(self.cache.make_key(self.cafes[0].uuid))
+        )
+        other = CafeOwnershipCache(alias="default", max_entries=2, ttl=60, timeout=60)
+        self.assertIsNone(other.get(self.cafes[0].uuid))
+
+    def test_lru_eviction(self):
+        for cafe in self.cafes[:2]:
+            self.cache.set(cafe)
+        self.cache.get(self.cafes[0].uuid)
+        self.cache.set(self.cafes[2])
+
+        stats = self.cache.stats()
+        self.assertEqual(stats["entries"], 2)
+        self.assertEqual(stats["evictions"], 1)
+        # 가장 오래 사용되지 않은 카페가 메모리에서 제거됩니다.
+        self.assertNotIn(str(self.cafes[1].uuid), self.cache._entries)
+
+    def test_invalidated_on_save_and_delete(self):
+        cafe = self.cafes[0]
+        ownership_cache.set(cafe)
+        cafe.name = "James Cafe"
+        cafe.save()
+        self.assertIsNone(ownership_cache.get(cafe.uuid))
+
+        ownership_cache.set(cafe)
+        cafe_uuid = cafe.uuid
+        cafe.delete()
+        self.assertIsNone(ownership_cache.get(cafe_uuid))
+
+    def test_request_lookup(self):
+        """
+        캐시된 카페의 owner 는 데이터베이스 없이 확인해야 합니다.
+        """
+        cafe = self.cafes[0]
+        request = APIRequestFactory().get("/")
+        request.user = self.cafe_owner_james
+        with self.assertNumQueries(1):
+            self.assertEqual(get_cafe_ownership(request, cafe.uuid).id, cafe.id)
+
+        request = APIRequestFactory().get("/")
+        request.user = self.cafe_owner_jenny
+        with self.assertNumQueries(0):
+            self.assertIsNone(get_owned_cafe_id(request, cafe.uuid))
@@ -1,8 +1,10 @@
+from django.http import Http404
 from drf_spectacular.utils import extend_schema
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
 
 from apps.cafes.models import Cafe
+from apps.cafes.resolvers import get_owned_cafe
 from apps.cafes.serializers import CafeSerializer
 
 TAG = "Cafe API"
@@ -21,5 +23,16 @@ class CafeAPIViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         return self.queryset.filter(owner=self.request.user)
 
+    def get_object(self):
+        """
+        요청한 유저의 카페를 반환합니다.
+        같은 요청에서 이미 조회된 카페가 있다면 다시 조회하지 않습니다.
+        """
+        cafe = get_owned_cafe(self.request, self.kwargs[self.lookup_url_kwarg])
+        if cafe is None:
+            raise Http404
+        self.check_object_permissions(self.request, cafe)
+        return cafe
+
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
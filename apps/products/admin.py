@@ -23,4 +23,6 @@ class OptionGroupAdmin(admin.ModelAdmin):
 
 @admin.register(Product)
 class ProductAdmin(admin.ModelAdmin):
+    list_filter = ("cafe",)
     list_display = ("name", "initial_consonant", "cafe")
+    list_select_related = ("cafe",)
@@ -5,3 +5,6 @@ class ProductsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.products"
     verbose_name = "Products"
+
+    def ready(self):
+        from apps.products import signals  # noqa: F401
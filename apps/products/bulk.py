@@ -0,0 +1,125 @@
+"""
+여러 개의 상품과 옵션을 일정한 수의 쿼리로 저장합니다.
+
+상품 일괄 등록 API(ProductBulkSerializer)와 메뉴 가져오기(apps.products.imports),
+옵션 그룹 수정(OptionGroupSerializer)이 사용합니다.
+bulk_create, bulk_update 는 save() 와 signal 을 거치지 않으므로, 검색용 필드와 검색 인덱스,
+카탈로그 버전, 자동완성 인덱스를 이곳에서 직접 갱신합니다.
+"""
+from apps.cafes.models import Cafe
+from apps.products.models import Option, Product
+from apps.products.search import get_search_backend
+from apps.products.suggestions import suggestion_cache
+
+# 수정되는 상품에서 입력으로 바뀔 수 있는 필드입니다.
+UPDATE_FIELDS = (
+    "name",
+    "description",
+    "cost",
+    "price",
+    "expireation_date",
+    "category",
+    "cafe",
+    *Product.SEARCH_FIELDS,
+)
+
+
+def bulk_save_products(products: list[Product], option_group_ids: list) -> None:
+    """
+    상품들을 저장하고, 각 상품의 옵션 그룹을 option_group_ids 의 같은 위치의 id 들로 바꿉니다.
+    id 가 없는 상품은 새로 등록하고, 있는 상품은 수정합니다.
+
+    트랜잭션은 호출하는 쪽에서 시작해야 합니다.
+    """
+    created, updated = [], []
+    for product in products:
+        product.cafe_id = product.category.cafe_id
+        product.refresh_search_fields()
+        (updated if product.pk else created).append(product)
+
+    if updated:
+        Product.objects.bulk_update(updated, UPDATE_FIELDS)
+    if created:
+        Product.objects.bulk_create(created)
+        assign_created_ids(created)
+    get_search_backend().index(products)
+
+    through = Product.option_groups.through
+    if updated:
+        through.objects.filter(product__in=updated).delete()
+    through.objects.bulk_create(
+        through(product_id=product.id, optiongroup_id=option_group_id)
+        for product, ids in zip(products, option_group_ids)
+        for option_group_id in dict.fromkeys(ids)
+    )
+
+    cafe_ids = {product.cafe_id for product in products}
+    Cafe.objects.filter(id__in=cafe_ids).bump_catalog_version()
+    for cafe_id in cafe_ids:
+        suggestion_cache.invalidate_on_commit(cafe_id)
+
+
+def assign_created_ids(products: list[Product]) -> None:
+    """
+    bulk_create 가 id 를 돌려주지 않는 데이터베이스(MySQL, SQLite)에서는
+    카테고리 안에서 유일한 이름으로 id 를 다시 조회합니다.
+    """
+    if all(product.pk for product in products):
+        return
+    ids = {
+        (category_id, name): product_id
+        for product_id, category_id, name in Product.objects.filter(
+            category_id__in={product.category_id for product in products},
+            name__in={product.name for product in products},
+        ).values_list("id", "category_id", "name")
+    }
+    for product in products:
+        product.pk = ids[(product.category_id, product.name)]
+
+
+def diff_options(option_group, current: list[Option], options_data: list[dict]):
+    """
+    옵션 그룹의 현재 옵션들과 입력된 옵션들을 이름으로 비교하여,
+    (새로 등록할 옵션, 추가 가격이 바뀐 옵션, 삭제할 옵션) 을 반환합니다.
+    """
+    current_by_name = {option.name: option for option in current}
+    created, updated = [], []
+    for item in options_data:
+        option = current_by_name.pop(item["name"], None)
+        if option is None:
+            created.append(
+                Option(
+                    name=item["name"],
+                    add_price=item["add_price"],
+                    option_group=option_group,
+                )
+            )
+        elif option.add_price != item["add_price"]:
+            option.add_price = item["add_price"]
+            updated.append(option)
+    return created, updated, list(current_by_name.values())
+
+
+def sync_options(option_group, options_data: list[dict]) -> None:
+    """
+    옵션 그룹의 옵션들을 options_data 와 같게 맞춥니다.
+    옵션의 수와 관계없이 조회, 수정, 등록은 각각 한 번, 삭제는 두 번의 쿼리로 처리합니다.
+
+    트랜잭션은 호출하는 쪽에서 시작해야 합니다. 수정, 등록은 signal 을 보내지 않으므로,
+    호출하는 쪽에서 옵션 그룹을 저장하여 카탈로그 버전을 올려야 합니다.
+    """
+    current = list(
+        Option.objects.filter(option_group=option_group).only(
+            "id", "name", "add_price", "option_group_id"
+        )
+    )
+    created, updated, deleted = diff_options(option_group, current, options_data)
+
+    if deleted:
+        # 삭제된 옵션들의 post_delete signal 은 카페 id 를 모아 두었다가,
+        # 커밋된 뒤 카탈로그 버전을 한 번만 올립니다. (apps.products.signals)
+        Option.objects.filter(id__in=[option.id for option in deleted]).delete()
+    if updated:
+        Option.objects.bulk_update(updated, ["add_price"])
+    if created:
+        Option.objects.bulk_create(created)
@@ -0,0 +1,138 @@
+"""
+카페 카탈로그(상품, 카테고리, 옵션 그룹) 조회 응답의 캐싱입니다.
+
+카페의 카탈로그가 바뀔 때마다 `Cafe.catalog_version` 이 올라가므로 (apps.products.signals),
+버전이 같다면 같은 요청에 대한 응답도 같습니다.
+POS 단말기처럼 몇 초마다 목록을 다시 조회하는 클라이언트는 ETag 를 If-None-Match 로 보내고,
+버전이 바뀌지 않았다면 카탈로그를 조회하거나 직렬화하지 않고 304 응답을 받습니다.
+
+ETag 가 없는 클라이언트의 같은 요청은, 렌더링된 응답을 카탈로그 버전을 포함한 키로
+Django 캐시에 저장해 두고 그대로 반환합니다. 버전이 올라가면 이전 키는 더 이상
+사용되지 않으므로, 캐시를 지우지 않고도 무효화되며 오래된 항목은 TIMEOUT 후에 사라집니다.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from apps.cafes.resolvers import get_request_cafe
+from apps.cafes.urls import CAFE_URL_KEYWORD
+
+
+class NotModified(APIException):
+    status_code = status.HTTP_304_NOT_MODIFIED
+    default_detail = "Not Modified"
+    default_code = "not_modified"
+
+
+def get_catalog_version(request, cafe_uuid) -> int | None:
+    """
+    카페의 카탈로그 버전을 반환합니다. 카페가 없으면 None 을 반환합니다.
+    권한 확인에서 요청에 저장된 카페를 사용하므로 따로 조회하지 않습니다.
+    """
+    cafe = get_request_cafe(request, cafe_uuid)
+    return cafe.catalog_version if cafe else None
+
+
+def make_catalog_etag(request, cafe_uuid, version: int) -> str:
+    """
+    카탈로그 버전과 요청(경로, 쿼리 파라미터, 응답 형식)으로 만든 strong ETag 입니다.
+    """
+    key = ":".join(
+        [
+            str(cafe_uuid),
+            str(version),
+            request.get_full_path(),
+            request.accepted_renderer.media_type,
+        ]
+    )
+    return '"{}"'.format(hashlib.md5(key.encode()).hexdigest())
+
+
+class CatalogETagMixin:
+    """
+    카탈로그 조회(GET, HEAD) 응답에 ETag 를 추가하고,
+    If-None-Match 가 일치하면 인증과 권한 확인 직후에 304 응답을 반환하는 viewset mixin 입니다.
+
+    304 응답은 예외로 처리되므로 CafehereRenderer 를 거치며, 본문은 비어 있습니다.
+    """
+
+    catalog_version = None
+    catalog_etag = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method not in ("GET", "HEAD"):
+            return
+
+        cafe_uuid = self.kwargs[CAFE_URL_KEYWORD]
+        self.catalog_version = get_catalog_version(request, cafe_uuid)
+        if self.catalog_version is None:
+            return
+
+        self.catalog_etag = make_catalog_etag(request, cafe_uuid, self.catalog_version)
+        etags = parse_etags(request.headers.get("If-None-Match", ""))
+        if "*" in etags or self.catalog_etag in etags:
+            raise NotModified()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self.catalog_etag and response.status_code in (
+            status.HTTP_200_OK,
+            status.HTTP_304_NOT_MODIFIED,
+        ):
+            response["ETag"] = self.catalog_etag
+        return response
+
+
+def get_response_cache():
+    return caches[settings.CATALOG_RESPONSE_CACHE["ALIAS"]]
+
+
+def make_response_cache_key(request, cafe_uuid, version: int) -> str:
+    """
+    카페, 카탈로그 버전과 요청(필터, 커서 등 쿼리 파라미터를 포함한 URL, 응답 형식)으로
+    만든 캐시 키입니다. 응답의 next, previous 링크는 요청의 호스트를 포함하므로
+    전체 URL 을 사용합니다.
+    """
+    url = request.build_absolute_uri()
+    media_type = request.accepted_renderer.media_type
+    variant = hashlib.md5(f"{url}:{media_type}".encode()).hexdigest()
+    return f"catalog:{cafe_uuid}:{version}:{variant}"
+
+
+class CatalogResponseCacheMixin:
+    """
+    list 응답을 렌더링된 bytes 로 캐시하는 viewset mixin 입니다.
+    CatalogETagMixin 이 조회한 카탈로그 버전을 키로 사용하므로 함께 사용되어야 합니다.
+
+    캐시된 응답은 직렬화와 렌더링을 거치지 않고 그대로 반환됩니다.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if self.catalog_version is None:
+            return super().list(request, *args, **kwargs)
+
+        cache = get_response_cache()
+        key = make_response_cache_key(
+            request, self.kwargs[CAFE_URL_KEYWORD], self.catalog_version
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response.add_post_render_callback(
+                lambda rendered: cache.set(
+                    key,
+                    (rendered.content, rendered["Content-Type"]),
+                    settings.CATALOG_RESPONSE_CACHE["TIMEOUT"],
+                )
+            )
+        return response
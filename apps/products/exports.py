@@ -0,0 +1,98 @@
+"""
+카페의 전체 상품을 파일(CSV, NDJSON)로 내보냅니다.
+
+상품은 chunk_size 개씩 데이터베이스에서 읽어 바로 응답으로 보내므로,
+상품의 수와 관계없이 서버는 한 chunk 만큼의 상품만 메모리에 가지고,
+첫 번째 행은 전체 조회가 끝나기 전에 전송됩니다.
+
+내보낸 파일의 열은 메뉴 가져오기(apps.products.imports)와 같으므로 다시 가져올 수 있습니다.
+"""
+import csv
+import json
+
+from apps.products.models import Product
+from apps.products.serializers import ProductImportRowSerializer
+
+EXPORT_TYPES = ("csv", "ndjson")
+DEFAULT_CHUNK_SIZE = 1000
+
+EXPORT_FIELDS = (
+    "id",
+    "name",
+    "description",
+    "cost",
+    "price",
+    "expireation_date",
+    "category",
+    "option_groups",
+)
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson; charset=utf-8",
+}
+
+
+def iter_product_rows(queryset, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    상품을 id 순서로 chunk_size 개씩 읽어, 내보낼 행(dict)을 하나씩 반환합니다.
+    옵션 그룹 이름은 chunk 마다 한 번의 쿼리로 조회합니다.
+
+    QuerySet.iterator() 는 MySQL(mysqlclient)에서 전체 결과를 클라이언트에 읽어 두므로,
+    마지막으로 읽은 id 이후의 chunk_size 개를 매번 조회합니다.
+    """
+    queryset = queryset.select_related("category").order_by("id")
+    last_id = 0
+    while chunk := list(queryset.filter(id__gt=last_id)[:chunk_size]):
+        last_id = chunk[-1].id
+        option_groups = {product.id: [] for product in chunk}
+        for product_id, name in (
+            Product.option_groups.through.objects.filter(product_id__in=option_groups)
+            .order_by("product_id", "optiongroup__name")
+            .values_list("product_id", "optiongroup__name")
+        ):
+            option_groups[product_id].append(name)
+
+        for product in chunk:
+            yield {
+                "id": product.id,
+                "name": product.name,
+                "description": product.description,
+                "cost": product.cost,
+                "price": product.price,
+                "expireation_date": product.expireation_date.isoformat(),
+                "category": product.category.name,
+                "option_groups": option_groups[product.id],
+            }
+
+        if len(chunk) < chunk_size:
+            break
+
+
+class _Echo:
+    """
+    csv.writer 가 쓴 한 행을 그대로 반환하는 버퍼입니다.
+    """
+
+    def write(self, value):
+        return value
+
+
+def render_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    separator = ProductImportRowSerializer.OPTION_GROUP_SEPARATOR
+    for row in rows:
+        row["option_groups"] = separator.join(row["option_groups"])
+        yield writer.writerow([row[field] for field in EXPORT_FIELDS])
+
+
+def render_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+
+RENDERERS = {
+    "csv": render_csv,
+    "ndjson": render_ndjson,
+}
@@ -1,7 +1,7 @@
-from django.db.models import Q
 from django_filters import rest_framework as filters
 
 from apps.products.models import Product
+from apps.products.search import filter_by_keys, get_search_backend, is_keys_query
 
 
 class ProductFilter(filters.FilterSet):
@@ -30,7 +30,21 @@ class ProductFilter(filters.FilterSet):
         - 이름 필드에 검색어가 포함되어 있거나
         - 초성 필드에 검색어가 포함되어 있으면
         검색어를 포함하는 Product 목록을 반환합니다.
+
+        데이터베이스에 맞는 검색 인덱스로 후보를 먼저 좁힙니다. (apps.products.search)
+
+        또, 한/영 전환을 잘못하여 입력된 검색어("zkvp", "ㅣㅁㅅㅅㄷ")와 같은 키로
+        입력되는 이름으로 시작하는 상품도 함께 반환합니다.
+        완성된 한글 음절이 있는 검색어는 자판 필드를 검색하지 않습니다.
+        MySQL 은 OR 로 묶인 MATCH ... AGAINST 에 FULLTEXT 인덱스를 사용하지 못하므로,
+        두 검색은 각자의 인덱스로 따로 조회한 뒤 id 를 합칩니다.
         """
-        return queryset.filter(
-            Q(name__icontains=value) | Q(initial_consonant__icontains=value)
-        )
+        products = get_search_backend().filter(queryset, value)
+        if not is_keys_query(value):
+            return products
+
+        ids = {
+            *products.order_by().values_list("id", flat=True),
+            *filter_by_keys(queryset, value).order_by().values_list("id", flat=True),
+        }
+        return queryset.filter(id__in=ids)
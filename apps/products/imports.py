@@ -0,0 +1,261 @@
+"""
+다른 POS 에서 옮겨 오는 메뉴 파일(CSV, NDJSON)을 가져옵니다.
+
+파일은 한 행씩 읽고, 검증을 통과한 상품은 batch_size 개씩 모아 bulk_create 로 저장하므로
+파일의 크기와 관계없이 한 batch 만큼의 메모리만 사용합니다.
+카테고리와 옵션 그룹은 이름으로 찾고, 없으면 만듭니다.
+한 번 찾은 이름은 가져오기가 끝날 때까지 기억하므로, 이름마다 한 번만 조회합니다.
+
+파일의 열(키)은 ProductImportRowSerializer 의 필드와 같습니다.
+
+    name,description,cost,price,expireation_date,category,option_groups
+    아메리카노,진한 커피,1000,3000,2026-12-31T00:00:00+09:00,Coffee,Size|Shot
+"""
+import csv
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+
+from django.db import DatabaseError, transaction
+
+from apps.products.bulk import bulk_save_products
+from apps.products.models import Category, OptionGroup, Product
+from apps.products.serializers import ProductImportRowSerializer
+
+logger = logging.getLogger(__name__)
+
+IMPORT_TYPES = ("csv", "ndjson")
+DEFAULT_BATCH_SIZE = 500
+
+# 응답에 포함하는 에러의 최대 개수입니다. 실패한 행의 수는 모두 셉니다.
+MAX_REPORTED_ERRORS = 100
+
+
+def get_import_type(filename: str) -> str | None:
+    """
+    파일 확장자로 가져오기 형식을 추측합니다.
+    """
+    extension = filename.rsplit(".", 1)[-1].lower()
+    if extension == "csv":
+        return "csv"
+    if extension in ("ndjson", "jsonl"):
+        return "ndjson"
+    return None
+
+
+class ImportFileError(Exception):
+    """
+    파일을 더 이상 읽을 수 없는 경우입니다. (UTF-8 이 아닌 행, 읽을 수 없는 CSV 등)
+    """
+
+    def __init__(self, line: int, message: str):
+        super().__init__(message)
+        self.line = line
+        self.message = message
+
+
+def decode_lines(file):
+    """
+    바이너리 파일에서 (행 번호, UTF-8 로 읽은 행) 을 하나씩 읽습니다.
+    UTF-8 로 읽을 수 없는 행은 None 을 반환합니다.
+    """
+    for line_number, line in enumerate(file, start=1):
+        try:
+            text = line.decode("utf-8-sig" if line_number == 1 else "utf-8")
+        except UnicodeDecodeError:
+            text = None
+        yield line_number, text
+
+
+def read_rows(file, import_type: str):
+    """
+    바이너리 파일에서 (행 번호, 행) 을 하나씩 읽습니다.
+    JSON 으로 읽을 수 없는 NDJSON 행은 None 을 반환합니다.
+    CSV 는 행이 여러 줄에 걸칠 수 있어 읽을 수 없는 행을 건너뛸 수 없으므로,
+    ImportFileError 를 발생시키고 읽기를 멈춥니다.
+    """
+    lines = decode_lines(file)
+    if import_type == "csv":
+        yield from read_csv_rows(lines)
+        return
+
+    for line_number, line in lines:
+        if line is not None and not line.strip():
+            continue
+        try:
+            row = json.loads(line) if line is not None else None
+        except ValueError:
+            row = None
+        yield line_number, row if isinstance(row, dict) else None
+
+
+def read_csv_rows(lines):
+    line_number = 0
+
+    def texts():
+        nonlocal line_number
+        for line_number, line in lines:
+            if line is None:
+                raise ImportFileError(line_number, "File is not valid UTF-8.")
+            yield line
+
+    reader = csv.DictReader(texts())
+    try:
+        for row in reader:
+            yield line_number, row
+    except csv.Error as error:
+        raise ImportFileError(line_number, f"Invalid CSV: {error}")
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    created: int = 0
+    failed: int = 0
+    errors: list = field(default_factory=list)
+    started: float = field(default_factory=time.monotonic)
+    elapsed: float = 0
+
+    @property
+    def rows_per_second(self) -> float:
+        elapsed = self.elapsed or time.monotonic() - self.started
+        return self.rows / elapsed if elapsed else 0
+
+    def add_error(self, line: int, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "errors": errors})
+
+    def to_dict(self) -> dict:
+        return {
+            "rows": self.rows,
+            "created": self.created,
+            "failed": self.failed,
+            "elapsed": round(self.elapsed, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+            "errors": self.errors,
+        }
+
+
+class MenuImporter:
+    def __init__(self, cafe, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.cafe = cafe
+        self.batch_size = batch_size
+        # 가져오는 동안 찾거나 만든 카테고리, 옵션 그룹 id 입니다.
+        self.categories: dict[str, Category] = {}
+        self.option_groups: dict[str, int] = {}
+
+    def run(self, rows, on_batch=None) -> ImportResult:
+        """
+        행들을 검증하고 batch_size 개씩 저장합니다.
+        검증에 실패한 행은 건너뛰고 에러를 기록합니다.
+        on_batch 는 batch 를 저장할 때마다 ImportResult 와 함께 호출됩니다.
+        """
+        result = ImportResult()
+        batch = []
+        try:
+            for line, row in rows:
+                result.rows += 1
+                if row is None:
+                    result.add_error(line, {"non_field_errors": ["Invalid row."]})
+                    continue
+                serializer = ProductImportRowSerializer(data=row)
+                if not serializer.is_valid():
+                    result.add_error(line, serializer.errors)
+                    continue
+                batch.append((line, serializer.validated_data))
+
+                if len(batch) >= self.batch_size:
+                    self.write(batch, result)
+                    batch = []
+                    if on_batch:
+                        on_batch(result)
+        except ImportFileError as error:
+            # 읽을 수 없는 행까지 읽은 행들은 저장하고, 나머지 행은 가져오지 않습니다.
+            result.rows += 1
+            result.add_error(error.line, {"non_field_errors": [error.message]})
+
+        if batch:
+            self.write(batch, result)
+            if on_batch:
+                on_batch(result)
+        result.elapsed = time.monotonic() - result.started
+        return result
+
+    def write(self, batch, result: ImportResult):
+        """
+        한 batch 의 상품들을 저장합니다. 카테고리 안에서 이름이 중복되는 행은 건너뜁니다.
+
+        데이터베이스 에러(동시에 저장된 같은 이름 등)로 batch 가 롤백되면, batch 의 모든 행을
+        실패로 기록하고 다음 batch 를 계속 저장합니다. 따라서 결과는 항상 저장된 행을 나타냅니다.
+        """
+        categories, option_groups = dict(self.categories), dict(self.option_groups)
+        failed, errors = result.failed, len(result.errors)
+        try:
+            self.write_batch(batch, result)
+        except Exception as error:
+            # 롤백된 batch 에서 만든 카테고리, 옵션 그룹은 데이터베이스에 없으므로 잊어버립니다.
+            self.categories, self.option_groups = categories, option_groups
+            if not isinstance(error, DatabaseError):
+                raise
+            logger.warning("Failed to import a batch of products.", exc_info=True)
+            # batch 안에서 기록한 에러는 batch 의 모든 행에 대한 에러로 바꿉니다.
+            result.failed = failed
+            del result.errors[errors:]
+            for line, _ in batch:
+                result.add_error(
+                    line, {"non_field_errors": ["The row could not be saved."]}
+                )
+
+    @transaction.atomic
+    def write_batch(self, batch, result: ImportResult):
+        taken_names = set(
+            Product.objects.filter(
+                cafe=self.cafe, name__in={data["name"] for _, data in batch}
+            ).values_list("category_id", "name")
+        )
+
+        products, option_group_ids = [], []
+        for line, data in batch:
+            category = self.get_category(data["category"])
+            key = (category.id, data["name"])
+            if key in taken_names:
+                result.add_error(
+                    line, {"name": ["Product name must be unique in the category."]}
+                )
+                continue
+            taken_names.add(key)
+
+            products.append(
+                Product(
+                    name=data["name"],
+                    description=data["description"],
+                    cost=data["cost"],
+                    price=data["price"],
+                    expireation_date=data["expireation_date"],
+                    category=category,
+                )
+            )
+            option_group_ids.append(
+                [self.get_option_group_id(name) for name in data["option_groups"]]
+            )
+
+        if products:
+            bulk_save_products(products, option_group_ids)
+            result.created += len(products)
+
+    def get_category(self, name: str) -> Category:
+        if name not in self.categories:
+            self.categories[name], _ = Category.objects.get_or_create(
+                cafe=self.cafe, name=name
+            )
+        return self.categories[name]
+
+    def get_option_group_id(self, name: str) -> int:
+        if name not in self.option_groups:
+            option_group, _ = OptionGroup.objects.get_or_create(
+                cafe=self.cafe, name=name
+            )
+            self.option_groups[name] = option_group.id
+        return self.option_groups[name]
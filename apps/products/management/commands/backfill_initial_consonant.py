@@ -0,0 +1,140 @@
+import json
+import os
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.cafes.models import Cafe
+from apps.products.models import Product
+from apps.products.search import get_search_backend
+from apps.products.suggestions import suggestion_cache
+
+DEFAULT_CHECKPOINT = Path(settings.BASE_DIR) / "backfill_initial_consonant.checkpoint"
+
+
+class Command(BaseCommand):
+    help = """
+    모든 상품의 초성 등 검색용 필드를 다시 계산하여 저장합니다.
+
+    save() 를 거치지 않고 저장된 상품(QuerySet.update, bulk_create 등)은
+    초성 필드가 비어 있으므로, 이 명령어로 채워 넣어야 합니다.
+
+    상품은 id 순서로 chunk-size 개씩 나누어 처리되고, 각 chunk 는
+    하나의 트랜잭션 안에서 bulk_update 로 저장됩니다.
+    처리가 끝난 마지막 id 는 checkpoint 파일에 기록되므로,
+    중간에 멈추더라도 다시 실행하면 이어서 처리합니다.
+    모든 상품을 처리하면 checkpoint 파일은 삭제되므로, 다음 실행은 처음부터 처리합니다.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--checkpoint",
+            type=Path,
+            default=DEFAULT_CHECKPOINT,
+            help="처리가 끝난 마지막 상품 id 를 기록할 파일 경로입니다.",
+        )
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="checkpoint 를 무시하고 처음부터 다시 처리합니다.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="운영 중인 데이터베이스의 부하를 줄이기 위해 chunk 사이에 쉬는 시간(초)입니다.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="저장하지 않고, 갱신이 필요한 상품의 수만 셉니다.",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        checkpoint = options["checkpoint"]
+        dry_run = options["dry_run"]
+
+        last_id = 0 if options["reset"] else self.read_checkpoint(checkpoint)
+        if last_id:
+            self.stdout.write(f"Resuming after product id {last_id}.")
+
+        backend = get_search_backend()
+        scanned = changed_count = 0
+        while True:
+            products = list(
+                Product.objects.filter(id__gt=last_id)
+                .order_by("id")
+                .only("id", "name", "cafe_id", *Product.SEARCH_FIELDS)[:chunk_size]
+            )
+            if not products:
+                break
+
+            changed = self.refresh(products)
+            if changed and not dry_run:
+                cafe_ids = {product.cafe_id for product in changed}
+                with transaction.atomic():
+                    Product.objects.bulk_update(changed, Product.SEARCH_FIELDS)
+                    backend.index(changed)
+                    Cafe.objects.filter(id__in=cafe_ids).bump_catalog_version()
+                    # 자동완성 인덱스는 이름의 자모(name_jamo)로 만들어집니다.
+                    for cafe_id in cafe_ids:
+                        suggestion_cache.invalidate_on_commit(cafe_id)
+
+            scanned += len(products)
+            changed_count += len(changed)
+            last_id = products[-1].id
+            if not dry_run:
+                self.write_checkpoint(checkpoint, last_id)
+            self.stdout.write(
+                f"Scanned {scanned} products, {changed_count} need update "
+                f"(last id {last_id})."
+            )
+
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        if not dry_run:
+            checkpoint.unlink(missing_ok=True)
+
+        if dry_run:
+            self.stdout.write(
+                self.style.SUCCESS(f"{changed_count} products would be updated.")
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(f"{changed_count} products were updated.")
+            )
+
+    @staticmethod
+    def refresh(products):
+        """
+        검색용 필드를 다시 계산하고, 값이 바뀐 상품들만 반환합니다.
+        """
+        changed = []
+        for product in products:
+            previous = [getattr(product, field) for field in Product.SEARCH_FIELDS]
+            product.refresh_search_fields()
+            current = [getattr(product, field) for field in Product.SEARCH_FIELDS]
+            if previous != current:
+                changed.append(product)
+        return changed
+
+    @staticmethod
+    def read_checkpoint(path: Path) -> int:
+        if not path.exists():
+            return 0
+        return json.loads(path.read_text())["last_id"]
+
+    @staticmethod
+    def write_checkpoint(path: Path, last_id: int):
+        """
+        중간에 멈추더라도 파일이 깨지지 않도록, 임시 파일에 쓴 뒤 교체합니다.
+        """
+        temp_path = path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps({"last_id": last_id}))
+        os.replace(temp_path, path)
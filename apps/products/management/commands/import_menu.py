@@ -0,0 +1,63 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.cafes.models import Cafe
+from apps.products.imports import (
+    DEFAULT_BATCH_SIZE,
+    IMPORT_TYPES,
+    MenuImporter,
+    get_import_type,
+    read_rows,
+)
+
+
+class Command(BaseCommand):
+    help = """
+    메뉴 파일(CSV, NDJSON)의 상품들을 카페로 가져옵니다.
+
+    파일은 한 행씩 읽고 batch-size 개씩 저장하므로, 파일의 크기와 관계없이
+    일정한 메모리를 사용합니다. 카테고리와 옵션 그룹은 이름으로 찾고, 없으면 만듭니다.
+    검증에 실패한 행은 건너뛰고, 마지막에 행 번호와 에러를 출력합니다.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("cafe_uuid", help="상품을 가져올 카페의 uuid 입니다.")
+        parser.add_argument("path", type=Path, help="메뉴 파일 경로입니다.")
+        parser.add_argument(
+            "--type",
+            choices=IMPORT_TYPES,
+            help="파일 형식입니다. 없으면 파일 확장자로 추측합니다.",
+        )
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        import_type = options["type"] or get_import_type(path.name)
+        if import_type is None:
+            raise CommandError(
+                f"Cannot guess the import type of {path.name}. Use --type."
+            )
+        cafe = Cafe.objects.filter(uuid=options["cafe_uuid"]).first()
+        if cafe is None:
+            raise CommandError(f"Cafe {options['cafe_uuid']} does not exist.")
+
+        importer = MenuImporter(cafe, batch_size=options["batch_size"])
+        with path.open("rb") as file:
+            result = importer.run(read_rows(file, import_type), self.report)
+
+        for error in result.errors:
+            self.stderr.write(f"Line {error['line']}: {error['errors']}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {result.created} of {result.rows} rows "
+                f"({result.failed} failed) in {result.elapsed:.1f}s "
+                f"({result.rows_per_second:.0f} rows/s)."
+            )
+        )
+
+    def report(self, result):
+        self.stdout.write(
+            f"Read {result.rows} rows, created {result.created} products "
+            f"({result.rows_per_second:.0f} rows/s)."
+        )
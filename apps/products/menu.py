@@ -0,0 +1,79 @@
+"""
+주문 화면을 그리기 위한 카페의 전체 메뉴 트리입니다.
+
+    카페 -> 카테고리 -> 상품 -> 옵션 그룹 -> 옵션
+
+카테고리를 조회한 뒤 상품, 옵션 그룹, 옵션을 각각 한 번씩 prefetch 하므로
+메뉴의 크기와 관계없이 4개의 쿼리로 만들어집니다.
+중첩된 ModelSerializer 대신 필요한 필드만 dict 로 옮겨 담습니다.
+"""
+from django.db.models import Prefetch
+
+from apps.products.models import Category, Option, OptionGroup, Product
+
+
+def get_menu_categories(cafe):
+    return (
+        Category.objects.filter(cafe=cafe)
+        .order_by("id")
+        .prefetch_related(
+            Prefetch(
+                "products",
+                queryset=Product.objects.only(
+                    "id", "name", "description", "price", "category_id"
+                ).order_by("id"),
+            ),
+            Prefetch(
+                "products__option_groups",
+                queryset=OptionGroup.objects.only("id", "name").order_by("id"),
+            ),
+            Prefetch(
+                "products__option_groups__options",
+                queryset=Option.objects.only(
+                    "id", "name", "add_price", "option_group_id"
+                ).order_by("id"),
+            ),
+        )
+    )
+
+
+def build_menu(cafe, catalog_version: int) -> dict:
+    """
+    카페의 메뉴 트리를 dict 로 만듭니다.
+    catalog_version 은 메뉴를 조회하기 전에 읽은 카탈로그 버전입니다.
+    """
+    return {
+        "cafe": {"uuid": str(cafe.uuid), "name": cafe.name},
+        "catalog_version": catalog_version,
+        "categories": [
+            {
+                "id": category.id,
+                "name": category.name,
+                "products": [
+                    {
+                        "id": product.id,
+                        "name": product.name,
+                        "description": product.description,
+                        "price": product.price,
+                        "option_groups": [
+                            {
+                                "id": option_group.id,
+                                "name": option_group.name,
+                                "options": [
+                                    {
+                                        "id": option.id,
+                                        "name": option.name,
+                                        "add_price": option.add_price,
+                                    }
+                                    for option in option_group.options.all()
+                                ],
+                            }
+                            for option_group in product.option_groups.all()
+                        ],
+                    }
+                    for product in category.products.all()
+                ],
+            }
+            for category in get_menu_categories(cafe)
+        ],
+    }
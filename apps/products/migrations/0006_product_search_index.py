@@ -0,0 +1,113 @@
+# Generated by Django 3.2.25 on 2026-10-18 10:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# 이후의 코드 변경이 마이그레이션에 영향을 주지 않도록, apps.products.search 의 값과 함수를
+# 이 마이그레이션을 작성한 시점의 내용으로 복사해 둡니다.
+FULLTEXT_INDEX_NAME = "product_search_ngram"
+NGRAM_SIZE = 2
+
+BATCH_SIZE = 1000
+
+
+def get_ngrams(*values):
+    ngrams = set()
+    for value in values:
+        value = value.lower()
+        ngrams.update(
+            value[i : i + NGRAM_SIZE] for i in range(len(value) - NGRAM_SIZE + 1)
+        )
+    return ngrams
+
+
+def create_fulltext_index(apps, schema_editor):
+    """
+    MySQL 에서는 이름과 초성 필드에 ngram parser FULLTEXT 인덱스를 생성합니다.
+    """
+    if schema_editor.connection.vendor != "mysql":
+        return
+    schema_editor.execute(
+        f"ALTER TABLE products_product ADD FULLTEXT INDEX {FULLTEXT_INDEX_NAME} "
+        "(name, initial_consonant) WITH PARSER ngram"
+    )
+
+
+def drop_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "mysql":
+        return
+    schema_editor.execute(
+        f"ALTER TABLE products_product DROP INDEX {FULLTEXT_INDEX_NAME}"
+    )
+
+
+def populate_search_grams(apps, schema_editor):
+    """
+    MySQL 이 아닌 경우, 기존 상품들의 n-gram 을 일정 크기씩 나누어 저장합니다.
+    """
+    if schema_editor.connection.vendor == "mysql":
+        return
+    Product = apps.get_model("products", "Product")
+    ProductSearchGram = apps.get_model("products", "ProductSearchGram")
+
+    last_id = 0
+    while True:
+        products = list(
+            Product.objects.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", "name", "initial_consonant")[:BATCH_SIZE]
+        )
+        if not products:
+            break
+        ProductSearchGram.objects.bulk_create(
+            ProductSearchGram(product_id=product_id, gram=gram)
+            for product_id, name, initial_consonant in products
+            for gram in get_ngrams(name, initial_consonant)
+        )
+        last_id = products[-1][0]
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0005_auto_20230902_2228"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductSearchGram",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("gram", models.CharField(max_length=2)),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_grams",
+                        to="products.product",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="productsearchgram",
+            index=models.Index(
+                fields=["gram", "product"], name="product_search_gram_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="productsearchgram",
+            constraint=models.UniqueConstraint(
+                fields=("product", "gram"), name="unique_gram_per_product"
+            ),
+        ),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+        migrations.RunPython(populate_search_grams, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 3.2.25 on 2026-10-18 10:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0006_product_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="name_jamo",
+            field=models.CharField(default="", editable=False, max_length=150),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(fields=["name_jamo"], name="product_name_jamo_idx"),
+        ),
+    ]
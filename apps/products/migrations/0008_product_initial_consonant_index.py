@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0007_product_name_jamo"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["initial_consonant"], name="product_initial_consonant_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 3.2.25 on 2026-10-18 10:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0008_product_initial_consonant_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="name_keys",
+            field=models.CharField(default="", editable=False, max_length=150),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(fields=["name_keys"], name="product_name_keys_idx"),
+        ),
+    ]
@@ -0,0 +1,96 @@
+# Generated by Django 3.2.25 on 2026-10-18 11:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def populate_product_cafe(apps, schema_editor):
+    """
+    기존 상품들의 카페를 카테고리의 카페로 채웁니다.
+    큰 테이블을 한 번에 갱신하지 않도록 id 순서로 일정 크기씩 나누어 처리합니다.
+    """
+    Category = apps.get_model("products", "Category")
+    Product = apps.get_model("products", "Product")
+
+    last_id = 0
+    while True:
+        ids = list(
+            Product.objects.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", flat=True)[:BATCH_SIZE]
+        )
+        if not ids:
+            break
+        Product.objects.filter(id__in=ids).update(
+            cafe_id=models.Subquery(
+                Category.objects.filter(id=models.OuterRef("category_id")).values(
+                    "cafe_id"
+                )[:1]
+            )
+        )
+        last_id = ids[-1]
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("cafes", "0002_cafe_unique_cafe_name_per_user"),
+        ("products", "0009_product_name_keys"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="cafe",
+            field=models.ForeignKey(
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="products",
+                to="cafes.cafe",
+            ),
+        ),
+        migrations.RunPython(populate_product_cafe, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="product",
+            name="cafe",
+            field=models.ForeignKey(
+                editable=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="products",
+                to="cafes.cafe",
+            ),
+        ),
+        migrations.RemoveIndex(
+            model_name="product",
+            name="product_name_jamo_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="product",
+            name="product_initial_consonant_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="product",
+            name="product_name_keys_idx",
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["cafe", "name_jamo"], name="product_cafe_name_jamo_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["cafe", "initial_consonant"],
+                name="product_cafe_consonant_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["cafe", "name_keys"], name="product_cafe_name_keys_idx"
+            ),
+        ),
+    ]
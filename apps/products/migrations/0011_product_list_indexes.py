@@ -0,0 +1,47 @@
+# Generated by Django 3.2.25 on 2026-10-18 11:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("cafes", "0002_cafe_unique_cafe_name_per_user"),
+        ("products", "0010_product_cafe"),
+    ]
+
+    # MySQL 은 외래 키에 사용되는 인덱스를 지울 수 없으므로,
+    # 복합 인덱스를 먼저 만든 뒤에 단일 컬럼 인덱스를 제거합니다.
+    operations = [
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(fields=["cafe", "-id"], name="product_cafe_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["category", "-id"], name="product_category_id_idx"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="product",
+            name="cafe",
+            field=models.ForeignKey(
+                db_index=False,
+                editable=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="products",
+                to="cafes.cafe",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="product",
+            name="category",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="products",
+                to="products.category",
+            ),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 3.2.25 on 2026-10-18 10:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0011_product_list_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["cafe", "price", "id"], name="product_cafe_price_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["cafe", "name", "id"], name="product_cafe_name_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["cafe", "created", "id"], name="product_cafe_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["cafe", "expireation_date", "id"],
+                name="product_cafe_expiration_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations
+
+# 이후의 코드 변경이 마이그레이션에 영향을 주지 않도록 인덱스 이름을 복사해 둡니다.
+FULLTEXT_INDEX_NAME = "product_search_ngram"
+
+
+def recreate_fulltext_index(apps, schema_editor):
+    """
+    MySQL 의 ngram parser 는 기본 stopword("a", "i" 등)를 포함하는 n-gram 을 인덱스에서
+    제외하므로, "la", "ai" 같은 검색어로는 상품을 찾을 수 없습니다.
+    stopword 를 사용하지 않도록 설정한 세션에서 FULLTEXT 인덱스를 다시 생성합니다.
+    stopword 설정은 인덱스를 생성할 때 적용되므로, 이후의 재생성(OPTIMIZE TABLE 등)을 위해
+    서버에도 innodb_ft_enable_stopword=0 이 설정되어야 합니다. (docker-compose.yml)
+    """
+    if schema_editor.connection.vendor != "mysql":
+        return
+    schema_editor.execute("SET SESSION innodb_ft_enable_stopword = 0")
+    schema_editor.execute(
+        f"ALTER TABLE products_product DROP INDEX {FULLTEXT_INDEX_NAME}"
+    )
+    schema_editor.execute(
+        f"ALTER TABLE products_product ADD FULLTEXT INDEX {FULLTEXT_INDEX_NAME} "
+        "(name, initial_consonant) WITH PARSER ngram"
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0012_product_ordering_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(recreate_fulltext_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,99 @@
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+# 이후의 코드 변경이 마이그레이션에 영향을 주지 않도록, 이 마이그레이션을 작성한 시점의
+# 자판 변환(core.utils.hangeul.to_keystrokes)과 get_name_keys 를 복사해 둡니다.
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = ("",) + tuple("ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ")
+COMPOUND_SPLITS = {
+    "ㅘ": "ㅗㅏ",
+    "ㅙ": "ㅗㅐ",
+    "ㅚ": "ㅗㅣ",
+    "ㅝ": "ㅜㅓ",
+    "ㅞ": "ㅜㅔ",
+    "ㅟ": "ㅜㅣ",
+    "ㅢ": "ㅡㅣ",
+    "ㄳ": "ㄱㅅ",
+    "ㄵ": "ㄴㅈ",
+    "ㄶ": "ㄴㅎ",
+    "ㄺ": "ㄹㄱ",
+    "ㄻ": "ㄹㅁ",
+    "ㄼ": "ㄹㅂ",
+    "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ",
+    "ㄿ": "ㄹㅍ",
+    "ㅀ": "ㄹㅎ",
+    "ㅄ": "ㅂㅅ",
+}
+KEYBOARD_LAYOUT = dict(
+    zip(
+        "ㅂㅈㄷㄱㅅㅛㅕㅑㅐㅔㅁㄴㅇㄹㅎㅗㅓㅏㅣㅋㅌㅊㅍㅠㅜㅡㅃㅉㄸㄲㅆㅒㅖ",
+        "qwertyuiopasdfghjklzxcvbnmQWERTOP",
+    )
+)
+SHIFT_KEYS = frozenset("QWERTOP")
+
+
+def build_keystroke_table():
+    def to_keys(jamo):
+        return "".join(
+            KEYBOARD_LAYOUT.get(char, char)
+            for char in "".join(COMPOUND_SPLITS.get(char, char) for char in jamo)
+        )
+
+    table = {}
+    for offset in range(len(CHOSEONG) * len(JUNGSEONG) * len(JONGSEONG)):
+        choseong, rest = divmod(offset, len(JUNGSEONG) * len(JONGSEONG))
+        jungseong, jongseong = divmod(rest, len(JONGSEONG))
+        table[0xAC00 + offset] = to_keys(
+            CHOSEONG[choseong] + JUNGSEONG[jungseong] + JONGSEONG[jongseong]
+        )
+    for compound in COMPOUND_SPLITS:
+        table[ord(compound)] = to_keys(compound)
+    for jamo, key in KEYBOARD_LAYOUT.items():
+        table[ord(jamo)] = key
+    return table
+
+
+def get_name_keys(value, table):
+    return "".join(
+        key if key in SHIFT_KEYS else key.lower() for key in value.translate(table)
+    )
+
+
+def refresh_name_keys(apps, schema_editor):
+    """
+    Shift 키로 입력되는 자모를 구분하도록, 기존 상품들의 자판 필드를 다시 계산합니다.
+    """
+    Product = apps.get_model("products", "Product")
+    table = build_keystroke_table()
+
+    last_id = 0
+    while True:
+        products = list(
+            Product.objects.filter(id__gt=last_id)
+            .order_by("id")
+            .only("id", "name", "name_keys")[:BATCH_SIZE]
+        )
+        if not products:
+            break
+        changed = []
+        for product in products:
+            name_keys = get_name_keys(product.name, table)
+            if product.name_keys != name_keys:
+                product.name_keys = name_keys
+                changed.append(product)
+        Product.objects.bulk_update(changed, ["name_keys"])
+        last_id = products[-1].id
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0013_product_search_index_stopwords"),
+    ]
+
+    operations = [
+        migrations.RunPython(refresh_name_keys, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,7 @@
 from django.core.validators import MinValueValidator
 from django.db import models
 
+from apps.products.search import get_name_jamo, get_name_keys, get_search_backend
 from core.utils.hangeul import get_initial_consonant
 from core.utils.models import TimeStampedMixin
 
@@ -23,6 +24,11 @@ class Category(models.Model):
             )
         ]
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # 상품은 카페를 따로 저장하므로, 카테고리의 카페가 바뀌면 함께 바꿔 줍니다.
+        self.products.exclude(cafe_id=self.cafe_id).update(cafe_id=self.cafe_id)
+
     def __str__(self):
         return f"Category {self.name}"
 
@@ -86,17 +92,32 @@ class Product(TimeStampedMixin):
     initial_consonant = models.CharField(
         max_length=30, editable=False
     )  # 초성 필드. 한글이 입력되면 자동으로 초성이 저장됩니다.
+    name_jamo = models.CharField(
+        max_length=150, editable=False, default=""
+    )  # 자모 필드. 입력 중인 글자로도 자동완성이 가능하도록 이름을 자모로 분해하여 저장합니다.
+    name_keys = models.CharField(
+        max_length=150, editable=False, default=""
+    )  # 자판 필드. 한/영 전환을 잘못한 검색어로도 검색되도록, 이름을 입력하는 키를 저장합니다.
+    # MySQL 에서는 마이그레이션(0015)으로 binary collation 을 사용하므로, 필드를 바꿀 때 유지해야 합니다.
     barcode = models.ImageField(
         upload_to="products/barcodes", blank=True, null=True
     )  # 바코드 이미지 필드.
+    # 카테고리와 카페로 조회할 때는 Meta.indexes 의 복합 인덱스를 사용하므로,
+    # 외래 키의 단일 컬럼 인덱스는 만들지 않습니다.
     category = models.ForeignKey(
-        Category, on_delete=models.CASCADE, related_name="products"
+        Category, on_delete=models.CASCADE, related_name="products", db_index=False
     )
+    cafe = models.ForeignKey(
+        "cafes.Cafe",
+        on_delete=models.CASCADE,
+        related_name="products",
+        editable=False,
+        db_index=False,
+    )  # 카테고리의 카페입니다. 카테고리를 거치지 않고 카페로 조회할 수 있도록 따로 저장합니다.
     option_groups = models.ManyToManyField(OptionGroup, blank=True)
 
-    @property
-    def cafe(self):
-        return self.category.cafe
+    # 이름으로부터 계산되어 저장되는 검색용 필드들입니다.
+    SEARCH_FIELDS = ("initial_consonant", "name_jamo", "name_keys")
 
     class Meta:
         # 카테고리 안에서 생성되는 상품 타입들은 중복된 이름을 가질 수 없습니다.
@@ -105,12 +126,79 @@ class Product(TimeStampedMixin):
                 fields=["name", "category"], name="unique_product_per_category"
             )
         ]
+        indexes = [
+            # 상품 목록은 카페(또는 카테고리)로 필터링한 뒤 id 역순으로 페이지를 나눕니다.
+            # (apps.products.pagination)
+            models.Index(fields=["cafe", "-id"], name="product_cafe_id_idx"),
+            models.Index(fields=["category", "-id"], name="product_category_id_idx"),
+            # ?ordering= 으로 정렬하는 상품 목록은 (정렬 키, id) 순서로 페이지를 나눕니다.
+            models.Index(fields=["cafe", "price", "id"], name="product_cafe_price_idx"),
+            models.Index(fields=["cafe", "name", "id"], name="product_cafe_name_idx"),
+            models.Index(
+                fields=["cafe", "created", "id"], name="product_cafe_created_idx"
+            ),
+            models.Index(
+                fields=["cafe", "expireation_date", "id"],
+                name="product_cafe_expiration_idx",
+            ),
+            # 자동완성은 카페 안에서 자모, 초성 필드의 접두사 범위 검색으로 이루어집니다.
+            models.Index(
+                fields=["cafe", "name_jamo"], name="product_cafe_name_jamo_idx"
+            ),
+            models.Index(
+                fields=["cafe", "initial_consonant"],
+                name="product_cafe_consonant_idx",
+            ),
+            models.Index(
+                fields=["cafe", "name_keys"], name="product_cafe_name_keys_idx"
+            ),
+        ]
 
     def save(
         self, force_insert=False, force_update=False, using=None, update_fields=None
     ):
-        self.initial_consonant = get_initial_consonant(self.name)
+        self.cafe_id = self.category.cafe_id
+        self.refresh_search_fields()
         super().save(force_insert, force_update, using, update_fields)
+        # 검색 인덱스는 이름으로부터 만들어지므로, 이름이 저장될 때에만 다시 만듭니다.
+        if update_fields is None or "name" in update_fields:
+            get_search_backend().index([self])
+
+    def refresh_search_fields(self):
+        """
+        이름으로부터 계산되는 검색용 필드들을 다시 계산합니다.
+        save() 를 거치지 않는 bulk_create, bulk_update 전에도 호출되어야 합니다.
+        """
+        self.initial_consonant = get_initial_consonant(self.name)
+        self.name_jamo = get_name_jamo(self.name)
+        self.name_keys = get_name_keys(self.name)
 
     def __str__(self):
         return f"Product {self.name}"
+
+
+class ProductSearchGram(models.Model):
+    """
+    상품 검색에 사용되는 n-gram 인덱스입니다.
+    FULLTEXT 인덱스를 사용할 수 없는 데이터베이스에서만 사용됩니다.
+
+    상품의 이름과 초성에서 만들어진 n-gram 이 상품마다 한 번씩 저장됩니다.
+    """
+
+    product = models.ForeignKey(
+        Product, on_delete=models.CASCADE, related_name="search_grams"
+    )
+    gram = models.CharField(max_length=2)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product", "gram"], name="unique_gram_per_product"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["gram", "product"], name="product_search_gram_idx"),
+        ]
+
+    def __str__(self):
+        return f"ProductSearchGram {self.gram}"
@@ -1,6 +1,161 @@
-from rest_framework.pagination import CursorPagination
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, _reverse_ordering
 
 
 class CafehereCursorPagination(CursorPagination):
+    """
+    정렬 키와 id 를 함께 커서에 담는 keyset 페이지네이션입니다.
+
+    `?ordering=price`, `?ordering=-expireation_date` 처럼 view 의 ordering_fields 에
+    포함된 필드로 정렬할 수 있고, 같은 값을 가진 행들은 id 로 정렬됩니다.
+    커서는 마지막 행의 (정렬 키, id) 를 가지므로, 페이지가 깊어져도
+    (카페, 정렬 키, id) 인덱스에서 페이지 크기만큼만 읽습니다.
+    """
+
     page_size = 10
     ordering = "-id"
+    ordering_param = "ordering"
+
+    def get_ordering(self, request, queryset, view):
+        value = request.query_params.get(self.ordering_param, "")
+        field = value.lstrip("-")
+        # 허용되지 않은 정렬 필드는 OrderingFilter 처럼 무시합니다.
+        if not field or field not in getattr(view, "ordering_fields", ()):
+            return (self.ordering,)
+        if value.startswith("-"):
+            return (f"-{field}", "-id")
+        return (field, "id")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+
+        ordering = _reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if current_position is not None:
+            try:
+                queryset = queryset.filter(
+                    self.get_keyset_filter(ordering, json.loads(current_position))
+                )
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+
+        # 다음 페이지가 있는지 확인하기 위해 한 개를 더 조회합니다.
+        results = list(queryset[offset : offset + self.page_size + 1])
+        self.page = results[: self.page_size]
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(
+                results[-1], self.ordering
+            )
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def decode_cursor(self, request):
+        cursor = super().decode_cursor(request)
+        if cursor is None or cursor.position is None:
+            return cursor
+        try:
+            position = json.loads(cursor.position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        # id 하나만 담긴 이전 형식의 커서도 받습니다.
+        if not isinstance(position, list):
+            position = [position]
+        if len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor._replace(position=json.dumps(position))
+
+    @staticmethod
+    def get_keyset_filter(ordering, position) -> Q:
+        """
+        ordering 순서에서 position 보다 뒤에 있는 행들의 조건입니다.
+
+        (price, id) 순서라면 `price >= p AND (price > p OR (price = p AND id > i))`
+        가 됩니다. 첫 번째 정렬 키의 범위 조건이 있으므로 인덱스의 범위 검색으로 처리됩니다.
+        """
+        condition = Q()
+        equal = Q()
+        for order, value in zip(ordering, position):
+            attr = order.lstrip("-")
+            lookup = "lt" if order.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{attr}__{lookup}": value})
+            equal &= Q(**{attr: value})
+
+        first = ordering[0]
+        lookup = "lte" if first.startswith("-") else "gte"
+        return Q(**{f"{first.lstrip('-')}__{lookup}": position[0]}) & condition
+
+    def _get_position_from_instance(self, instance, ordering):
+        """
+        커서에 담기는 위치는 모든 정렬 키의 값을 JSON 으로 나타낸 문자열입니다.
+        """
+        values = []
+        for order in ordering:
+            attr = order.lstrip("-")
+            if isinstance(instance, dict):
+                value = instance[attr]
+            else:
+                value = getattr(instance, attr)
+            values.append(value if isinstance(value, (int, str)) else str(value))
+        return json.dumps(values)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        ordering_fields = getattr(view, "ordering_fields", ())
+        if ordering_fields:
+            parameters.append(
+                {
+                    "name": self.ordering_param,
+                    "required": False,
+                    "in": "query",
+                    "description": "정렬 필드입니다. 앞에 '-' 를 붙이면 내림차순으로 정렬합니다.",
+                    "schema": {
+                        "type": "string",
+                        "enum": [
+                            f"{prefix}{field}"
+                            for field in ordering_fields
+                            for prefix in ("", "-")
+                        ],
+                    },
+                }
+            )
+        return parameters
@@ -1,14 +1,16 @@
 from rest_framework.permissions import IsAuthenticated
 
-from apps.cafes.models import Cafe
+from apps.cafes.resolvers import get_cafe_ownership
+from apps.cafes.urls import CAFE_URL_KEYWORD
 
 
 class IsCafeOwner(IsAuthenticated):
     def has_permission(self, request, view):
-        cafe = Cafe.objects.filter(uuid__exact=view.kwargs["cafe_uuid"]).first()
-        if cafe:
-            return super().has_permission(request, view) and (
-                request.user == cafe.owner
-            )
+        if not super().has_permission(request, view):
+            return False
 
-        return super().has_permission(request, view)
+        # 카페의 owner 는 캐시되어 있으므로, 대부분의 요청은 카페를 조회하지 않습니다.
+        ownership = get_cafe_ownership(request, view.kwargs[CAFE_URL_KEYWORD])
+        if ownership:
+            return request.user.pk == ownership.owner_id
+        return True
@@ -0,0 +1,204 @@
+"""
+상품 검색 인덱스입니다.
+
+상품 검색은 이름과 초성 필드에 대한 부분 문자열 검색입니다.
+`LIKE '%검색어%'` 는 인덱스를 사용할 수 없어 카페의 모든 상품을 읽게 되므로,
+데이터베이스에 맞는 n-gram 인덱스로 후보를 먼저 좁힌 뒤 검색어를 확인합니다.
+
+- MySQL: ngram parser 를 사용하는 FULLTEXT 인덱스를 사용합니다.
+- 그 외 (SQLite 등): `ProductSearchGram` 테이블에 저장된 n-gram 을 사용합니다.
+"""
+from django.db import connection
+from django.db.models import BooleanField, Count, Q
+from django.db.models.expressions import RawSQL
+
+from core.utils.hangeul import (
+    KEYBOARD_LAYOUT,
+    SYLLABLE_BASE,
+    SYLLABLE_COUNT,
+    decompose,
+    to_keystrokes,
+)
+
+# MySQL 의 기본 ngram_token_size 와 같은 값을 사용합니다.
+NGRAM_SIZE = 2
+
+# 자판 검색에 사용되는 검색어의 최소 길이입니다.
+# 너무 짧은 검색어는 의도하지 않은 상품까지 검색되므로 사용하지 않습니다.
+KEYS_SEARCH_MIN_LENGTH = 2
+
+FULLTEXT_INDEX_NAME = "product_search_ngram"
+
+# Shift 키와 함께 누르면 다른 자모가 입력되는 키입니다. ("R" -> "ㄲ", "r" -> "ㄱ")
+SHIFT_KEYS = frozenset(key for key in KEYBOARD_LAYOUT.values() if key.isupper())
+
+
+def get_ngrams(*values: str, size: int = NGRAM_SIZE) -> set[str]:
+    """
+    문자열들을 소문자로 바꾼 뒤, 길이가 size 인 n-gram 집합을 반환합니다.
+    """
+    ngrams = set()
+    for value in values:
+        value = value.lower()
+        ngrams.update(value[i : i + size] for i in range(len(value) - size + 1))
+    return ngrams
+
+
+def filter_by_like(queryset, value):
+    """
+    이름 필드나 초성 필드에 검색어가 포함된 상품만 남깁니다.
+    인덱스가 후보를 좁힌 뒤, 실제 일치 여부를 확인하는 데에도 사용됩니다.
+    """
+    return queryset.filter(
+        Q(name__icontains=value) | Q(initial_consonant__icontains=value)
+    )
+
+
+def get_name_jamo(value: str) -> str:
+    """
+    자동완성에 사용되는, 소문자로 바꾸어 키보드 입력 단위로 분해된 자모 문자열입니다.
+    입력 중인 검색어의 자모 문자열은 완성된 이름의 자모 문자열의 접두사가 됩니다.
+    """
+    return decompose(value.lower(), split_compound=True)
+
+
+def get_name_keys(value: str) -> str:
+    """
+    두벌식 자판에서 이름을 입력할 때 누르는 키 문자열입니다.
+
+    한/영 전환을 잘못한 검색어도 같은 키 문자열이 되므로 서로 비교할 수 있습니다.
+    ("zkvp" 와 "카페" -> "zkvp", "ㅣㅁㅅㅅㄷ" 와 "Latte" -> "latte")
+    Shift 키로 입력되는 자모만 대문자 키가 되므로, "라떼"(fkEp)와 "라데"(fkep)는 서로 다른
+    키 문자열이 됩니다. 이름의 영문은 자모의 Shift 키와 겹치지 않도록 소문자로 바꿉니다.
+    ("Espresso" -> "espresso")
+
+    MySQL 에서는 대소문자를 구분하도록 name_keys 컬럼에 binary collation 을 사용합니다.
+    (0015_product_name_keys_latin)
+    """
+    return to_keystrokes(value.lower())
+
+
+def get_query_keys(value: str) -> str:
+    """
+    검색어를 입력할 때 누른 키 문자열입니다.
+
+    검색어의 영문은 영문 자판 상태로 누른 키이므로, Shift 키로 다른 자모가 입력되는
+    키(SHIFT_KEYS)만 대소문자를 구분합니다. ("zkvpfkEp" -> "카페라떼", "Zkvp" -> "zkvp")
+    """
+    return "".join(
+        key if key in SHIFT_KEYS else key.lower() for key in to_keystrokes(value)
+    )
+
+
+def is_keys_query(value: str) -> bool:
+    """
+    한/영 전환을 잘못하여 입력되었을 수 있는 검색어인지 반환합니다.
+    완성된 한글 음절이 있는 검색어는 한글 자판으로 의도대로 입력된 것이므로 제외합니다.
+    """
+    return not any(
+        SYLLABLE_BASE <= ord(char) < SYLLABLE_BASE + SYLLABLE_COUNT for char in value
+    )
+
+
+def filter_by_keys(queryset, value):
+    """
+    검색어와 같은 키로 입력되는 이름으로 시작하는 상품만 남깁니다.
+    자판 필드의 인덱스를 사용하는 접두사 검색입니다.
+    """
+    if len(value) < KEYS_SEARCH_MIN_LENGTH or not is_keys_query(value):
+        return queryset.none()
+    return queryset.filter(prefix_q("name_keys", get_query_keys(value)))
+
+
+def prefix_q(field: str, prefix: str) -> Q:
+    """
+    field 가 prefix 로 시작하는 조건입니다.
+
+    LIKE 'prefix%' 는 데이터베이스에 따라 인덱스를 사용하지 못하는 경우가 있으므로
+    (SQLite 의 ESCAPE 절 등), 범위 조건을 사용하여 B-Tree 인덱스로 처리되도록 합니다.
+    """
+    return Q(**{f"{field}__gte": prefix, f"{field}__lt": prefix + "\uffff"})
+
+
+class BaseSearchBackend:
+    def filter(self, queryset, value):
+        """
+        검색어를 포함하는 상품만 남긴 queryset 을 반환합니다.
+        """
+        raise NotImplementedError
+
+    def index(self, products):
+        """
+        저장된 상품들의 검색 인덱스를 갱신합니다.
+        """
+        raise NotImplementedError
+
+
+class FullTextSearchBackend(BaseSearchBackend):
+    """
+    MySQL FULLTEXT (ngram parser) 인덱스를 사용합니다.
+    인덱스는 MySQL 이 직접 관리하므로 index() 는 아무 일도 하지 않습니다.
+    """
+
+    def filter(self, queryset, value):
+        if len(value) < NGRAM_SIZE:
+            return filter_by_like(queryset, value)
+
+        table = connection.ops.quote_name(queryset.model._meta.db_table)
+        phrase = '"{}"'.format(value.replace('"', " "))
+        match = RawSQL(
+            f"MATCH ({table}.name, {table}.initial_consonant) "
+            "AGAINST (%s IN BOOLEAN MODE)",
+            [phrase],
+            output_field=BooleanField(),
+        )
+        return filter_by_like(queryset.filter(match), value)
+
+    def index(self, products):
+        pass
+
+
+class NgramTableSearchBackend(BaseSearchBackend):
+    """
+    FULLTEXT 인덱스가 없는 데이터베이스를 위한 n-gram 테이블 인덱스입니다.
+    검색어의 n-gram 을 모두 가진 상품만 후보로 남깁니다.
+    """
+
+    def filter(self, queryset, value):
+        from apps.products.models import ProductSearchGram
+
+        ngrams = get_ngrams(value)
+        if not ngrams:
+            return filter_by_like(queryset, value)
+
+        candidates = (
+            ProductSearchGram.objects.filter(gram__in=ngrams)
+            .values("product_id")
+            .annotate(matched=Count("gram"))
+            .filter(matched=len(ngrams))
+            .values("product_id")
+        )
+        return filter_by_like(queryset.filter(id__in=candidates), value)
+
+    def index(self, products):
+        from apps.products.models import ProductSearchGram
+
+        products = [product for product in products if product.pk is not None]
+        if not products:
+            return
+
+        ProductSearchGram.objects.filter(product__in=products).delete()
+        ProductSearchGram.objects.bulk_create(
+            ProductSearchGram(product=product, gram=gram)
+            for product in products
+            for gram in get_ngrams(product.name, product.initial_consonant)
+        )
+
+
+def get_search_backend() -> BaseSearchBackend:
+    """
+    현재 데이터베이스에 맞는 검색 백엔드를 반환합니다.
+    """
+    if connection.vendor == "mysql":
+        return FullTextSearchBackend()
+    return NgramTableSearchBackend()
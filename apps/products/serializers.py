@@ -1,15 +1,81 @@
 from django.db import transaction
 from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
 
+from apps.cafes.resolvers import get_cafe_ownership
 from apps.cafes.urls import CAFE_URL_KEYWORD
+from apps.products.bulk import bulk_save_products, sync_options
 from apps.products.models import Category, Option, OptionGroup, Product
 
 
-class CategorySerializer(serializers.ModelSerializer):
-    products_count = serializers.IntegerField(source="products.count", read_only=True)
-    products = serializers.SlugRelatedField(
-        slug_field="name", many=True, read_only=True
+class BulkManyRelatedField(serializers.ManyRelatedField):
+    """
+    여러 개의 primary key 를 한 번의 쿼리로 조회하는 ManyRelatedField 입니다.
+    기본 ManyRelatedField 는 primary key 마다 쿼리를 실행합니다.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, "__iter__"):
+            self.fail("not_a_list", input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail("empty")
+
+        child = self.child_relation
+        queryset = child.get_queryset()
+        pks = []
+        for item in data:
+            # 잘못된 값이 있으면, 쿼리를 실행하기 전에 그 값의 타입으로 에러를 반환합니다.
+            try:
+                if isinstance(item, bool):
+                    raise TypeError
+                pk = child.pk_field.to_internal_value(item) if child.pk_field else item
+                queryset.model._meta.pk.get_prep_value(pk)
+            except (TypeError, ValueError):
+                child.fail("incorrect_type", data_type=type(item).__name__)
+            pks.append(pk)
+
+        objects = queryset.in_bulk(pks)
+        objects = {str(pk): obj for pk, obj in objects.items()}
+        for pk in pks:
+            if str(pk) not in objects:
+                child.fail("does_not_exist", pk_value=pk)
+        return [objects[str(pk)] for pk in pks]
+
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    many=True 로 사용하면 BulkManyRelatedField 가 되는 PrimaryKeyRelatedField 입니다.
+    """
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {"child_relation": cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BulkManyRelatedField(**list_kwargs)
+
+
+def get_context_cafe_id(serializer) -> int | None:
+    """
+    요청 URL 의 카페의 id 입니다. 권한 확인에서 찾은 카페를 다시 사용합니다.
+    """
+    request = serializer.context["request"]
+    ownership = get_cafe_ownership(
+        request, request.parser_context["kwargs"][CAFE_URL_KEYWORD]
     )
+    return ownership.id if ownership else None
+
+
+class CategorySerializer(serializers.ModelSerializer):
+    """
+    목록 조회에서는 view 가 products_count 를 annotate 하고 상품 이름을 product_names 에
+    담아 두므로, 카테고리의 수와 관계없이 일정한 수의 쿼리로 직렬화됩니다.
+    context 의 products_limit 이 있으면 상품 이름은 그 개수까지만 포함합니다.
+    """
+
+    products_count = serializers.SerializerMethodField()
+    products = serializers.SerializerMethodField()
 
     class Meta:
         model = Category
@@ -21,6 +87,21 @@ class CategorySerializer(serializers.ModelSerializer):
         )
         read_only_fields = ("products",)
 
+    def get_products_count(self, obj) -> int:
+        if hasattr(obj, "products_count"):
+            return obj.products_count
+        return obj.products.count()
+
+    def get_products(self, obj) -> list[str]:
+        limit = self.context.get("products_limit")
+        if limit == 0:
+            return []
+        if hasattr(obj, "product_names"):
+            names = obj.product_names
+        else:
+            names = [product.name for product in obj.products.order_by("id")]
+        return names if limit is None else names[:limit]
+
 
 class OptionSerializer(serializers.ModelSerializer):
     class Meta:
@@ -32,7 +113,7 @@ class OptionSerializer(serializers.ModelSerializer):
 
 
 class OptionGroupSerializer(serializers.ModelSerializer):
-    options_count = serializers.IntegerField(source="options.count", read_only=True)
+    options_count = serializers.SerializerMethodField()
     options = OptionSerializer(many=True)
 
     class Meta:
@@ -49,46 +130,56 @@ class OptionGroupSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         options_data = validated_data.pop("options")
         option_group = OptionGroup.objects.create(**validated_data)
-        for option_data in options_data:
-            Option.objects.create(
+        # 옵션 그룹을 등록하면서 카탈로그 버전이 올라가므로, 옵션은 signal 없이 등록합니다.
+        Option.objects.bulk_create(
+            Option(
                 name=option_data["name"],
                 add_price=option_data["add_price"],
                 option_group=option_group,
             )
+            for option_data in options_data
+        )
         return option_group
 
     @transaction.atomic
     def update(self, instance, validated_data):
-        options_data = validated_data.pop("options")
+        """
+        옵션들은 이름으로 비교하여, 입력에 없는 옵션은 삭제하고
+        추가 가격이 바뀐 옵션은 수정하며 새로운 옵션은 등록합니다.
+        """
+        options_data = validated_data.pop("options", None)
         instance.name = validated_data.get("name", instance.name)
-        # 인스턴스가 가지고 있는 옵션보다 새로 들어온 옵션의 개수가 적으면,
-        # 그것은 옵션을 삭제하겠다는 것을 의미
-        if len(instance.options.all()) > len(options_data):
-            for previous_option in instance.options.all():
-                if previous_option.name not in [item["name"] for item in options_data]:
-                    previous_option.delete()
-        # 인스턴스가 가지고 있는 옵션보다 새로 들어온 옵션의 개수가 많으면,
-        # 그것은 옵션을 추가하겠다는 것을 의미
-        else:
-            for item in options_data:
-                obj, created = Option.objects.update_or_create(
-                    name=item["name"],
-                    add_price=item["add_price"],
-                    option_group=instance,
-                )
-        print(instance.options.all())
+        if options_data is not None:
+            sync_options(instance, options_data)
+            # 조회할 때 annotate 된 옵션의 수를 바뀐 옵션의 수로 고칩니다.
+            instance.options_count = len(options_data)
+        # 옵션 그룹을 저장하면 signal 로 카탈로그 버전이 올라가므로, 옵션의 변경도 반영됩니다.
         instance.save()
         return instance
 
+    def get_options_count(self, obj) -> int:
+        if hasattr(obj, "options_count"):
+            return obj.options_count
+        return obj.options.count()
+
+    def validate_options(self, value):
+        """
+        옵션 그룹 안에서 옵션 이름은 유일해야 합니다.
+        """
+        names = [item["name"] for item in value]
+        if len(set(names)) != len(names):
+            raise serializers.ValidationError(
+                "Option names must be unique in the option group."
+            )
+        return value
+
     def validate_name(self, value):
         """
         옵션 그룹 이름은 해당 카페에서 유일해야 합니다.
         """
         if self.context["request"]._request.method == "POST":
-            cafe_uuid = self.context["request"].parser_context["kwargs"][
-                CAFE_URL_KEYWORD
-            ]
-            if OptionGroup.objects.filter(cafe__uuid=cafe_uuid, name=value).exists():
+            cafe_id = get_context_cafe_id(self)
+            if OptionGroup.objects.filter(cafe_id=cafe_id, name=value).exists():
                 raise serializers.ValidationError("Option group name must be unique.")
         return value
 
@@ -101,7 +192,7 @@ class ProductListSerializer(serializers.ModelSerializer):
         queryset=Category.objects.all(), write_only=True
     )
     category_name = serializers.CharField(source="category.name", read_only=True)
-    option_groups = serializers.PrimaryKeyRelatedField(
+    option_groups = BulkPrimaryKeyRelatedField(
         queryset=OptionGroup.objects.all(), many=True, write_only=True
     )
 
@@ -122,9 +213,9 @@ class ProductListSerializer(serializers.ModelSerializer):
     def validate_category(self, value):
         """
         카테고리는 해당 카페의 카테고리여야 합니다.
+        카테고리는 이미 조회되었으므로, 카페의 id 만 비교합니다.
         """
-        cafe_uuid = self.context["request"].parser_context["kwargs"][CAFE_URL_KEYWORD]
-        if value not in Category.objects.filter(cafe__uuid=cafe_uuid):
+        if value.cafe_id != get_context_cafe_id(self):
             raise serializers.ValidationError(
                 "You can only select categories for that cafe."
             )
@@ -133,10 +224,11 @@ class ProductListSerializer(serializers.ModelSerializer):
     def validate_option_groups(self, value):
         """
         선택할 수 있는 옵션 그룹은 해당 카테고리의 옵션 그룹들이어야 합니다.
+        옵션 그룹들은 이미 한 번의 쿼리로 조회되었으므로, 카페의 id 만 비교합니다.
         """
-        cafe_uuid = self.context["request"].parser_context["kwargs"][CAFE_URL_KEYWORD]
+        cafe_id = get_context_cafe_id(self)
         for option_group in value:
-            if option_group not in OptionGroup.objects.filter(cafe__uuid=cafe_uuid):
+            if option_group.cafe_id != cafe_id:
                 raise serializers.ValidationError(
                     "You can only select option groups for that cafe."
                 )
@@ -150,7 +242,7 @@ class ProductDetailSerializer(serializers.ModelSerializer):
     price = serializers.IntegerField()
     expireation_date = serializers.DateTimeField()
     category_name = serializers.CharField(source="category.name", read_only=True)
-    option_groups = serializers.PrimaryKeyRelatedField(
+    option_groups = BulkPrimaryKeyRelatedField(
         queryset=OptionGroup.objects.all(), many=True, write_only=True
     )
 
@@ -166,3 +258,162 @@ class ProductDetailSerializer(serializers.ModelSerializer):
             "category_name",
             "option_groups",
         )
+
+
+class ProductAutocompleteSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Product
+        fields = (
+            "id",
+            "name",
+        )
+
+
+class ProductBulkItemSerializer(serializers.Serializer):
+    """
+    한 번에 등록, 수정하는 상품 하나의 입력입니다.
+    id 가 있으면 해당 상품을 수정하고, 없으면 새로운 상품을 등록합니다.
+
+    카테고리와 옵션 그룹은 id 로만 받고, 카페에 속하는지는
+    ProductBulkSerializer 가 모든 상품에 대해 한 번에 확인합니다.
+    """
+
+    id = serializers.IntegerField(required=False)
+    name = serializers.CharField(max_length=30)
+    description = serializers.CharField(max_length=30)
+    cost = serializers.IntegerField(min_value=0)
+    price = serializers.IntegerField(min_value=0)
+    expireation_date = serializers.DateTimeField()
+    category = serializers.IntegerField()
+    option_groups = serializers.ListField(
+        child=serializers.IntegerField(), required=False, default=list
+    )
+
+
+class ProductBulkSerializer(serializers.Serializer):
+    """
+    여러 개의 상품을 한 번에 등록, 수정합니다.
+
+    상품의 수와 관계없이 일정한 수의 쿼리로 검증하고 저장합니다.
+    - 카테고리, 옵션 그룹, 수정할 상품, 이름 중복은 각각 한 번의 쿼리로 확인합니다.
+    - 상품은 bulk_create, bulk_update 로, 옵션 그룹 연결은 bulk_create 로 저장합니다.
+    검증에 실패하면 상품의 순서대로 각 상품의 에러 목록을 반환합니다.
+    """
+
+    MAX_PRODUCTS = 500
+    FIELDS = ("name", "description", "cost", "price", "expireation_date")
+
+    products = ProductBulkItemSerializer(
+        many=True, allow_empty=False, max_length=MAX_PRODUCTS
+    )
+
+    def validate_products(self, items):
+        cafe_id = get_context_cafe_id(self)
+
+        categories = Category.objects.filter(cafe_id=cafe_id).in_bulk(
+            {item["category"] for item in items}
+        )
+        option_group_ids = set(
+            OptionGroup.objects.filter(
+                cafe_id=cafe_id,
+                id__in={pk for item in items for pk in item["option_groups"]},
+            ).values_list("id", flat=True)
+        )
+        product_ids = {item["id"] for item in items if "id" in item}
+        products = Product.objects.filter(cafe_id=cafe_id).in_bulk(product_ids)
+        # 수정되는 상품들이 지금 가진 (카테고리, 이름) 입니다.
+        # 상품은 한 행씩 수정되므로, 서로의 이름을 바꾸는 수정은 저장 중에 중복이 됩니다.
+        current_names = {
+            (product.category_id, product.name): product.id
+            for product in products.values()
+        }
+        # 이번에 수정되지 않는 상품들의 (카테고리, 이름) 입니다.
+        taken_names = {
+            (category_id, name)
+            for category_id, name, product_id in Product.objects.filter(
+                category_id__in=categories,
+                name__in={item["name"] for item in items},
+            ).values_list("category_id", "name", "id")
+            if product_id not in product_ids
+        }
+
+        errors = []
+        seen_ids = set()
+        for item in items:
+            error = {}
+            if "id" in item:
+                if item["id"] not in products:
+                    error["id"] = ["You can only update products of that cafe."]
+                elif item["id"] in seen_ids:
+                    error["id"] = ["Each product can only be updated once."]
+                seen_ids.add(item["id"])
+            if item["category"] not in categories:
+                error["category"] = ["You can only select categories for that cafe."]
+            if not option_group_ids.issuperset(item["option_groups"]):
+                error["option_groups"] = [
+                    "You can only select option groups for that cafe."
+                ]
+            key = (item["category"], item["name"])
+            if key in taken_names:
+                error["name"] = ["Product name must be unique in the category."]
+            elif "id" in item and current_names.get(key, item["id"]) != item["id"]:
+                error["name"] = [
+                    "Product name is used by another product updated in this request."
+                ]
+            taken_names.add(key)
+            errors.append(error)
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+
+        self.categories = categories
+        self.existing_products = products
+        return items
+
+    @transaction.atomic
+    def create(self, validated_data):
+        items = validated_data["products"]
+        products = []
+        for item in items:
+            product = self.existing_products.get(item.get("id")) or Product()
+            for field in self.FIELDS:
+                setattr(product, field, item[field])
+            product.category = self.categories[item["category"]]
+            products.append(product)
+
+        bulk_save_products(products, [item["option_groups"] for item in items])
+        return products
+
+
+class ProductImportRowSerializer(serializers.Serializer):
+    """
+    메뉴 파일(CSV, NDJSON)의 한 행입니다. (apps.products.imports)
+    카테고리와 옵션 그룹은 이름으로 받고, 없으면 가져오는 중에 만들어집니다.
+
+    CSV 에서는 옵션 그룹 이름들을 "|" 로 구분합니다. ("Size|Shot")
+    """
+
+    OPTION_GROUP_SEPARATOR = "|"
+
+    name = serializers.CharField(max_length=30)
+    description = serializers.CharField(max_length=30)
+    cost = serializers.IntegerField(min_value=0)
+    price = serializers.IntegerField(min_value=0)
+    expireation_date = serializers.DateTimeField()
+    category = serializers.CharField(max_length=30)
+    option_groups = serializers.ListField(
+        child=serializers.CharField(max_length=30), required=False, default=list
+    )
+
+    def to_internal_value(self, data):
+        option_groups = data.get("option_groups")
+        if isinstance(option_groups, str):
+            data = {
+                **data,
+                "option_groups": [
+                    name.strip()
+                    for name in option_groups.split(self.OPTION_GROUP_SEPARATOR)
+                    if name.strip()
+                ],
+            }
+        return super().to_internal_value(data)
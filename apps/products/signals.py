@@ -0,0 +1,107 @@
+import threading
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from apps.cafes.models import Cafe
+from apps.products.models import Category, Option, OptionGroup, Product
+from apps.products.suggestions import suggestion_cache
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_suggestion_index(sender, instance: Product, **kwargs):
+    """
+    상품이 저장되거나 삭제되면, 커밋된 뒤 해당 카페의 자동완성 인덱스를 제거합니다.
+    """
+    suggestion_cache.invalidate_on_commit(instance.cafe_id)
+
+
+class DeletedCatalogVersionBumper(threading.local):
+    """
+    삭제로 바뀐 카페들의 카탈로그 버전을, 트랜잭션이 커밋된 뒤 카페마다 한 번씩 올립니다.
+
+    카테고리나 옵션 그룹을 삭제하면 상품과 옵션도 함께 삭제되고(CASCADE),
+    삭제된 객체마다 post_delete 가 보내지므로 객체마다 버전을 올리면 UPDATE 가 N 번 실행됩니다.
+    삭제는 항상 트랜잭션 안에서 이루어지므로, 카페 id 를 모아 두었다가 커밋된 뒤 올립니다.
+
+    롤백된 트랜잭션에서 모은 id 는 다음 커밋에서 함께 올라가며, 버전이 불필요하게 한 번 더
+    올라갈 뿐입니다.
+    """
+
+    def __init__(self):
+        self.cafe_ids = set()
+        self.option_group_ids = set()
+
+    def schedule(self, cafe_ids=(), option_group_ids=()):
+        self.cafe_ids.update(cafe_ids)
+        self.option_group_ids.update(option_group_ids)
+        # 콜백은 매번 등록하지만, 커밋된 뒤 처음 실행되는 콜백이 모은 id 를 모두 처리합니다.
+        transaction.on_commit(self.flush)
+
+    def flush(self):
+        cafe_ids, option_group_ids = self.cafe_ids, self.option_group_ids
+        self.cafe_ids, self.option_group_ids = set(), set()
+        if cafe_ids:
+            Cafe.objects.filter(id__in=cafe_ids).bump_catalog_version()
+        if option_group_ids:
+            Cafe.objects.filter(
+                option_groups__id__in=option_group_ids
+            ).bump_catalog_version()
+
+
+deleted_catalog_version_bumper = DeletedCatalogVersionBumper()
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=OptionGroup)
+def bump_catalog_version(sender, instance, **kwargs):
+    """
+    상품, 카테고리, 옵션 그룹이 저장되면, 카페의 카탈로그 버전을 올립니다.
+
+    QuerySet.update, bulk_create 등 signal 을 보내지 않는 변경은
+    Cafe.objects.bump_catalog_version() 을 직접 호출해야 합니다.
+    """
+    Cafe.objects.filter(id=instance.cafe_id).bump_catalog_version()
+
+
+@receiver(post_delete, sender=Product)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=OptionGroup)
+def bump_catalog_version_on_delete(sender, instance, **kwargs):
+    """
+    상품, 카테고리, 옵션 그룹이 삭제되면, 커밋된 뒤 카페의 카탈로그 버전을 올립니다.
+    """
+    deleted_catalog_version_bumper.schedule(cafe_ids=[instance.cafe_id])
+
+
+@receiver(post_save, sender=Option)
+def bump_catalog_version_for_option(sender, instance: Option, **kwargs):
+    """
+    옵션은 카페를 직접 가지지 않으므로, 옵션 그룹을 통해 카페의 버전을 올립니다.
+    """
+    Cafe.objects.filter(
+        option_groups__id=instance.option_group_id
+    ).bump_catalog_version()
+
+
+@receiver(post_delete, sender=Option)
+def bump_catalog_version_for_option_on_delete(sender, instance: Option, **kwargs):
+    """
+    옵션이 삭제되면, 커밋된 뒤 옵션 그룹을 통해 카페의 버전을 올립니다.
+    옵션 그룹과 함께 삭제된 옵션은, 옵션 그룹이 남긴 카페 id 로 버전이 올라갑니다.
+    """
+    deleted_catalog_version_bumper.schedule(option_group_ids=[instance.option_group_id])
+
+
+@receiver(m2m_changed, sender=Product.option_groups.through)
+def bump_catalog_version_for_option_groups(sender, instance, action, **kwargs):
+    """
+    상품의 옵션 그룹이 바뀌면, 카페의 카탈로그 버전을 올립니다.
+    """
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    # 옵션 그룹 쪽에서 상품을 바꾸는 경우(reverse)에도 instance 는 카페를 가집니다.
+    Cafe.objects.filter(id=instance.cafe_id).bump_catalog_version()
@@ -0,0 +1,221 @@
+"""
+상품 자동완성을 위한, 프로세스 메모리 안의 카페별 인덱스입니다.
+
+자동완성은 글자를 입력할 때마다 요청되므로, 자주 사용되는 카페의 상품 이름을
+정렬된 배열로 메모리에 올려 두고 데이터베이스 없이 응답합니다.
+
+- 인덱스는 카페에서 처음 요청이 들어올 때 만들어집니다.
+- 전체 메모리 사용량이 max_bytes 를 넘으면, 가장 오래 사용되지 않은 카페부터 제거합니다.
+- 상품이 저장되거나 삭제되면 signal 을 통해, 트랜잭션이 커밋된 뒤 해당 카페의 인덱스가
+  제거됩니다. (apps.products.signals)
+- signal 은 같은 프로세스 안에서만 전달되므로, 다른 프로세스의 변경이 너무 늦게
+  반영되지 않도록 인덱스는 ttl 초 후에 다시 만들어집니다.
+"""
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.db import transaction
+
+from apps.products.search import get_name_jamo
+from core.utils.hangeul import CHOSEONG
+
+
+@dataclass
+class CafeSuggestionIndex:
+    """
+    한 카페의 상품들을 자모와 초성 순서로 정렬한 배열입니다.
+    각 항목은 (정렬 키, 자모, 상품 id, 상품 이름) 입니다.
+    """
+
+    cafe_id: int
+    by_jamo: list = field(default_factory=list)
+    by_initial_consonant: list = field(default_factory=list)
+    created: float = field(default_factory=time.monotonic)
+
+    @classmethod
+    def build(cls, cafe_id, products):
+        """
+        (id, name, initial_consonant, name_jamo) 목록으로 인덱스를 만듭니다.
+        """
+        index = cls(cafe_id=cafe_id)
+        for product_id, name, initial_consonant, name_jamo in products:
+            index.by_jamo.append((name_jamo, name_jamo, product_id, name))
+            index.by_initial_consonant.append(
+                (initial_consonant, name_jamo, product_id, name)
+            )
+        index.by_jamo.sort()
+        index.by_initial_consonant.sort()
+        return index
+
+    @property
+    def size(self) -> int:
+        """
+        인덱스가 사용하는 메모리의 대략적인 크기(byte)입니다.
+        """
+        size = sys.getsizeof(self.by_jamo) + sys.getsizeof(self.by_initial_consonant)
+        for entries in (self.by_jamo, self.by_initial_consonant):
+            for entry in entries:
+                size += sys.getsizeof(entry) + sum(map(sys.getsizeof, entry))
+        return size
+
+    def suggest(self, query: str, limit: int) -> list[dict]:
+        """
+        입력 중인 검색어로 시작하는 상품을 자모 순서로 최대 limit 개 반환합니다.
+        검색어가 초성으로만 이루어져 있으면, 초성으로 시작하는 상품도 포함합니다.
+        """
+        matches = self._prefix(self.by_jamo, get_name_jamo(query), limit)
+        if is_initial_consonant_query(query):
+            # 초성 순서와 자모 순서는 다르므로, 초성이 일치하는 상품을 모두 모은 뒤 정렬합니다.
+            matches += self._prefix(self.by_initial_consonant, query)
+
+        suggestions = {}
+        for _, name_jamo, product_id, name in sorted(
+            matches, key=lambda entry: (entry[1], entry[2])
+        ):
+            suggestions.setdefault(product_id, {"id": product_id, "name": name})
+        return list(suggestions.values())[:limit]
+
+    @staticmethod
+    def _prefix(entries, prefix, limit=None):
+        start = bisect_left(entries, (prefix,))
+        end = len(entries) if limit is None else start + limit
+        matches = []
+        for entry in entries[start:end]:
+            if not entry[0].startswith(prefix):
+                break
+            matches.append(entry)
+        return matches
+
+
+def is_initial_consonant_query(query: str) -> bool:
+    """
+    검색어가 초성으로만 이루어져 있는지 확인합니다. ("ㅇㅁ")
+    """
+    return bool(query) and all(char in CHOSEONG for char in query)
+
+
+class ProductSuggestionCache:
+    """
+    카페별 자동완성 인덱스의 LRU 캐시입니다.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = self.misses = self.evictions = 0
+        self._indexes: OrderedDict[str, CafeSuggestionIndex] = OrderedDict()
+        self._sizes: dict[str, int] = {}
+        # 인덱스를 만드는 도중에 상품이 바뀌면, 만들어진 인덱스를 저장하지 않기 위해 사용합니다.
+        self._generations: dict[int, int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def suggest(self, cafe_uuid, query: str, limit: int) -> list[dict] | None:
+        """
+        카페의 인덱스로 자동완성 결과를 반환합니다.
+        카페의 인덱스가 max_bytes 보다 커서 캐시할 수 없으면 None 을 반환합니다.
+        """
+        key = str(cafe_uuid)
+        with self._lock:
+            index = self._indexes.get(key)
+            if index and time.monotonic() - index.created < self.ttl:
+                self._indexes.move_to_end(key)
+                self.hits += 1
+            else:
+                index = None
+                self.misses += 1
+
+        if index is None:
+            index = self._build(cafe_uuid)
+        if index is None:
+            return None
+        return index.suggest(query, limit)
+
+    def invalidate(self, cafe_id: int):
+        """
+        카페의 인덱스를 제거합니다.
+        """
+        with self._lock:
+            self._generations[cafe_id] = self._generations.get(cafe_id, 0) + 1
+            for key, index in list(self._indexes.items()):
+                if index.cafe_id == cafe_id:
+                    self._remove(key)
+
+    def invalidate_on_commit(self, cafe_id: int):
+        """
+        트랜잭션이 커밋된 뒤 카페의 인덱스를 제거합니다.
+        커밋 전에 제거하면, 그 사이에 다시 만들어진 인덱스에 커밋 전의 상품이 남습니다.
+        """
+        transaction.on_commit(lambda: self.invalidate(cafe_id))
+
+    def clear(self):
+        """
+        모든 카페의 인덱스를 제거합니다.
+        """
+        with self._lock:
+            self._epoch += 1
+            self._indexes.clear()
+            self._sizes.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "cafes": len(self._indexes),
+                "bytes": sum(self._sizes.values()),
+            }
+
+    def _build(self, cafe_uuid) -> CafeSuggestionIndex | None:
+        from apps.cafes.models import Cafe
+        from apps.products.models import Product
+
+        cafe_id = (
+            Cafe.objects.values_list("id", flat=True).filter(uuid=cafe_uuid).first()
+        )
+        if cafe_id is None:
+            return CafeSuggestionIndex(cafe_id=cafe_id)
+
+        with self._lock:
+            generation = self._generation(cafe_id)
+        index = CafeSuggestionIndex.build(
+            cafe_id,
+            Product.objects.filter(cafe_id=cafe_id).values_list(
+                "id", "name", "initial_consonant", "name_jamo"
+            ),
+        )
+        size = index.size
+        if size > self.max_bytes:
+            return None
+
+        key = str(cafe_uuid)
+        with self._lock:
+            if self._generation(cafe_id) != generation:
+                return index
+            if key in self._indexes:
+                self._remove(key)
+            self._indexes[key] = index
+            self._sizes[key] = size
+            while sum(self._sizes.values()) > self.max_bytes:
+                self._remove(next(iter(self._indexes)))
+                self.evictions += 1
+        return index
+
+    def _generation(self, cafe_id):
+        return self._epoch, self._generations.get(cafe_id, 0)
+
+    def _remove(self, key):
+        del self._indexes[key]
+        del self._sizes[key]
+
+
+suggestion_cache = ProductSuggestionCache(
+    max_bytes=settings.PRODUCT_SUGGESTION_CACHE["MAX_BYTES"],
+    ttl=settings.PRODUCT_SUGGESTION_CACHE["TTL"],
+)
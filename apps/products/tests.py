@@ -1,18 +1,55 @@
+import csv
+import json
+import tempfile
 import uuid
+from datetime import timedelta
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import mock
 
 from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.reverse import reverse
 
 from apps.cafes.models import Cafe
-from apps.products.models import Category, Product
-from apps.products.urls import PRODUCT_LIST_URL_NAME
+from apps.cafes.ownership import ownership_cache
+from apps.products.exports import iter_product_rows
+from apps.products.filters import ProductFilter
+from apps.products.imports import MenuImporter, read_rows
+from apps.products.management.commands.backfill_initial_consonant import (
+    Command as BackfillCommand,
+)
+from apps.products.models import (
+    Category,
+    Option,
+    OptionGroup,
+    Product,
+    ProductSearchGram,
+)
+from apps.products.pagination import CafehereCursorPagination
+from apps.products.search import NgramTableSearchBackend, filter_by_like, get_ngrams
+from apps.products.suggestions import ProductSuggestionCache, suggestion_cache
+from apps.products.urls import (
+    MENU_URL_NAME,
+    PRODUCT_AUTOCOMPLETE_URL_NAME,
+    PRODUCT_BULK_URL_NAME,
+    PRODUCT_DETAIL_URL_NAME,
+    PRODUCT_EXPORT_URL_NAME,
+    PRODUCT_IMPORT_URL_NAME,
+    PRODUCT_LIST_URL_NAME,
+)
 from core.utils.test import BaseAPITestCase
 
 CAFE_DETAIL_URL_NAME = "cafe-detail"
 CATEGORY_LIST_URL_NAME = "category-list"
 CATEGORY_DETAIL_URL_NAME = "category-detail"
+OPTION_GROUP_LIST_URL_NAME = "optiongroup-list"
+OPTION_GROUP_DETAIL_URL_NAME = "optiongroup-detail"
 
 User = get_user_model()
 
@@ -64,7 +101,7 @@ class CategoryListTestCase(BaseAPITestCase):
         self.assertEqual(response.status_code, 401)
 
         # 로그인합니다.
-        self.client.force_login(self.owner_james)
+        self.authenticate(self.owner_james)
 
         # 자신의 카페의 카테고리 목록을 조회할 수 있습니다.
         response = self.client.get(url)
@@ -100,7 +137,7 @@ class CategoryListTestCase(BaseAPITestCase):
             CATEGORY_LIST_URL_NAME,
             kwargs={"cafe_uuid": uuid.uuid4()},
         )
-        self.client.force_login(self.owner_james)
+        self.authenticate(self.owner_james)
         response = self.client.get(url)
         self._test_response_format(response)
         self.assertEqual(response.status_code, 404)
@@ -187,7 +224,7 @@ class ProductListTestCase(BaseAPITestCase):
         self.assertEqual(response.status_code, 401)
 
         # 로그인합니다.
-        self.client.force_login(self.owner_james)
+        self.authenticate(self.owner_james)
 
         # 자신의 카페의 상품 목록을 조회할 수 있습니다.
         response = self.client.get(url)
@@ -202,12 +239,12 @@ class ProductListTestCase(BaseAPITestCase):
             PRODUCT_LIST_URL_NAME,
             kwargs={"cafe_uuid": self.cafe_for_jenny.uuid},
         )
-        self.client.force_login(self.owner_james)
+        self.authenticate(self.owner_james)
         response = self.client.get(url)
         self._test_response_format(response)
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
-        self.client.force_login(self.owner_jenny)
+        self.authenticate(self.owner_jenny)
         response = self.client.get(url)
         self._test_response_format(response)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -222,7 +259,7 @@ class ProductListTestCase(BaseAPITestCase):
             PRODUCT_LIST_URL_NAME,
             kwargs={"cafe_uuid": self.cafe_for_james.uuid},
         )
-        self.client.force_login(self.owner_james)
+        self.authenticate(self.owner_james)
         response = self.client.get(url, {"category": self.category_for_james2.name})
         self._test_response_format(response)
         self.assertEqual(len(response.data["data"]["results"]), 1)
@@ -235,7 +272,7 @@ class ProductListTestCase(BaseAPITestCase):
             PRODUCT_LIST_URL_NAME,
             kwargs={"cafe_uuid": self.cafe_for_james.uuid},
         )
-        self.client.force_login(self.owner_james)
+        self.authenticate(self.owner_james)
         response = self.client.get(url, {"search": "ㅇㅅㅍㄹ"})
         self._test_response_format(response)
         self.assertEqual(len(response.data["data"]["results"]), 1)
@@ -251,7 +288,7 @@ class ProductListTestCase(BaseAPITestCase):
             PRODUCT_LIST_URL_NAME,
             kwargs={"cafe_uuid": self.cafe_for_james.uuid},
         )
-        self.client.force_login(self.owner_james)
+        self.authenticate(self.owner_james)
         response = self.client.get(f"{url}?search=아메리카노")
         self._test_response_format(response)
         self.assertEqual(len(response.data["data"]["results"]), 1)
@@ -267,7 +304,7 @@ class ProductListTestCase(BaseAPITestCase):
             PRODUCT_LIST_URL_NAME,
             kwargs={"cafe_uuid": self.cafe_for_jenny.uuid},
         )
-        self.client.force_login(self.owner_james)
+        self.authenticate(self.owner_james)
         response = self.client.get(url, {"search": "녹차"})
         self._test_response_format(response)
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -355,7 +392,7 @@ class ProductDetailTestCase(BaseAPITestCase):
         self.assertEqual(response.status_code, 401)
 
         # 로그인합니다.
-        self.client.force_login(self.owner_james)
+        self.authenticate(self.owner_james)
 
         # 자신의 카페의 상품 상세정보를 조회할 수 있습니다.
         response = self.client.get(url)
@@ -449,7 +486,7 @@ class ProductDeleteTestCase(BaseAPITestCase):
                 "product_id": self.product_for_james1.id,
             },
         )
-        self.client.force_login(self.owner_james)
+        self.authenticate(self.owner_james)
         response = self.client.delete(url)
         self._test_response_format(response)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
@@ -471,7 +508,1899 @@ class ProductDeleteTestCase(BaseAPITestCase):
                 "product_id": self.product_for_jenny.id,
             },
         )
-        self.client.force_login(self.owner_james)
+        self.authenticate(self.owner_james)
         response = self.client.delete(url)
         self._test_response_format(response)
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ProductSearchIndexTestCase(BaseAPITestCase):
+    """
+    상품 검색 인덱스 테스트
+    """
+
+    def setUp(self):
+        """
+        테스트에 필요한 유저, 카페, 카테고리, 상품을 생성
+        """
+        self.owner_james = User.objects.create_user(
+            mobile="+82-1012345678", password="test_password"
+        )
+        self.cafe_for_james = Cafe.objects.create(
+            name="James's Cafe", owner=self.owner_james
+        )
+        self.category_for_james = Category.objects.create(
+            name="Coffee", cafe=self.cafe_for_james
+        )
+        for name in ["아메리카노", "카페라떼", "바닐라 라떼", "Cold Brew"]:
+            Product.objects.create(
+                name=name,
+                description=name,
+                cost=2000,
+                price=3000,
+                expireation_date=timezone.now(),
+                category=self.category_for_james,
+            )
+
+    def test_grams_are_indexed_on_save(self):
+        """
+        상품이 저장되면 이름과 초성의 n-gram 이 인덱스에 저장되어야 합니다.
+        """
+        product = Product.objects.get(name="카페라떼")
+        self.assertEqual(
+            set(product.search_grams.values_list("gram", flat=True)),
+            get_ngrams("카페라떼", "ㅋㅍㄹㄸ"),
+        )
+
+        # 이름이 바뀌면 인덱스도 갱신되어야 합니다.
+        product.name = "카푸치노"
+        product.save()
+        self.assertEqual(
+            set(product.search_grams.values_list("gram", flat=True)),
+            get_ngrams("카푸치노", "ㅋㅍㅊㄴ"),
+        )
+
+        # 상품이 삭제되면 인덱스도 삭제되어야 합니다.
+        product.delete()
+        self.assertFalse(ProductSearchGram.objects.filter(product=product).exists())
+
+    def test_index_only_when_name_is_saved(self):
+        """
+        이름을 저장하지 않는 update_fields 로 저장하면 인덱스를 다시 만들지 않아야 합니다.
+        """
+        product = Product.objects.get(name="카페라떼")
+        with mock.patch.object(NgramTableSearchBackend, "index") as index:
+            product.price = 3500
+            product.save(update_fields=["price"])
+            index.assert_not_called()
+
+            product.save(update_fields=["name", "price"])
+            index.assert_called_once_with([product])
+
+    def test_index_matches_like_search(self):
+        """
+        인덱스를 사용한 검색 결과는 LIKE 검색 결과와 같아야 합니다.
+        """
+        backend = NgramTableSearchBackend()
+        queryset = Product.objects.all()
+        for value in ["라떼", "ㄹㄸ", "ㅋㅍ", "카", "brew", "ㅂㄴㄹ ㄹ", "없는상품"]:
+            self.assertEqual(
+                set(backend.filter(queryset, value)),
+                set(filter_by_like(queryset, value)),
+                value,
+            )
+
+    def test_search_with_wrong_keyboard_layout(self):
+        """
+        한/영 전환을 잘못하여 입력된 검색어로도 검색할 수 있어야 합니다.
+        """
+        queryset = Product.objects.all()
+
+        def search(value):
+            return sorted(
+                ProductFilter.filter_search(queryset, "search", value).values_list(
+                    "name", flat=True
+                )
+            )
+
+        self.assertEqual(search("zkvp"), ["카페라떼"])
+        self.assertEqual(search("dkapfl"), ["아메리카노"])
+        self.assertEqual(search("ㅊㅐㅣㅇ ㅠㄱㄷㅈ"), ["Cold Brew"])
+        self.assertEqual(search("ㅊㅐㅣㅇ"), ["Cold Brew"])
+        # 자판 검색은 접두사 검색이므로, 이름 중간의 글자는 검색되지 않습니다.
+        self.assertEqual(search("fkEp"), [])
+        self.assertEqual(search("라떼"), ["바닐라 라떼", "카페라떼"])
+        # Shift 키로 입력되는 자모는 구분합니다. ("zkvpfkEp" -> "카페라떼", "zkvpfkep" -> "카페라데")
+        self.assertEqual(search("zkvpfkEp"), ["카페라떼"])
+        self.assertEqual(search("zkvpfkep"), [])
+        self.assertEqual(search("Zkvp"), ["카페라떼"])
+
+        # 이름의 영문 대문자는 Shift 키로 입력되는 자모와 구분되어야 합니다.
+        Product.objects.create(
+            name="Espresso",
+            description="Espresso",
+            cost=2000,
+            price=3000,
+            expireation_date=timezone.now(),
+            category=self.category_for_james,
+        )
+        self.assertEqual(Product.objects.get(name="Espresso").name_keys, "espresso")
+        self.assertEqual(search("ㄷㄴㅔㄱㄷㄴㄴㅐ"), ["Espresso"])
+        self.assertEqual(search("ㄸㄴㅔㄱㄷㄴㄴㅐ"), [])
+
+        # 완성된 한글 음절이 있는 검색어는 자판 필드를 검색하지 않습니다.
+        products = ProductFilter.filter_search(queryset, "search", "카페")
+        self.assertNotIn("name_keys", str(products.query).split("WHERE", 1)[1])
+
+        # 자판 검색은 이름 검색과 OR 로 묶지 않고 따로 조회한 뒤 id 로 합칩니다.
+        with self.assertNumQueries(2):
+            products = ProductFilter.filter_search(queryset, "search", "zkvp")
+        where = str(products.query).split("WHERE", 1)[1]
+        self.assertNotIn("name_keys", where)
+        self.assertNotIn("products_productsearchgram", where)
+
+
+class BackfillInitialConsonantTestCase(BaseAPITestCase):
+    """
+    초성 필드 채우기 명령어 테스트
+    """
+
+    def setUp(self):
+        """
+        초성 필드가 비어 있는 상품들을 생성
+        """
+        owner = User.objects.create_user(
+            mobile="+82-1012345678", password="test_password"
+        )
+        cafe = Cafe.objects.create(name="James's Cafe", owner=owner)
+        category = Category.objects.create(name="Coffee", cafe=cafe)
+        Product.objects.bulk_create(
+            Product(
+                name=name,
+                description=name,
+                cost=2000,
+                price=3000,
+                expireation_date=timezone.now(),
+                category=category,
+                cafe=cafe,
+            )
+            for name in ["아메리카노", "카페라떼", "바닐라 라떼", "녹차"]
+        )
+        self.products = list(Product.objects.order_by("id"))
+
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.checkpoint = Path(temp_dir.name) / "backfill.checkpoint"
+
+    def backfill(self, *args):
+        call_command(
+            "backfill_initial_consonant",
+            "--chunk-size=2",
+            f"--checkpoint={self.checkpoint}",
+            *args,
+            stdout=StringIO(),
+        )
+
+    def test_backfill(self):
+        """
+        모든 상품의 초성 필드와 검색 인덱스가 채워져야 합니다.
+        """
+        self.backfill()
+        self.assertEqual(
+            list(Product.objects.order_by("id").values_list("initial_consonant")),
+            [("ㅇㅁㄹㅋㄴ",), ("ㅋㅍㄹㄸ",), ("ㅂㄴㄹ ㄹㄸ",), ("ㄴㅊ",)],
+        )
+        self.assertEqual(
+            list(Product.objects.filter(initial_consonant__contains="ㄹㄸ")),
+            list(ProductFilter.filter_search(Product.objects.all(), "search", "ㄹㄸ")),
+        )
+        # 모든 상품을 처리하면 checkpoint 는 삭제되어야 합니다.
+        self.assertFalse(self.checkpoint.exists())
+
+    def test_invalidate_suggestions(self):
+        """
+        갱신된 상품이 있는 카페의 자동완성 인덱스는 커밋된 뒤 제거되어야 합니다.
+        """
+        with mock.patch.object(suggestion_cache, "invalidate") as invalidate:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.backfill()
+        invalidate.assert_called_with(self.products[0].cafe_id)
+
+    def test_dry_run(self):
+        """
+        dry-run 인 경우, 아무것도 저장되지 않아야 합니다.
+        """
+        self.backfill("--dry-run")
+        self.assertFalse(Product.objects.exclude(initial_consonant="").exists())
+        self.assertFalse(self.checkpoint.exists())
+
+    def test_resume_from_checkpoint(self):
+        """
+        checkpoint 가 있으면, 기록된 id 이후의 상품부터 처리해야 합니다.
+        """
+        self.checkpoint.write_text(f'{{"last_id": {self.products[1].id}}}')
+        self.backfill()
+        self.assertEqual(
+            list(Product.objects.order_by("id").values_list("initial_consonant")),
+            [("",), ("",), ("ㅂㄴㄹ ㄹㄸ",), ("ㄴㅊ",)],
+        )
+        self.assertFalse(self.checkpoint.exists())
+
+        # 중간에 멈춘 경우, checkpoint 가 남아 있어야 합니다.
+        with mock.patch.object(
+            BackfillCommand, "refresh", side_effect=[[], RuntimeError]
+        ):
+            with self.assertRaises(RuntimeError):
+                self.backfill("--reset")
+        self.assertEqual(
+            self.checkpoint.read_text(), f'{{"last_id": {self.products[1].id}}}'
+        )
+
+        # --reset 을 사용하면 처음부터 다시 처리합니다.
+        self.backfill("--reset")
+        self.assertFalse(Product.objects.filter(initial_consonant="").exists())
+
+
+class ProductAutocompleteTestCase(BaseAPITestCase):
+    """
+    상품 자동완성 테스트
+    """
+
+    def setUp(self):
+        """
+        테스트에 필요한 유저, 카페, 카테고리, 상품을 생성
+        """
+        self.owner_james = User.objects.create_user(
+            mobile="+82-1012345678", password="test_password"
+        )
+        self.cafe_for_james = Cafe.objects.create(
+            name="James's Cafe", owner=self.owner_james
+        )
+        category_for_james = Category.objects.create(
+            name="Coffee", cafe=self.cafe_for_james
+        )
+        for name in ["아메리카노", "아이스티", "카페라떼", "카푸치노", "Cafe Mocha"]:
+            Product.objects.create(
+                name=name,
+                description=name,
+                cost=2000,
+                price=3000,
+                expireation_date=timezone.now(),
+                category=category_for_james,
+            )
+
+        owner_jenny = User.objects.create_user(
+            mobile="+82-1012345679", password="test_password"
+        )
+        cafe_for_jenny = Cafe.objects.create(name="Jenny's Cafe", owner=owner_jenny)
+        Product.objects.create(
+            name="아메리카노",
+            description="아메리카노",
+            cost=2000,
+            price=3000,
+            expireation_date=timezone.now(),
+            category=Category.objects.create(name="Coffee", cafe=cafe_for_jenny),
+        )
+
+        self.url = reverse(
+            PRODUCT_AUTOCOMPLETE_URL_NAME,
+            kwargs={"cafe_uuid": self.cafe_for_james.uuid},
+        )
+        suggestion_cache.clear()
+
+    def autocomplete(self, **params):
+        response = self.client.get(self.url, params)
+        self._test_response_format(response)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [product["name"] for product in response.data["data"]]
+
+    def test_autocomplete_with_composing_syllable(self):
+        """
+        조합 중인 글자로도 상품을 찾을 수 있어야 합니다.
+        """
+        self.authenticate(self.owner_james)
+        self.assertEqual(self.autocomplete(q="아메ㄹ"), ["아메리카노"])
+        self.assertEqual(self.autocomplete(q="아멜"), ["아메리카노"])
+        self.assertEqual(self.autocomplete(q="카ㅍ"), ["카페라떼", "카푸치노"])
+        self.assertEqual(self.autocomplete(q="ㅇ"), ["아메리카노", "아이스티"])
+        self.assertEqual(self.autocomplete(q="cafe"), ["Cafe Mocha"])
+        self.assertEqual(self.autocomplete(q="라떼"), [])
+        self.assertEqual(self.autocomplete(q=""), [])
+
+    def test_autocomplete_with_initial_consonant(self):
+        """
+        초성으로만 이루어진 검색어는 초성으로도 찾을 수 있어야 합니다.
+        """
+        self.authenticate(self.owner_james)
+        self.assertEqual(self.autocomplete(q="ㅋㅍ"), ["카페라떼", "카푸치노"])
+        self.assertEqual(self.autocomplete(q="ㅇㅇ"), ["아이스티"])
+
+    def test_autocomplete_from_database(self):
+        """
+        메모리에 올릴 수 없는 카페는 데이터베이스에서 같은 결과를 찾아야 합니다.
+        """
+        self.authenticate(self.owner_james)
+        queries = ["아메ㄹ", "카ㅍ", "ㅋㅍ", "ㅇ", "cafe", "라떼"]
+        expected = [self.autocomplete(q=query) for query in queries]
+        with mock.patch.object(suggestion_cache, "max_bytes", 0):
+            suggestion_cache.clear()
+            self.assertEqual(
+                [self.autocomplete(q=query) for query in queries], expected
+            )
+            self.assertEqual(suggestion_cache.stats()["cafes"], 0)
+
+    def test_autocomplete_from_memory(self):
+        """
+        한 번 사용된 카페는 데이터베이스를 조회하지 않고 응답해야 하고,
+        상품이 바뀌면 인덱스가 다시 만들어져야 합니다.
+        """
+        self.authenticate(self.owner_james)
+        self.autocomplete(q="아")
+        hits = suggestion_cache.stats()["hits"]
+
+        # 권한 확인(카페와 카탈로그 버전) 외에는 쿼리가 실행되지 않아야 합니다.
+        with self.assertNumQueries(1):
+            self.assertEqual(self.autocomplete(q="아메"), ["아메리카노"])
+        self.assertEqual(suggestion_cache.stats()["hits"], hits + 1)
+
+        product = Product.objects.get(name="아메리카노", cafe=self.cafe_for_james)
+        product.name = "아포가토"
+        with self.captureOnCommitCallbacks(execute=True):
+            product.save()
+        self.assertEqual(self.autocomplete(q="아메"), [])
+        self.assertEqual(self.autocomplete(q="앞"), ["아포가토"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            product.delete()
+        self.assertEqual(self.autocomplete(q="아"), ["아이스티"])
+
+    def test_invalidate_after_commit(self):
+        """
+        인덱스는 트랜잭션이 커밋된 뒤에 제거되어야 합니다.
+        커밋 전에 다시 만들어진 인덱스도 커밋되면 제거됩니다.
+        """
+        self.authenticate(self.owner_james)
+        self.autocomplete(q="아")
+        product = Product.objects.get(name="아메리카노", cafe=self.cafe_for_james)
+        product.name = "아포가토"
+        with self.captureOnCommitCallbacks() as callbacks:
+            product.save()
+            self.assertEqual(suggestion_cache.stats()["cafes"], 1)
+            self.autocomplete(q="아")
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(suggestion_cache.stats()["cafes"], 0)
+        self.assertEqual(self.autocomplete(q="앞"), ["아포가토"])
+
+    def test_autocomplete_limit(self):
+        """
+        결과의 수는 limit 으로 제한되어야 합니다.
+        """
+        self.authenticate(self.owner_james)
+        self.assertEqual(len(self.autocomplete(q="ㅋ", limit=1)), 1)
+        self.assertEqual(len(self.autocomplete(q="ㅋ", limit="invalid")), 2)
+
+    def test_autocomplete_another_cafe(self):
+        """
+        다른 카페의 상품은 자동완성할 수 없습니다.
+        """
+        self.authenticate(self.owner_james)
+        url = reverse(
+            PRODUCT_AUTOCOMPLETE_URL_NAME,
+            kwargs={"cafe_uuid": Cafe.objects.get(name="Jenny's Cafe").uuid},
+        )
+        response = self.client.get(url, {"q": "아"})
+        self._test_response_format(response)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ProductSuggestionCacheTestCase(BaseAPITestCase):
+    """
+    카페별 자동완성 인덱스 캐시 테스트
+    """
+
+    def setUp(self):
+        """
+        상품을 가진 카페 두 개를 생성
+        """
+        owner = User.objects.create_user(
+            mobile="+82-1012345678", password="test_password"
+        )
+        self.cafes = []
+        for cafe_name in ["First Cafe", "Second Cafe"]:
+            cafe = Cafe.objects.create(name=cafe_name, owner=owner)
+            category = Category.objects.create(name="Coffee", cafe=cafe)
+            for name in ["아메리카노", "카페라떼"]:
+                Product.objects.create(
+                    name=name,
+                    description=name,
+                    cost=2000,
+                    price=3000,
+                    expireation_date=timezone.now(),
+                    category=category,
+                )
+            self.cafes.append(cafe)
+
+    def test_hit_and_miss(self):
+        """
+        처음 사용되는 카페는 miss, 그 이후로는 hit 이어야 합니다.
+        """
+        cache = ProductSuggestionCache(max_bytes=1024 * 1024, ttl=60)
+        cafe = self.cafes[0]
+        self.assertEqual(cache.suggest(cafe.uuid, "카", 10)[0]["name"], "카페라떼")
+        with self.assertNumQueries(0):
+            self.assertEqual(cache.suggest(cafe.uuid, "ㅇ", 10)[0]["name"], "아메리카노")
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+        # ttl 이 지나면 인덱스를 다시 만듭니다.
+        cache.ttl = 0
+        cache.suggest(cafe.uuid, "카", 10)
+        self.assertEqual(cache.stats()["misses"], 2)
+
+    def test_lru_eviction(self):
+        """
+        메모리 제한을 넘으면, 가장 오래 사용되지 않은 카페부터 제거되어야 합니다.
+        """
+        cache = ProductSuggestionCache(max_bytes=1024 * 1024, ttl=60)
+        cache.suggest(self.cafes[0].uuid, "카", 10)
+        cache.max_bytes = cache.stats()["bytes"] + 1
+
+        cache.suggest(self.cafes[1].uuid, "카", 10)
+        self.assertEqual(cache.stats()["cafes"], 1)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+        cache.suggest(self.cafes[1].uuid, "카", 10)
+        self.assertEqual(cache.stats()["hits"], 1)
+
+
+class ProductQueryBudgetTestCase(BaseAPITestCase):
+    """
+    상품 API 의 쿼리 수 테스트
+
+    쿼리 수는 상품의 수와 관계없이 일정해야 합니다.
+    JWT 인증은 쿼리를 실행하지 않고, 권한 확인(카페)에 1개의 쿼리가 사용됩니다.
+    권한 확인에서 조회한 카페는 카탈로그 버전(ETag), 검증과 저장에서 다시 사용됩니다.
+    상품을 저장하면 카탈로그 버전을 올리는 쿼리가 추가됩니다.
+    """
+
+    def setUp(self):
+        """
+        테스트에 필요한 유저, 카페, 카테고리, 옵션 그룹, 상품을 생성
+        """
+        self.owner = User.objects.create_user(
+            mobile="+82-1012345678", password="test_password"
+        )
+        self.cafe = Cafe.objects.create(name="James's Cafe", owner=self.owner)
+        self.categories = [
+            Category.objects.create(name=name, cafe=self.cafe)
+            for name in ["Coffee", "Cake", "Tea"]
+        ]
+        self.option_groups = [
+            OptionGroup.objects.create(name=name, cafe=self.cafe)
+            for name in ["Size", "Shot", "Syrup"]
+        ]
+        for index in range(15):
+            product = Product.objects.create(
+                name=f"상품 {index}",
+                description="description",
+                cost=2000,
+                price=3000,
+                expireation_date=timezone.now(),
+                category=self.categories[index % 3],
+            )
+            product.option_groups.set(self.option_groups)
+        self.product = product
+        self.authenticate(self.owner)
+
+    def test_list(self):
+        url = reverse(PRODUCT_LIST_URL_NAME, kwargs={"cafe_uuid": self.cafe.uuid})
+        with self.assertMaxQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.assertMaxQueries(2):
+            response = self.client.get(response.data["data"]["next"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_with_search(self):
+        url = reverse(PRODUCT_LIST_URL_NAME, kwargs={"cafe_uuid": self.cafe.uuid})
+        with self.assertMaxQueries(2):
+            response = self.client.get(url, {"search": "상품", "category": "Cake"})
+        self.assertEqual(len(response.data["data"]["results"]), 5)
+
+    def test_retrieve(self):
+        url = reverse(
+            PRODUCT_DETAIL_URL_NAME,
+            kwargs={"cafe_uuid": self.cafe.uuid, "product_id": self.product.id},
+        )
+        with self.assertMaxQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_update(self):
+        url = reverse(
+            PRODUCT_DETAIL_URL_NAME,
+            kwargs={"cafe_uuid": self.cafe.uuid, "product_id": self.product.id},
+        )
+        data = {
+            "name": "새 상품",
+            "description": "description",
+            "cost": 1000,
+            "price": 2000,
+            "expireation_date": timezone.now(),
+            "option_groups": [group.id for group in self.option_groups[:2]],
+        }
+        with self.assertMaxQueries(10):
+            response = self.client.put(url, data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.product.option_groups.count(), 2)
+
+    def test_create(self):
+        url = reverse(PRODUCT_LIST_URL_NAME, kwargs={"cafe_uuid": self.cafe.uuid})
+        data = {
+            "name": "새 상품",
+            "description": "description",
+            "cost": 1000,
+            "price": 2000,
+            "expireation_date": timezone.now(),
+            "category": self.categories[0].id,
+            "option_groups": [group.id for group in self.option_groups],
+        }
+        with self.assertMaxQueries(12) as context:
+            response = self.client.post(url, data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        # 카페는 권한 확인에서 한 번만 조회되어야 합니다.
+        self.assertEqual(self.count_cafe_queries(context), 1)
+
+        # 카페의 owner 가 캐시된 뒤에는 카페를 조회하지 않아야 합니다.
+        data["name"] = "새 상품 2"
+        with self.assertMaxQueries(11) as context:
+            response = self.client.post(url, data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.count_cafe_queries(context), 0)
+
+    def test_create_with_incorrect_option_group_type(self):
+        """
+        잘못된 타입의 옵션 그룹 id 가 있으면, 그 값의 타입으로 에러를 반환해야 합니다.
+        """
+        url = reverse(PRODUCT_LIST_URL_NAME, kwargs={"cafe_uuid": self.cafe.uuid})
+        data = {
+            "name": "새 상품",
+            "description": "description",
+            "cost": 1000,
+            "price": 2000,
+            "expireation_date": timezone.now(),
+            "category": self.categories[0].id,
+            "option_groups": [self.option_groups[0].id, "Size"],
+        }
+        response = self.client.post(url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("received str", str(response.data["meta"]["message"]))
+
+    @staticmethod
+    def count_cafe_queries(context):
+        return sum(
+            query["sql"].startswith("SELECT") and 'FROM "cafes_cafe"' in query["sql"]
+            for query in context.captured_queries
+        )
+
+    def test_create_with_other_cafe_category(self):
+        """
+        다른 카페의 카테고리와 옵션 그룹은 선택할 수 없습니다.
+        """
+        other_cafe = Cafe.objects.create(name="James's Bakery", owner=self.owner)
+        other_category = Category.objects.create(name="Bread", cafe=other_cafe)
+        other_option_group = OptionGroup.objects.create(name="Size", cafe=other_cafe)
+        url = reverse(PRODUCT_LIST_URL_NAME, kwargs={"cafe_uuid": self.cafe.uuid})
+        data = {
+            "name": "새 상품",
+            "description": "description",
+            "cost": 1000,
+            "price": 2000,
+            "expireation_date": timezone.now(),
+            "category": other_category.id,
+            "option_groups": [other_option_group.id],
+        }
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            set(response.data["meta"]["message"]), {"category", "option_groups"}
+        )
+
+
+class ProductCafeTestCase(BaseAPITestCase):
+    """
+    상품에 따로 저장되는 카페 테스트
+    """
+
+    def setUp(self):
+        """
+        한 명의 유저가 가진 두 개의 카페와, 각 카페의 카테고리를 생성
+        """
+        self.owner = User.objects.create_user(
+            mobile="+82-1012345678", password="test_password"
+        )
+        self.cafe = Cafe.objects.create(name="James's Cafe", owner=self.owner)
+        self.other_cafe = Cafe.objects.create(name="James's Bakery", owner=self.owner)
+        self.category = Category.objects.create(name="Coffee", cafe=self.cafe)
+        self.other_category = Category.objects.create(
+            name="Bread", cafe=self.other_cafe
+        )
+        self.product = Product.objects.create(
+            name="아메리카노",
+            description="description",
+            cost=2000,
+            price=3000,
+            expireation_date=timezone.now(),
+            category=self.category,
+        )
+
+    def test_cafe_follows_category(self):
+        """
+        상품의 카페는 카테고리의 카페와 같아야 합니다.
+        """
+        self.assertEqual(self.product.cafe_id, self.cafe.id)
+
+        self.product.category = self.other_category
+        self.product.save()
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.cafe_id, self.other_cafe.id)
+
+    def test_cafe_follows_category_cafe(self):
+        """
+        카테고리의 카페가 바뀌면, 카테고리에 속한 상품의 카페도 바뀌어야 합니다.
+        """
+        self.category.cafe = self.other_cafe
+        self.category.save()
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.cafe_id, self.other_cafe.id)
+
+    def test_list_only_cafe_products(self):
+        """
+        상품 목록은 url 의 카페에 속한 상품만 포함해야 합니다.
+        """
+        self.authenticate(self.owner)
+        response = self.client.get(
+            reverse(PRODUCT_LIST_URL_NAME, kwargs={"cafe_uuid": self.other_cafe.uuid})
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"]["results"], [])
+
+
+class ProductIndexTestCase(BaseAPITestCase):
+    """
+    상품 API 의 쿼리가 필터와 정렬에 맞는 인덱스를 사용하는지 테스트
+    """
+
+    def setUp(self):
+        """
+        테스트에 필요한 유저, 카페, 카테고리, 상품을 생성
+        """
+        self.owner = User.objects.create_user(
+            mobile="+82-1012345678", password="test_password"
+        )
+        self.cafe = Cafe.objects.create(name="James's Cafe", owner=self.owner)
+        self.category = Category.objects.create(name="Coffee", cafe=self.cafe)
+        for name in ["아메리카노", "카페라떼", "바닐라 라떼"]:
+            Product.objects.create(
+                name=name,
+                description="description",
+                cost=2000,
+                price=3000,
+                expireation_date=timezone.now(),
+                category=self.category,
+            )
+        self.url = reverse(PRODUCT_LIST_URL_NAME, kwargs={"cafe_uuid": self.cafe.uuid})
+        self.authenticate(self.owner)
+
+    def test_list(self):
+        with self.assertUsesIndex("products_product", "product_cafe_id_idx"):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_next_page(self):
+        with mock.patch.object(CafehereCursorPagination, "page_size", 1):
+            response = self.client.get(self.url)
+            with self.assertUsesIndex("products_product", "product_cafe_id_idx"):
+                response = self.client.get(response.data["data"]["next"])
+        self.assertEqual(len(response.data["data"]["results"]), 1)
+
+    def test_list_by_category(self):
+        with self.assertUsesIndex("products_product", "product_cafe_id_idx"):
+            response = self.client.get(self.url, {"category": "Coffee"})
+        self.assertEqual(len(response.data["data"]["results"]), 3)
+
+    def test_products_of_category(self):
+        with self.assertUsesIndex("products_product", "product_category_id_idx"):
+            list(self.category.products.order_by("-id"))
+
+    def test_autocomplete(self):
+        url = reverse(
+            PRODUCT_AUTOCOMPLETE_URL_NAME, kwargs={"cafe_uuid": self.cafe.uuid}
+        )
+        with mock.patch.object(suggestion_cache, "suggest", return_value=None):
+            with self.assertUsesIndex("products_product", "product_cafe_name_jamo_idx"):
+                response = self.client.get(url, {"q": "아메"})
+        self.assertEqual(len(response.data["data"]), 1)
+
+
+class ProductOrderingTestCase(BaseAPITestCase):
+    """
+    상품 목록의 정렬과 keyset 페이지네이션 테스트
+    """
+
+    def setUp(self):
+        """
+        가격이 같은 상품들을 포함하여 7개의 상품을 생성
+        """
+        self.owner = User.objects.create_user(
+            mobile="+82-1012345678", password="test_password"
+        )
+        self.cafe = Cafe.objects.create(name="James's Cafe", owner=self.owner)
+        category = Category.objects.create(name="Coffee", cafe=self.cafe)
+        now = timezone.now()
+        for index, price in enumerate([3000, 1000, 2000, 1000, 3000, 1000, 2500]):
+            Product.objects.create(
+                name=f"상품 {7 - index}",
+                description="description",
+                cost=500,
+                price=price,
+                expireation_date=now + timedelta(days=index % 3),
+                category=category,
+            )
+        self.url = reverse(PRODUCT_LIST_URL_NAME, kwargs={"cafe_uuid": self.cafe.uuid})
+        self.authenticate(self.owner)
+
+    def get_all_pages(self, ordering, page_size=2):
+        """
+        next 링크를 따라가며 모든 페이지의 상품 id 를 반환합니다.
+        """
+        ids = []
+        url, params = self.url, {"ordering": ordering}
+        with mock.patch.object(CafehereCursorPagination, "page_size", page_size):
+            while url:
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                ids += [product["id"] for product in response.data["data"]["results"]]
+                url, params = response.data["data"]["next"], None
+        return ids
+
+    def test_ordering(self):
+        """
+        허용된 필드로 정렬하면, 같은 값을 가진 상품들은 id 순서로 모든 페이지에 한 번씩 포함되어야 합니다.
+        """
+        for ordering in ["price", "-price", "name", "-created", "expireation_date"]:
+            field = ordering.lstrip("-")
+            expected = sorted(
+                Product.objects.all(),
+                key=lambda product: (getattr(product, field), product.id),
+                reverse=ordering.startswith("-"),
+            )
+            with self.subTest(ordering=ordering):
+                self.assertEqual(
+                    self.get_all_pages(ordering),
+                    [product.id for product in expected],
+                )
+
+    def test_invalid_ordering(self):
+        """
+        허용되지 않은 필드로 정렬하면, 기본 정렬(id 역순)을 사용해야 합니다.
+        """
+        expected = list(Product.objects.order_by("-id").values_list("id", flat=True))
+        self.assertEqual(self.get_all_pages("cost", page_size=10), expected)
+
+    def test_previous_page(self):
+        """
+        이전 페이지 링크는 현재 페이지 바로 앞의 상품들을 반환해야 합니다.
+        """
+        with mock.patch.object(CafehereCursorPagination, "page_size", 3):
+            first = self.client.get(self.url, {"ordering": "price"})
+            second = self.client.get(first.data["data"]["next"])
+            previous = self.client.get(second.data["data"]["previous"])
+        self.assertEqual(
+            previous.data["data"]["results"], first.data["data"]["results"]
+        )
+
+    def test_invalid_cursor(self):
+        response = self.client.get(
+            self.url, {"ordering": "price", "cursor": "cD0lNUIlMjJhYmMlMjIlNUQ="}
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_ordering_uses_index(self):
+        """
+        정렬 필드마다 (카페, 정렬 키, id) 인덱스로 다음 페이지를 조회해야 합니다.
+        """
+        indexes = {
+            "price": "product_cafe_price_idx",
+            "-name": "product_cafe_name_idx",
+            "created": "product_cafe_created_idx",
+            "-expireation_date": "product_cafe_expiration_idx",
+        }
+        for ordering, index in indexes.items():
+            with self.subTest(ordering=ordering):
+                with mock.patch.object(CafehereCursorPagination, "page_size", 2):
+                    response = self.client.get(self.url, {"ordering": ordering})
+                    with self.assertUsesIndex("products_product", index):
+                        self.client.get(response.data["data"]["next"])
+
+
+class CatalogETagTestCase(BaseAPITestCase):
+    """
+    카탈로그 버전 ETag 와 조건부 요청(If-None-Match) 테스트
+    """
+
+    def setUp(self):
+        """
+        테스트에 필요한 유저, 카페, 카테고리, 옵션 그룹, 상품을 생성
+        """
+        self.owner = User.objects.create_user(
+            mobile="+82-1012345678", password="test_password"
+        )
+        self.cafe = Cafe.objects.create(name="James's Cafe", owner=self.owner)
+        self.category = Category.objects.create(name="Coffee", cafe=self.cafe)
+        self.option_group = OptionGroup.objects.create(name="Size", cafe=self.cafe)
+        self.product = Product.objects.create(
+            name="아메리카노",
+            description="description",
+            cost=2000,
+            price=3000,
+            expireation_date=timezone.now(),
+            category=self.category,
+        )
+        self.url = reverse(PRODUCT_LIST_URL_NAME, kwargs={"cafe_uuid": self.cafe.uuid})
+        self.authenticate(self.owner)
+
+    def get_version(self):
+        self.cafe.refresh_from_db()
+        return self.cafe.catalog_version
+
+    def test_not_modified(self):
+        """
+        ETag 가 일치하면, 카탈로그를 조회하지 않고 본문이 없는 304 응답을 반환해야 합니다.
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+
+        # 권한 확인(카페와 카탈로그 버전) 외에는 쿼리가 실행되지 않아야 합니다.
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+    def test_modified(self):
+        """
+        카탈로그가 바뀌면 ETag 가 바뀌고, 이전 ETag 로는 전체 응답을 받아야 합니다.
+        """
+        etag = self.client.get(self.url)["ETag"]
+        self.product.price = 3500
+        self.product.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self._test_response_format(response)
+
+    def test_etag_per_request(self):
+        """
+        같은 버전이라도 요청이 다르면 ETag 가 달라야 합니다.
+        """
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, {"search": "아메"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_catalog_endpoints(self):
+        """
+        카테고리, 옵션 그룹 목록도 조건부 요청을 지원해야 합니다.
+        """
+        for url_name in [CATEGORY_LIST_URL_NAME, OPTION_GROUP_LIST_URL_NAME]:
+            with self.subTest(url_name=url_name):
+                url = reverse(url_name, kwargs={"cafe_uuid": self.cafe.uuid})
+                etag = self.client.get(url)["ETag"]
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_version_bumped_by_writes(self):
+        """
+        상품, 카테고리, 옵션 그룹, 옵션과 상품의 옵션 그룹이 바뀌면 버전이 올라가야 합니다.
+        """
+        writes = {
+            "product": lambda: self.product.save(),
+            "category": lambda: self.category.save(),
+            "option group": lambda: self.option_group.save(),
+            "option": lambda: Option.objects.create(
+                name="Large", add_price=500, option_group=self.option_group
+            ),
+            "product option groups": lambda: self.product.option_groups.add(
+                self.option_group
+            ),
+            "product delete": lambda: self.product.delete(),
+        }
+        for name, write in writes.items():
+            with self.subTest(write=name):
+                version = self.get_version()
+                # 삭제로 인한 버전은 트랜잭션이 커밋된 뒤 올라갑니다.
+                with self.captureOnCommitCallbacks(execute=True):
+                    write()
+                self.assertGreater(self.get_version(), version)
+
+    def test_cascade_delete_bumps_once(self):
+        """
+        카테고리와 함께 삭제된 상품들로 인해, 버전이 상품마다 올라가지 않아야 합니다.
+        """
+        for index in range(10):
+            Product.objects.create(
+                name=f"상품 {index}",
+                description="description",
+                cost=2000,
+                price=3000,
+                expireation_date=timezone.now(),
+                category=self.category,
+            )
+        Option.objects.bulk_create(
+            Option(name=f"옵션 {index}", add_price=0, option_group=self.option_group)
+            for index in range(10)
+        )
+
+        # 옵션 그룹을 삭제하면, 카페 id 와 옵션 그룹 id 로 한 번씩 올립니다.
+        for instance, bumps in [(self.category, 1), (self.option_group, 2)]:
+            with self.subTest(instance=instance):
+                version = self.get_version()
+                with CaptureQueriesContext(connection) as context:
+                    with self.captureOnCommitCallbacks(execute=True):
+                        instance.delete()
+                updates = [
+                    query["sql"]
+                    for query in context.captured_queries
+                    if query["sql"].startswith('UPDATE "cafes_cafe"')
+                ]
+                self.assertEqual(len(updates), bumps)
+                self.assertGreater(self.get_version(), version)
+
+    def test_write_does_not_return_etag(self):
+        response = self.client.post(
+            reverse(CATEGORY_LIST_URL_NAME, kwargs={"cafe_uuid": self.cafe.uuid}),
+            {"name": "Tea"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn("ETag", response)
+
+
+class ProductListCacheTestCase(BaseAPITestCase):
+    """
+    카탈로그 버전으로 무효화되는 상품 목록 응답 캐시 테스트
+    """
+
+    def setUp(self):
+        """
+        테스트에 필요한 유저, 카페, 카테고리, 상품을 생성
+        """
+        self.owner = User.objects.create_user(
+            mobile="+82-1012345678", password="test_password"
+        )
+        self.cafe = Cafe.objects.create(name="James's Cafe", owner=self.owner)
+        self.category = Category.objects.create(name="Coffee", cafe=self.cafe)
+        self.product = Product.objects.create(
+            name="아메리카노",
+            description="description",
+            cost=2000,
+            price=3000,
+            expireation_date=timezone.now(),
+            category=self.category,
+        )
+        self.url = reverse(PRODUCT_LIST_URL_NAME, kwargs={"cafe_uuid": self.cafe.uuid})
+        self.authenticate(self.owner)
+
+    def test_cache_hit(self):
+        """
+        같은 요청은 상품을 조회하지 않고 캐시된 응답을 그대로 반환해야 합니다.
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # 권한 확인(카페와 카탈로그 버전) 외에는 쿼리가 실행되지 않아야 합니다.
+        with self.assertNumQueries(1):
+            cached = self.client.get(self.url)
+        self.assertEqual(cached.status_code, status.HTTP_200_OK)
+        self.assertEqual(cached.content, response.content)
+        self.assertEqual(cached["Content-Type"], response["Content-Type"])
+        self.assertEqual(cached["ETag"], response["ETag"])
+
+    def test_invalidated_by_version(self):
+        """
+        상품이 바뀌면 카탈로그 버전이 올라가므로, 새로운 응답을 반환해야 합니다.
+        """
+        self.client.get(self.url)
+        self.product.name = "카페라떼"
+        self.product.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["data"]["results"][0]["name"], "카페라떼")
+
+    def test_key_per_params(self):
+        """
+        필터가 다른 요청은 서로 다른 응답을 받아야 합니다.
+        """
+        self.client.get(self.url)
+        response = self.client.get(self.url, {"search": "라떼"})
+        self.assertEqual(response.data["data"]["results"], [])
+
+
+class ProductBulkTestCase(BaseAPITestCase):
+    """
+    상품 일괄 등록, 수정 테스트
+    """
+
+    def setUp(self):
+        """
+        두 명의 유저와 각 유저의 카페, 카테고리, 옵션 그룹을 생성
+        """
+        self.owner = User.objects.create_user(
+            mobile="+82-1012345678", password="test_password"
+        )
+        self.cafe = Cafe.objects.create(name="James's Cafe", owner=self.owner)
+        self.category = Category.objects.create(name="Coffee", cafe=self.cafe)
+        self.option_groups = [
+            OptionGroup.objects.create(name=name, cafe=self.cafe)
+            for name in ["Size", "Shot"]
+        ]
+        other_owner = User.objects.create_user(
+            mobile="+82-1087654321", password="test_password"
+        )
+        other_cafe = Cafe.objects.create(name="Tom's Cafe", owner=other_owner)
+        self.other_category = Category.objects.create(name="Coffee", cafe=other_cafe)
+        self.url = reverse(PRODUCT_BULK_URL_NAME, kwargs={"cafe_uuid": self.cafe.uuid})
+        self.authenticate(self.owner)
+
+    def make_product(self, name, category):
+        return Product.objects.create(
+            name=name,
+            description="description",
+            cost=1000,
+            price=2000,
+            expireation_date=timezone.now(),
+            category=category,
+        )
+
+    def make_item(self, name, **kwargs):
+        return {
+            "name": name,
+            "description": "description",
+            "cost": 1000,
+            "price": 2000,
+            "expireation_date": timezone.now(),
+            "category": self.category.id,
+            "option_groups": [group.id for group in self.option_groups],
+            **kwargs,
+        }
+
+    def post(self, items):
+        return self.client.post(self.url, {"products": items}, format="json")
+
+    def test_create(self):
+        """
+        상품들이 카페, 초성, 검색 인덱스, 옵션 그룹과 함께 저장되어야 합니다.
+        """
+        response = self.post([self.make_item("아메리카노"), self.make_item("카페라떼")])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self._test_response_format(response)
+        self.assertEqual(
+            [product["name"] for product in response.data["data"]],
+            ["아메리카노", "카페라떼"],
+        )
+
+        product = Product.objects.get(id=response.data["data"][1]["id"])
+        self.assertEqual(product.cafe_id, self.cafe.id)
+        self.assertEqual(product.initial_consonant, "ㅋㅍㄹㄸ")
+        self.assertEqual(product.option_groups.count(), 2)
+        self.assertQuerysetEqual(
+            ProductFilter.filter_search(Product.objects.all(), "search", "라떼"),
+            [product],
+        )
+
+    def test_create_and_update(self):
+        """
+        id 가 있는 상품은 수정되고, 옵션 그룹도 입력으로 바뀌어야 합니다.
+        """
+        response = self.post([self.make_item("녹차")])
+        product_id = response.data["data"][0]["id"]
+
+        response = self.post(
+            [
+                self.make_item(
+                    "말차",
+                    id=product_id,
+                    option_groups=[self.option_groups[0].id],
+                ),
+                self.make_item("녹차"),
+            ]
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        product = Product.objects.get(id=product_id)
+        self.assertEqual(product.name, "말차")
+        self.assertEqual(product.initial_consonant, "ㅁㅊ")
+        self.assertEqual(list(product.option_groups.all()), [self.option_groups[0]])
+        self.assertEqual(Product.objects.filter(cafe=self.cafe).count(), 2)
+
+    def test_constant_queries(self):
+        """
+        쿼리 수는 상품의 수와 관계없이 일정해야 합니다.
+        """
+        # 두 요청 모두 카페의 owner 가 캐시된 상태에서 비교합니다.
+        ownership_cache.set(self.cafe)
+        with self.assertMaxQueries(11) as small:
+            self.post([self.make_item(f"상품 {index}") for index in range(2)])
+        with self.assertMaxQueries(11) as large:
+            self.post([self.make_item(f"상품 {index}") for index in range(2, 52)])
+        self.assertEqual(len(small), len(large))
+
+    def test_item_errors(self):
+        """
+        검증에 실패하면 아무것도 저장하지 않고, 상품의 순서대로 에러를 반환해야 합니다.
+        """
+        self.make_product("아메리카노", self.category)
+        response = self.post(
+            [
+                self.make_item("카페라떼"),
+                self.make_item("아메리카노"),
+                self.make_item("녹차", category=self.other_category.id),
+                self.make_item("카페라떼"),
+            ]
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self._test_response_format(response)
+        errors = response.data["meta"]["message"]["products"]
+        self.assertEqual(errors[0], {})
+        self.assertIn("name", errors[1])
+        self.assertIn("category", errors[2])
+        self.assertIn("name", errors[3])
+        self.assertEqual(Product.objects.filter(cafe=self.cafe).count(), 1)
+
+    def test_rename_conflicts(self):
+        """
+        같은 요청에서 수정되는 다른 상품의 이름으로는 바꿀 수 없어야 합니다.
+        수정으로 비워지는 이름은 새로 등록하는 상품이 사용할 수 있습니다.
+        """
+        americano = self.make_product("아메리카노", self.category)
+        latte = self.make_product("카페라떼", self.category)
+        response = self.post(
+            [
+                self.make_item("카페라떼", id=americano.id),
+                self.make_item("아메리카노", id=latte.id),
+            ]
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.data["meta"]["message"]["products"]
+        self.assertIn("name", errors[0])
+        self.assertIn("name", errors[1])
+
+        response = self.post(
+            [self.make_item("아이스 아메리카노", id=americano.id), self.make_item("아메리카노")]
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            set(Product.objects.filter(cafe=self.cafe).values_list("name", flat=True)),
+            {"아이스 아메리카노", "아메리카노", "카페라떼"},
+        )
+
+    def test_field_errors(self):
+        response = self.post([self.make_item("아메리카노"), self.make_item("", price=-1)])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.data["meta"]["message"]["products"]
+        self.assertEqual(errors[0], {})
+        self.assertEqual(set(errors[1]), {"name", "price"})
+        self.assertFalse(Product.objects.exists())
+
+    def test_other_cafe_product(self):
+        """
+        다른 카페의 상품은 수정할 수 없어야 합니다.
+        """
+        product = self.make_product("아메리카노", self.other_category)
+        response = self.post([self.make_item("카페라떼", id=product.id)])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("id", response.data["meta"]["message"]["products"][0])
+
+    def test_bumps_catalog_version(self):
+        version = self.cafe.catalog_version
+        self.post([self.make_item("아메리카노")])
+        self.cafe.refresh_from_db()
+        self.assertGreater(self.cafe.catalog_version, version)
+
+
+class ProductImportTestCase(BaseAPITestCase):
+    """
+    메뉴 파일 가져오기 테스트
+    """
+
+    CSV = (
+        "name,description,cost,price,expireation_date,category,option_groups\n"
+        "아메리카노,커피,1000,3000,2026-12-31T00:00:00+09:00,Coffee,Size|Shot\n"
+        "카페라떼,커피,1500,3500,2026-12-31T00:00:00+09:00,Coffee,Size\n"
+        "녹차,차,1000,-1,2026-12-31T00:00:00+09:00,Tea,\n"
+        "아메리카노,커피,1000,3000,2026-12-31T00:00:00+09:00,Coffee,\n"
+        "얼그레이,차,1000,3000,2026-12-31T00:00:00+09:00,Tea,\n"
+    )
+
+    def setUp(self):
+        """
+        테스트에 필요한 유저, 카페와 이미 존재하는 카테고리를 생성
+        """
+        self.owner = User.objects.create_user(
+            mobile="+82-1012345678", password="test_password"
+        )
+        self.cafe = Cafe.objects.create(name="James's Cafe", owner=self.owner)
+        self.category = Category.objects.create(name="Coffee", cafe=self.cafe)
+        self.url = reverse(
+            PRODUCT_IMPORT_URL_NAME, kwargs={"cafe_uuid": self.cafe.uuid}
+        )
+        self.authenticate(self.owner)
+
+    def upload(self, name, content, **params):
+        if isinstance(content, str):
+            content = content.encode()
+        file = SimpleUploadedFile(name, content)
+        url = self.url + ("?type=" + params["type"] if params else "")
+        return self.client.post(url, {"file": file}, format="multipart")
+
+    def test_import_csv(self):
+        """
+        검증에 실패하거나 이름이 중복된 행은 건너뛰고, 나머지 상품은 저장되어야 합니다.
+        """
+        response = self.upload("menu.csv", self.CSV)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self._test_response_format(response)
+
+        result = response.data["data"]
+        self.assertEqual(
+            (result["rows"], result["created"], result["failed"]), (5, 3, 2)
+        )
+        self.assertEqual([error["line"] for error in result["errors"]], [4, 5])
+        self.assertIn("price", result["errors"][0]["errors"])
+        self.assertIn("name", result["errors"][1]["errors"])
+
+        product = Product.objects.get(name="아메리카노")
+        self.assertEqual(product.category, self.category)
+        self.assertEqual(product.initial_consonant, "ㅇㅁㄹㅋㄴ")
+        self.assertEqual(
+            sorted(product.option_groups.values_list("name", flat=True)),
+            ["Shot", "Size"],
+        )
+        self.assertTrue(Category.objects.filter(cafe=self.cafe, name="Tea").exists())
+        self.assertEqual(OptionGroup.objects.filter(cafe=self.cafe).count(), 2)
+
+    def test_import_ndjson(self):
+        content = "\n".join(
+            [
+                '{"name": "아메리카노", "description": "커피", "cost": 1000, '
+                '"price": 3000, "expireation_date": "2026-12-31T00:00:00+09:00", '
+                '"category": "Coffee", "option_groups": ["Size"]}',
+                "not json",
+                "",
+                "[1, 2]",
+            ]
+        )
+        response = self.upload("menu.txt", content, type="ndjson")
+        result = response.data["data"]
+        self.assertEqual(
+            (result["rows"], result["created"], result["failed"]), (3, 1, 2)
+        )
+        self.assertEqual([error["line"] for error in result["errors"]], [2, 4])
+
+    def test_invalid_encoding(self):
+        """
+        UTF-8 이 아닌 행이 있으면, 500 이 아닌 행별 에러를 반환해야 합니다.
+        CSV 는 그 행부터 가져오지 않고, NDJSON 은 그 행만 건너뜁니다.
+        """
+        lines = self.CSV.encode().splitlines(keepends=True)
+        content = b"".join(lines[:3]) + "녹차".encode("cp949") + b",\n" + lines[5]
+        response = self.upload("menu.csv", content)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        result = response.data["data"]
+        self.assertEqual((result["created"], result["failed"]), (2, 1))
+        self.assertEqual(result["errors"][0]["line"], 4)
+
+        row = (
+            '{"name": "얼그레이", "description": "차", "cost": 1000, "price": 3000, '
+            '"expireation_date": "2026-12-31T00:00:00+09:00", "category": "Tea"}'
+        )
+        content = "녹차".encode("cp949") + b"\n" + row.encode()
+        response = self.upload("menu.ndjson", content)
+        result = response.data["data"]
+        self.assertEqual((result["created"], result["failed"]), (1, 1))
+        self.assertEqual(result["errors"][0]["line"], 1)
+
+    def test_invalid_csv(self):
+        """
+        CSV 로 읽을 수 없는 행이 있으면, 그 행부터 가져오지 않고 에러를 반환해야 합니다.
+        """
+        content = self.CSV + "홍차," + "x" * (csv.field_size_limit() + 1) + "\n"
+        response = self.upload("menu.csv", content)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        result = response.data["data"]
+        self.assertEqual((result["created"], result["failed"]), (3, 3))
+        self.assertEqual(sorted(error["line"] for error in result["errors"]), [4, 5, 7])
+
+    def test_rolled_back_batch(self):
+        """
+        저장에 실패한 batch 에서 만든 카테고리는 다음 batch 에서 다시 만들어야 합니다.
+        """
+        importer = MenuImporter(self.cafe)
+        rows = list(read_rows(BytesIO(self.CSV.encode()), "csv"))
+        with mock.patch(
+            "apps.products.imports.bulk_save_products", side_effect=RuntimeError
+        ):
+            with self.assertRaises(RuntimeError):
+                importer.run(rows)
+        self.assertFalse(Category.objects.filter(name="Tea").exists())
+        self.assertNotIn("Tea", importer.categories)
+
+        result = importer.run(rows)
+        self.assertEqual(result.created, 3)
+        self.assertTrue(Category.objects.filter(cafe=self.cafe, name="Tea").exists())
+
+    def test_failed_batch(self):
+        """
+        데이터베이스 에러로 저장하지 못한 batch 의 행은 실패로 기록하고, 다음 batch 는 저장해야 합니다.
+        """
+        csv = "name,description,cost,price,expireation_date,category\n" + "".join(
+            f"상품 {index},설명,1000,2000,2026-12-31T00:00:00+09:00,Coffee\n"
+            for index in range(5)
+        )
+        with mock.patch(
+            "apps.products.imports.bulk_save_products",
+            side_effect=[None, IntegrityError, None],
+        ), self.assertLogs("apps.products.imports", "WARNING"):
+            result = MenuImporter(self.cafe, batch_size=2).run(
+                read_rows(BytesIO(csv.encode()), "csv")
+            )
+        self.assertEqual((result.rows, result.created, result.failed), (5, 3, 2))
+        self.assertEqual([error["line"] for error in result.errors], [4, 5])
+
+    def test_invalid_request(self):
+        response = self.client.post(self.url, {}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.upload("menu.xlsx", self.CSV)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self._test_response_format(response)
+
+    def test_batches(self):
+        """
+        상품은 batch_size 개씩 나누어 저장되어야 합니다.
+        """
+        csv = "name,description,cost,price,expireation_date,category\n" + "".join(
+            f"상품 {index},설명,1000,2000,2026-12-31T00:00:00+09:00,Coffee\n"
+            for index in range(5)
+        )
+        created = []
+        result = MenuImporter(self.cafe, batch_size=2).run(
+            read_rows(BytesIO(csv.encode()), "csv"),
+            lambda result: created.append(result.created),
+        )
+        self.assertEqual(created, [2, 4, 5])
+        self.assertEqual(result.created, 5)
+
+    def test_command(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        path = Path(temp_dir.name) / "menu.csv"
+        path.write_text(self.CSV, encoding="utf-8")
+
+        out, err = StringIO(), StringIO()
+        call_command(
+            "import_menu", str(self.cafe.uuid), str(path), stdout=out, stderr=err
+        )
+        self.assertIn("Imported 3 of 5 rows (2 failed)", out.getvalue())
+        self.assertIn("Line 4", err.getvalue())
+        self.assertEqual(Product.objects.filter(cafe=self.cafe).count(), 3)
+
+        # 읽을 수 없는 파일도 traceback 없이 에러를 출력해야 합니다.
+        path.write_bytes("녹차".encode("cp949"))
+        out, err = StringIO(), StringIO()
+        call_command(
+            "import_menu", str(self.cafe.uuid), str(path), stdout=out, stderr=err
+        )
+        self.assertIn("Line 1", err.getvalue())
+        self.assertIn("not valid UTF-8", err.getvalue())
+
+
+class ProductExportTestCase(BaseAPITestCase):
+    """
+    전체 상품 내보내기 테스트
+    """
+
+    def setUp(self):
+        """
+        테스트에 필요한 유저, 카페, 카테고리, 옵션 그룹과 5개의 상품을 생성
+        """
+        self.owner = User.objects.create_user(
+            mobile="+82-1012345678", password="test_password"
+        )
+        self.cafe = Cafe.objects.create(name="James's Cafe", owner=self.owner)
+        category = Category.objects.create(name="Coffee", cafe=self.cafe)
+        option_groups = [
+            OptionGroup.objects.create(name=name, cafe=self.cafe)
+            for name in ["Size", "Shot"]
+        ]
+        for index in range(5):
+            product = Product.objects.create(
+                name=f"상품 {index}",
+                description="description",
+                cost=1000,
+                price=2000 + index,
+                expireation_date=timezone.now(),
+                category=category,
+            )
+            product.option_groups.set(option_groups[: index % 3])
+        self.url = reverse(
+            PRODUCT_EXPORT_URL_NAME, kwargs={"cafe_uuid": self.cafe.uuid}
+        )
+        self.authenticate(self.owner)
+
+    def export(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def test_export_csv(self):
+        response = self.client.get(self.url)
+        self.assertIn("attachment", response["Content-Disposition"])
+        rows = list(csv.DictReader(StringIO(self.export())))
+        self.assertEqual([row["name"] for row in rows], [f"상품 {i}" for i in range(5)])
+        self.assertEqual(rows[2]["option_groups"], "Shot|Size")
+        self.assertEqual(rows[0]["category"], "Coffee")
+
+    def test_export_ndjson(self):
+        rows = [json.loads(line) for line in self.export(type="ndjson").splitlines()]
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[1]["option_groups"], ["Size"])
+        self.assertEqual(rows[4]["price"], 2004)
+
+    def test_export_filtered(self):
+        rows = list(csv.DictReader(StringIO(self.export(search="상품 3"))))
+        self.assertEqual([row["name"] for row in rows], ["상품 3"])
+
+    def test_chunked_queries(self):
+        """
+        옵션 그룹은 chunk 마다 한 번의 쿼리로 조회해야 합니다.
+        """
+        # chunk 마다 상품 1개, 옵션 그룹 1개 (3개의 chunk)
+        with self.assertNumQueries(3 * 2) as context:
+            rows = list(iter_product_rows(Product.objects.all(), chunk_size=2))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(len({row["id"] for row in rows}), 5)
+        # 상품은 마지막으로 읽은 id 이후의 chunk 만큼씩 조회합니다.
+        product_queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if 'FROM "products_product"' in query["sql"]
+        ]
+        self.assertEqual(len(product_queries), 3)
+        self.assertTrue(all("LIMIT 2" in sql for sql in product_queries))
+
+    def test_round_trip(self):
+        """
+        내보낸 파일은 다른 카페로 다시 가져올 수 있어야 합니다.
+        """
+        other_cafe = Cafe.objects.create(name="James's Bakery", owner=self.owner)
+        result = MenuImporter(other_cafe).run(
+            read_rows(BytesIO(self.export().encode()), "csv")
+        )
+        self.assertEqual((result.created, result.failed), (5, 0))
+        self.assertEqual(
+            Product.objects.get(cafe=other_cafe, name="상품 2").option_groups.count(), 2
+        )
+
+    def test_invalid_type(self):
+        response = self.client.get(self.url, {"type": "xlsx"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class MenuTestCase(BaseAPITestCase):
+    """
+    전체 메뉴 트리 조회 테스트
+    """
+
+    def setUp(self):
+        """
+        두 개의 카테고리, 옵션이 있는 두 개의 옵션 그룹과 상품들을 생성
+        """
+        self.owner = User.objects.create_user(
+            mobile="+82-1012345678", password="test_password"
+        )
+        self.cafe = Cafe.objects.create(name="James's Cafe", owner=self.owner)
+        self.categories = [
+            Category.objects.create(name=name, cafe=self.cafe)
+            for name in ["Coffee", "Tea"]
+        ]
+        self.option_groups = []
+        for name, options in [("Size", ["Small", "Large"]), ("Shot", ["Extra"])]:
+            option_group = OptionGroup.objects.create(name=name, cafe=self.cafe)
+            for option in options:
+                Option.objects.create(
+                    name=option, add_price=500, option_group=option_group
+                )
+            self.option_groups.append(option_group)
+        self.url = reverse(MENU_URL_NAME, kwargs={"cafe_uuid": self.cafe.uuid})
+        self.authenticate(self.owner)
+
+    def create_products(self, count, start=0):
+        for index in range(start, start + count):
+            product = Product.objects.create(
+                name=f"상품 {index}",
+                description="description",
+                cost=1000,
+                price=2000,
+                expireation_date=timezone.now(),
+                category=self.categories[index % 2],
+            )
+            product.option_groups.set(self.option_groups[: index % 3])
+
+    def test_menu(self):
+        self.create_products(3)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self._test_response_format(response)
+
+        menu = response.data["data"]
+        self.cafe.refresh_from_db()
+        self.assertEqual(menu["catalog_version"], self.cafe.catalog_version)
+        self.assertEqual(
+            [category["name"] for category in menu["categories"]], ["Coffee", "Tea"]
+        )
+        coffee = menu["categories"][0]["products"]
+        self.assertEqual([product["name"] for product in coffee], ["상품 0", "상품 2"])
+        size, shot = coffee[1]["option_groups"]
+        self.assertEqual(size["name"], "Size")
+        self.assertEqual(
+            [option["name"] for option in size["options"]], ["Small", "Large"]
+        )
+        self.assertEqual(shot["options"][0]["add_price"], 500)
+
+    def test_constant_queries(self):
+        """
+        쿼리 수는 메뉴의 크기와 관계없이 일정해야 합니다.
+        """
+        self.create_products(3)
+        with self.assertMaxQueries(5) as small:
+            self.client.get(self.url)
+        self.create_products(30, start=3)
+        with self.assertMaxQueries(5) as large:
+            self.client.get(self.url)
+        self.assertEqual(len(small), len(large))
+
+    def test_not_modified(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Option.objects.create(
+            name="Medium", add_price=300, option_group=self.option_groups[0]
+        )
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_rename_cafe(self):
+        """
+        메뉴에 포함된 카페 이름이 바뀌면 새로운 메뉴를 응답해야 합니다.
+        """
+        etag = self.client.get(self.url)["ETag"]
+        version = self.cafe.catalog_version
+
+        self.cafe.name = "James's Coffee"
+        self.cafe.save()
+        self.assertEqual(self.cafe.catalog_version, version + 1)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"]["cafe"]["name"], "James's Coffee")
+
+        # 이름을 저장하지 않으면 버전을 올리지 않습니다.
+        self.cafe.save(update_fields=["modified"])
+        self.assertEqual(self.cafe.catalog_version, version + 1)
+
+    def test_other_owner(self):
+        other_owner = User.objects.create_user(
+            mobile="+82-1087654321", password="test_password"
+        )
+        self.authenticate(other_owner)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class OptionGroupUpdateTestCase(BaseAPITestCase):
+    """
+    옵션 그룹 수정 테스트
+    """
+
+    def setUp(self):
+        """
+        세 개의 옵션을 가진 옵션 그룹을 생성
+        """
+        self.owner = User.objects.create_user(
+            mobile="+82-1012345678", password="test_password"
+        )
+        self.cafe = Cafe.objects.create(name="James's Cafe", owner=self.owner)
+        self.option_group = OptionGroup.objects.create(name="Topping", cafe=self.cafe)
+        for name, add_price in [("Pearl", 500), ("Jelly", 500), ("Cream", 700)]:
+            Option.objects.create(
+                name=name, add_price=add_price, option_group=self.option_group
+            )
+        self.url = reverse(
+            OPTION_GROUP_DETAIL_URL_NAME,
+            kwargs={
+                "cafe_uuid": self.cafe.uuid,
+                "optiongroup_id": self.option_group.id,
+            },
+        )
+        self.authenticate(self.owner)
+
+    def get_options(self):
+        return dict(self.option_group.options.values_list("name", "add_price"))
+
+    def test_update(self):
+        """
+        이름으로 비교하여 옵션을 등록, 수정, 삭제해야 합니다.
+        """
+        jelly = self.option_group.options.get(name="Jelly")
+        data = {
+            "name": "Toppings",
+            "options": [
+                {"name": "Jelly", "add_price": 600},
+                {"name": "Cream", "add_price": 700},
+                {"name": "Pudding", "add_price": 800},
+            ],
+        }
+        response = self.client.put(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self._test_response_format(response)
+        self.assertEqual(response.data["data"]["options_count"], 3)
+
+        self.option_group.refresh_from_db()
+        self.assertEqual(self.option_group.name, "Toppings")
+        self.assertEqual(
+            self.get_options(), {"Jelly": 600, "Cream": 700, "Pudding": 800}
+        )
+        # 이름이 같은 옵션은 삭제하지 않고 수정해야 합니다.
+        self.assertEqual(self.option_group.options.get(name="Jelly").id, jelly.id)
+
+    def test_update_bumps_catalog_version(self):
+        self.cafe.refresh_from_db()
+        version = self.cafe.catalog_version
+        data = {"name": "Topping", "options": [{"name": "Pearl", "add_price": 500}]}
+        self.client.put(self.url, data, format="json")
+        self.cafe.refresh_from_db()
+        self.assertGreater(self.cafe.catalog_version, version)
+
+    def test_constant_queries(self):
+        """
+        쿼리 수는 옵션의 수와 관계없이 일정해야 합니다.
+        """
+        options = [{"name": "Pearl", "add_price": 600}] + [
+            {"name": f"Topping {index}", "add_price": 100} for index in range(4)
+        ]
+        # 두 요청 모두 카페의 owner 가 캐시된 상태에서 비교합니다.
+        ownership_cache.set(self.cafe)
+        with self.assertMaxQueries(12) as small:
+            self.client.put(
+                self.url, {"name": "Topping", "options": options}, format="json"
+            )
+
+        options = [
+            {"name": f"Topping {index}", "add_price": 200} for index in range(2, 60)
+        ]
+        with self.assertMaxQueries(12) as large:
+            response = self.client.put(
+                self.url, {"name": "Topping", "options": options}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(small), len(large))
+        self.assertEqual(self.option_group.options.count(), 58)
+
+    def test_duplicated_option_names(self):
+        data = {
+            "name": "Topping",
+            "options": [
+                {"name": "Pearl", "add_price": 500},
+                {"name": "Pearl", "add_price": 600},
+            ],
+        }
+        response = self.client.put(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.get_options(), {"Pearl": 500, "Jelly": 500, "Cream": 700})
+
+
+class CatalogListQueryTestCase(BaseAPITestCase):
+    """
+    카테고리, 옵션 그룹 목록의 쿼리 수 테스트
+
+    개수는 annotate 하고 상품 이름과 옵션은 prefetch 하므로,
+    권한 확인(카페) 외에 2개의 쿼리로 조회해야 합니다.
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            mobile="+82-1012345678", password="test_password"
+        )
+        self.cafe = Cafe.objects.create(name="James's Cafe", owner=self.owner)
+        self.authenticate(self.owner)
+
+    def create_categories(self, count, start=0):
+        for index in range(start, start + count):
+            category = Category.objects.create(name=f"Category {index}", cafe=self.cafe)
+            for product_index in range(3):
+                Product.objects.create(
+                    name=f"상품 {product_index}",
+                    description="description",
+                    cost=1000,
+                    price=2000,
+                    expireation_date=timezone.now(),
+                    category=category,
+                )
+
+    def create_option_groups(self, count, start=0):
+        for index in range(start, start + count):
+            option_group = OptionGroup.objects.create(
+                name=f"Option Group {index}", cafe=self.cafe
+            )
+            Option.objects.bulk_create(
+                Option(
+                    name=f"Option {option}", add_price=100, option_group=option_group
+                )
+                for option in range(3)
+            )
+
+    def test_category_list(self):
+        url = reverse(CATEGORY_LIST_URL_NAME, kwargs={"cafe_uuid": self.cafe.uuid})
+        self.create_categories(2)
+        with self.assertMaxQueries(3) as small:
+            self.client.get(url)
+        self.create_categories(30, start=2)
+        with self.assertMaxQueries(3) as large:
+            response = self.client.get(url)
+        self.assertEqual(len(small), len(large))
+
+        categories = response.data["data"]
+        self.assertEqual(len(categories), 32)
+        self.assertEqual(categories[0]["products"], ["상품 0", "상품 1", "상품 2"])
+        self.assertEqual(categories[0]["products_count"], 3)
+
+    def test_category_list_with_products_limit(self):
+        url = reverse(CATEGORY_LIST_URL_NAME, kwargs={"cafe_uuid": self.cafe.uuid})
+        self.create_categories(2)
+        Category.objects.create(name="Empty", cafe=self.cafe)
+        with self.assertMaxQueries(3) as context:
+            response = self.client.get(url, {"products_limit": 2})
+        self.assertEqual(response.data["data"][0]["products"], ["상품 0", "상품 1"])
+        self.assertEqual(response.data["data"][0]["products_count"], 3)
+        self.assertEqual(response.data["data"][2]["products"], [])
+        # 상품은 카테고리마다 limit 번째 상품의 id 까지만 조회합니다.
+        products_query = context.captured_queries[-1]["sql"]
+        self.assertIn('"products_product"."id" <=', products_query)
+
+        with self.assertMaxQueries(3):
+            response = self.client.get(url, {"products_limit": 5})
+        self.assertEqual(response.data["data"][1]["products"], ["상품 0", "상품 1", "상품 2"])
+
+        # 상품 이름을 포함하지 않으면 상품을 조회하지 않습니다.
+        with self.assertMaxQueries(2):
+            response = self.client.get(url, {"products_limit": 0})
+        self.assertEqual(response.data["data"][0]["products"], [])
+        self.assertEqual(response.data["data"][0]["products_count"], 3)
+
+        response = self.client.get(url, {"products_limit": -1})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_option_group_list(self):
+        url = reverse(OPTION_GROUP_LIST_URL_NAME, kwargs={"cafe_uuid": self.cafe.uuid})
+        self.create_option_groups(2)
+        with self.assertMaxQueries(3) as small:
+            self.client.get(url)
+        self.create_option_groups(30, start=2)
+        with self.assertMaxQueries(3) as large:
+            response = self.client.get(url)
+        self.assertEqual(len(small), len(large))
+
+        option_group = response.data["data"]["results"][0]
+        self.assertEqual(option_group["options_count"], 3)
+        self.assertEqual(
+            [option["name"] for option in option_group["options"]],
+            ["Option 0", "Option 1", "Option 2"],
+        )
+
+
+class OptionGroupListTestCase(BaseAPITestCase):
+    """
+    옵션 그룹 목록 테스트
+    """
+
+    def setUp(self):
+        """
+        두 명의 유저가 각각 옵션 그룹을 가진 카페를 생성
+        """
+        self.owner_james = User.objects.create_user(
+            mobile="+82-1012345678", password="test_password"
+        )
+        self.cafe_for_james = Cafe.objects.create(
+            name="James's Cafe", owner=self.owner_james
+        )
+        self.owner_jenny = User.objects.create_user(
+            mobile="+82-1012345679", password="test_password"
+        )
+        self.cafe_for_jenny = Cafe.objects.create(
+            name="Jenny's Cafe", owner=self.owner_jenny
+        )
+        self.option_groups = [
+            OptionGroup.objects.create(name=f"Option Group {index}", cafe=cafe)
+            for cafe in [self.cafe_for_james, self.cafe_for_jenny]
+            for index in range(12)
+        ]
+        for option_group in self.option_groups:
+            Option.objects.create(name="Small", add_price=0, option_group=option_group)
+        self.url = reverse(
+            OPTION_GROUP_LIST_URL_NAME, kwargs={"cafe_uuid": self.cafe_for_james.uuid}
+        )
+        self.authenticate(self.owner_james)
+
+    def test_list_only_cafe_option_groups(self):
+        """
+        URL 의 카페의 옵션 그룹만 페이지로 나누어 조회해야 합니다.
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self._test_response_format(response)
+        first_page = response.data["data"]["results"]
+        self.assertEqual(len(first_page), CafehereCursorPagination.page_size)
+
+        response = self.client.get(response.data["data"]["next"])
+        second_page = response.data["data"]["results"]
+        self.assertIsNone(response.data["data"]["next"])
+
+        ids = [option_group["id"] for option_group in first_page + second_page]
+        expected = sorted(
+            (
+                option_group.id
+                for option_group in self.option_groups
+                if option_group.cafe_id == self.cafe_for_james.id
+            ),
+            reverse=True,
+        )
+        self.assertEqual(ids, expected)
+
+    def test_queries_do_not_depend_on_other_cafes(self):
+        with self.assertMaxQueries(3) as before:
+            self.client.get(self.url)
+        for index in range(12, 40):
+            option_group = OptionGroup.objects.create(
+                name=f"Option Group {index}", cafe=self.cafe_for_jenny
+            )
+            Option.objects.create(name="Small", add_price=0, option_group=option_group)
+        with self.assertMaxQueries(3) as after:
+            response = self.client.get(self.url)
+        self.assertEqual(len(before), len(after))
+        self.assertEqual(len(response.data["data"]["results"]), 10)
+
+    def test_retrieve_other_cafe_option_group(self):
+        """
+        다른 카페의 옵션 그룹은 자신의 카페 URL 로도 조회할 수 없습니다.
+        """
+        other_option_group = self.option_groups[-1]
+        url = reverse(
+            OPTION_GROUP_DETAIL_URL_NAME,
+            kwargs={
+                "cafe_uuid": self.cafe_for_james.uuid,
+                "optiongroup_id": other_option_group.id,
+            },
+        )
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertTrue(OptionGroup.objects.filter(id=other_option_group.id).exists())
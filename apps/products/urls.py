@@ -11,11 +11,22 @@ OPTION_GROUP_LIST_URL_NAME = "optiongroup-list"
 OPTION_GROUP_DETAIL_URL_NAME = "optiongroup-detail"
 OPTION_GROUP_URL_KEYWORD = "optiongroup_id"
 
+MENU_URL_NAME = "menu"
+
 PRODUCT_LIST_URL_NAME = "product-list"
 PRODUCT_DETAIL_URL_NAME = "product-detail"
 PRODUCT_URL_KEYWORD = "product_id"
+PRODUCT_AUTOCOMPLETE_URL_NAME = "product-autocomplete"
+PRODUCT_BULK_URL_NAME = "product-bulk"
+PRODUCT_IMPORT_URL_NAME = "product-import"
+PRODUCT_EXPORT_URL_NAME = "product-export"
 
 urlpatterns = [
+    path(
+        f"<uuid:{CAFE_URL_KEYWORD}>/menu/",
+        views.MenuAPIView.as_view(),
+        name=MENU_URL_NAME,
+    ),
     path(
         f"<uuid:{CAFE_URL_KEYWORD}>/categories/",
         views.CategoryAPIViewSet.as_view({"get": "list", "post": "create"}),
@@ -38,12 +49,33 @@ urlpatterns = [
         views.OptionGroupAPIViewSet.as_view(
             {"get": "retrieve", "put": "update", "delete": "destroy"}
         ),
+        name=OPTION_GROUP_DETAIL_URL_NAME,
     ),
     path(
         f"<uuid:{CAFE_URL_KEYWORD}>/products/",
         views.ProductAPIViewSet.as_view({"get": "list", "post": "create"}),
         name=PRODUCT_LIST_URL_NAME,
     ),
+    path(
+        f"<uuid:{CAFE_URL_KEYWORD}>/products/bulk/",
+        views.ProductAPIViewSet.as_view({"post": "bulk"}),
+        name=PRODUCT_BULK_URL_NAME,
+    ),
+    path(
+        f"<uuid:{CAFE_URL_KEYWORD}>/products/import/",
+        views.ProductAPIViewSet.as_view({"post": "import_products"}),
+        name=PRODUCT_IMPORT_URL_NAME,
+    ),
+    path(
+        f"<uuid:{CAFE_URL_KEYWORD}>/products/export/",
+        views.ProductAPIViewSet.as_view({"get": "export"}),
+        name=PRODUCT_EXPORT_URL_NAME,
+    ),
+    path(
+        f"<uuid:{CAFE_URL_KEYWORD}>/products/autocomplete/",
+        views.ProductAPIViewSet.as_view({"get": "autocomplete"}),
+        name=PRODUCT_AUTOCOMPLETE_URL_NAME,
+    ),
     path(
         f"<uuid:{CAFE_URL_KEYWORD}>/products/<int:{PRODUCT_URL_KEYWORD}>/",
         views.ProductAPIViewSet.as_view(
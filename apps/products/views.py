@@ -1,30 +1,89 @@
+from django.db.models import Count, OuterRef, Prefetch, Q, Subquery
+from django.http import StreamingHttpResponse
 from django_filters import rest_framework as filters
-from drf_spectacular.utils import extend_schema
-from rest_framework.exceptions import NotFound
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
 
-from apps.cafes.models import Cafe
+from apps.cafes.resolvers import get_owned_cafe, get_owned_cafe_id
 from apps.cafes.urls import CAFE_URL_KEYWORD
+from apps.products.caching import CatalogETagMixin, CatalogResponseCacheMixin
+from apps.products.exports import (
+    CONTENT_TYPES,
+    EXPORT_TYPES,
+    RENDERERS,
+    iter_product_rows,
+)
 from apps.products.filters import ProductFilter
-from apps.products.models import Category, OptionGroup, Product
+from apps.products.imports import IMPORT_TYPES, MenuImporter, get_import_type, read_rows
+from apps.products.menu import build_menu
+from apps.products.models import Category, Option, OptionGroup, Product
 from apps.products.pagination import CafehereCursorPagination
 from apps.products.permissions import IsCafeOwner
+from apps.products.search import get_name_jamo, prefix_q
 from apps.products.serializers import (
     CategorySerializer,
     OptionGroupSerializer,
+    ProductAutocompleteSerializer,
+    ProductBulkSerializer,
     ProductDetailSerializer,
     ProductListSerializer,
 )
+from apps.products.suggestions import is_initial_consonant_query, suggestion_cache
 
 CATEGORY_TAG = "Category API"
 PRODUCT_TAG = "Product API"
 OPTIONGROUP_TAG = "OptionGroup API"
+MENU_TAG = "Menu API"
+
+# 카테고리 목록에 포함되는 상품 이름의 최대 개수를 받는 쿼리 파라미터입니다.
+PRODUCTS_LIMIT_PARAM = "products_limit"
+
+AUTOCOMPLETE_DEFAULT_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 20
+
+
+class CafeViewMixin:
+    """
+    URL 의 카페를 사용하는 view 의 mixin 입니다.
+    카페는 권한 확인(IsCafeOwner)에서 조회되어 요청에 저장된 것을 사용합니다.
+    """
+
+    def get_cafe(self):
+        """
+        요청한 유저의 카페를 반환합니다. 카페가 없거나 다른 유저의 카페이면 None 입니다.
+        """
+        return get_owned_cafe(self.request, self.kwargs[CAFE_URL_KEYWORD])
+
+    def get_cafe_or_404(self):
+        cafe = self.get_cafe()
+        if cafe is None:
+            raise NotFound()
+        return cafe
+
+    def get_cafe_id(self):
+        """
+        요청한 유저의 카페의 id 입니다. 카페를 조회하지 않고 캐시된 owner 로 확인합니다.
+        """
+        return get_owned_cafe_id(self.request, self.kwargs[CAFE_URL_KEYWORD])
+
+    def get_cafe_id_or_404(self):
+        cafe_id = self.get_cafe_id()
+        if cafe_id is None:
+            raise NotFound()
+        return cafe_id
 
 
 @extend_schema(
     tags=[CATEGORY_TAG],
 )
-class CategoryAPIViewSet(ModelViewSet):
+class CategoryAPIViewSet(CafeViewMixin, CatalogETagMixin, ModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = (IsCafeOwner,)
@@ -34,43 +93,139 @@ class CategoryAPIViewSet(ModelViewSet):
         두 가지 조건을 가지는 queryset을 반환합니다.
         1. 카페의 owner 이어야 합니다.
         2. 카페의 uuid 가 url 의 uuid 와 일치해야 합니다.
+        카페는 권한 확인에서 조회되었으므로, 카페를 join 하지 않고 cafe_id 로 조회합니다.
         """
-        queryset = self.queryset.filter(
-            cafe__uuid=self.kwargs[CAFE_URL_KEYWORD],
-            cafe__owner=self.request.user,
+        cafe_id = self.get_cafe_id()
+        if cafe_id is None:
+            return self.queryset.none()
+        # 상품의 수는 annotate 하고, 상품 이름은 목록 조회에서 한 번의 쿼리로 조회합니다.
+        queryset = self.queryset.filter(cafe_id=cafe_id).annotate(
+            products_count=Count("products")
         )
-        return queryset
+        limit = self.get_products_limit() if self.action == "list" else None
+        if limit:
+            # 카테고리마다 limit 번째 상품의 id 입니다. 상품이 limit 개보다 적으면 None 입니다.
+            queryset = queryset.annotate(
+                products_boundary=Subquery(
+                    Product.objects.filter(category_id=OuterRef("pk"))
+                    .order_by("id")
+                    .values("id")[limit - 1 : limit]
+                )
+            )
+        return queryset.order_by("id")
+
+    def load_product_names(self, categories: list[Category]):
+        """
+        카테고리들의 상품 이름을 한 번의 쿼리로 조회하여 product_names 에 담습니다.
 
+        products_limit 이 있으면 카테고리마다 (category_id, id) 인덱스의 범위
+        (products_boundary 이하의 id)만 읽으므로, 카테고리의 상품 수와 관계없이
+        최대 limit 개씩만 조회합니다.
+        """
+        limit = self.get_products_limit()
+        for category in categories:
+            category.product_names = []
+        if limit == 0:
+            return
+
+        conditions = Q()
+        for category in categories:
+            if not category.products_count:
+                continue
+            boundary = getattr(category, "products_boundary", None)
+            if boundary is None:
+                conditions |= Q(category_id=category.id)
+            else:
+                conditions |= Q(category_id=category.id, id__lte=boundary)
+        if not conditions:
+            return
+
+        by_id = {category.id: category for category in categories}
+        for category_id, name in (
+            Product.objects.filter(conditions)
+            .order_by("id")
+            .values_list("category_id", "name")
+        ):
+            by_id[category_id].product_names.append(name)
+
+    def get_products_limit(self) -> int | None:
+        """
+        카테고리마다 포함할 상품 이름의 최대 개수입니다. 없으면 모든 상품을 포함합니다.
+        """
+        value = self.request.query_params.get(PRODUCTS_LIMIT_PARAM)
+        if value is None:
+            return None
+        if not value.isdigit():
+            raise ValidationError(
+                {PRODUCTS_LIMIT_PARAM: ["A non-negative integer is required."]}
+            )
+        return int(value)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["products_limit"] = self.get_products_limit()
+        return context
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                PRODUCTS_LIMIT_PARAM,
+                int,
+                description="카테고리마다 포함할 상품 이름의 최대 개수 (0 이면 포함하지 않음)",
+            ),
+        ],
+    )
     def list(self, request, *args, **kwargs):
         """
         카페의 카테고리 목록을 조회합니다.
         """
-        if not self.get_queryset():
-            raise NotFound()
-        return super().list(request, *args, **kwargs)
+        self.get_cafe_id_or_404()
+        categories = list(self.filter_queryset(self.get_queryset()))
+        self.load_product_names(categories)
+        serializer = self.get_serializer(categories, many=True)
+        return Response(serializer.data)
 
     def perform_create(self, serializer):
-        serializer.save(cafe=Cafe.objects.get(uuid=self.kwargs[CAFE_URL_KEYWORD]))
+        serializer.save(cafe_id=self.get_cafe_id_or_404())
 
 
 @extend_schema(
     tags=[OPTIONGROUP_TAG],
 )
-class OptionGroupAPIViewSet(ModelViewSet):
+class OptionGroupAPIViewSet(CafeViewMixin, CatalogETagMixin, ModelViewSet):
     lookup_url_kwarg = "optiongroup_id"
 
     queryset = OptionGroup.objects.all()
     serializer_class = OptionGroupSerializer
     permission_classes = (IsCafeOwner,)
+    pagination_class = CafehereCursorPagination
+
+    def get_queryset(self):
+        """
+        URL 의 카페의 옵션 그룹만 조회합니다.
+        옵션의 수는 annotate 하고, 옵션은 한 번의 쿼리로 prefetch 합니다.
+        """
+        cafe_id = self.get_cafe_id()
+        if cafe_id is None:
+            return self.queryset.none()
+        return (
+            self.queryset.filter(cafe_id=cafe_id)
+            .annotate(options_count=Count("options"))
+            .prefetch_related(
+                Prefetch("options", queryset=Option.objects.order_by("id"))
+            )
+        )
 
     def perform_create(self, serializer):
-        serializer.save(cafe=Cafe.objects.get(uuid=self.kwargs[CAFE_URL_KEYWORD]))
+        serializer.save(cafe_id=self.get_cafe_id_or_404())
 
 
 @extend_schema(
     tags=[PRODUCT_TAG],
 )
-class ProductAPIViewSet(ModelViewSet):
+class ProductAPIViewSet(
+    CafeViewMixin, CatalogETagMixin, CatalogResponseCacheMixin, ModelViewSet
+):
     lookup_url_kwarg = "product_id"
     queryset = Product.objects.all()
     serializer_class = ProductListSerializer
@@ -78,14 +233,24 @@ class ProductAPIViewSet(ModelViewSet):
     filter_backends = (filters.DjangoFilterBackend,)
     filterset_class = ProductFilter
     pagination_class = CafehereCursorPagination
+    # ?ordering= 으로 정렬할 수 있는 필드입니다. 각 필드는 (카페, 필드, id) 인덱스를 가집니다.
+    ordering_fields = ("price", "name", "created", "expireation_date")
 
     def get_queryset(self):
-        queryset = self.queryset.filter(
-            category__cafe__owner=self.request.user,
-        )
+        cafe_id = self.get_cafe_id()
+        if cafe_id is None:
+            return self.queryset.none()
+        queryset = self.queryset.filter(cafe_id=cafe_id)
+        # 목록과 상세 응답은 카테고리 이름을 포함하므로, 함께 조회합니다.
+        if self.action in ("list", "create", "retrieve", "update", "partial_update"):
+            queryset = queryset.select_related("category")
         return queryset
 
     def get_serializer_class(self):
+        if self.action == "autocomplete":
+            return ProductAutocompleteSerializer
+        if self.action == "bulk":
+            return ProductBulkSerializer
         if self.action == "list" or self.action == "create":
             return ProductListSerializer
         elif (
@@ -95,3 +260,158 @@ class ProductAPIViewSet(ModelViewSet):
         ):
             return ProductDetailSerializer
         return super().get_serializer_class()
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("q", str, description="입력 중인 검색어"),
+            OpenApiParameter(
+                "limit",
+                int,
+                description=f"최대 결과 수 (최대 {AUTOCOMPLETE_MAX_LIMIT})",
+            ),
+        ],
+    )
+    @action(detail=False, pagination_class=None)
+    def autocomplete(self, request, *args, **kwargs):
+        """
+        입력 중인 검색어로 시작하는 카페의 상품 목록을 반환합니다.
+
+        검색어와 상품 이름을 모두 자모로 분해하여 비교하므로,
+        "아메ㄹ", "카ㅍ" 처럼 조합 중인 글자로도 검색할 수 있습니다.
+        초성으로만 이루어진 검색어("ㅇㅁ")는 초성 필드와도 비교합니다.
+        """
+        query = request.query_params.get("q", "").strip()
+        try:
+            limit = int(request.query_params.get("limit", AUTOCOMPLETE_DEFAULT_LIMIT))
+        except ValueError:
+            limit = AUTOCOMPLETE_DEFAULT_LIMIT
+        limit = max(1, min(limit, AUTOCOMPLETE_MAX_LIMIT))
+
+        if not query:
+            return Response([])
+
+        # 자주 사용되는 카페는 메모리의 인덱스로 응답합니다.
+        suggestions = suggestion_cache.suggest(
+            self.kwargs[CAFE_URL_KEYWORD], query, limit
+        )
+        if suggestions is not None:
+            return Response(suggestions)
+
+        condition = prefix_q("name_jamo", get_name_jamo(query))
+        if is_initial_consonant_query(query):
+            condition |= prefix_q("initial_consonant", query)
+        queryset = (
+            self.get_queryset()
+            .filter(condition)
+            .only("id", "name")
+            .order_by("name_jamo", "id")[:limit]
+        )
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+    @extend_schema(responses={201: ProductListSerializer(many=True)})
+    @action(detail=False, methods=["post"])
+    def bulk(self, request, *args, **kwargs):
+        """
+        여러 개의 상품을 한 번에 등록하거나 수정합니다.
+
+        id 가 있는 상품은 수정하고, 없는 상품은 새로 등록합니다.
+        하나라도 검증에 실패하면 아무것도 저장하지 않고, 상품의 순서대로 에러를 반환합니다.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        products = serializer.save()
+        return Response(
+            ProductListSerializer(products, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "type",
+                str,
+                enum=IMPORT_TYPES,
+                description="파일 형식. 없으면 파일 확장자로 추측합니다.",
+            ),
+        ],
+        request={
+            "multipart/form-data": {
+                "type": "object",
+                "properties": {"file": {"type": "string", "format": "binary"}},
+            }
+        },
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        parser_classes=(MultiPartParser,),
+    )
+    def import_products(self, request, *args, **kwargs):
+        """
+        메뉴 파일(CSV, NDJSON)의 상품들을 가져옵니다.
+
+        파일은 한 행씩 읽어 일정한 개수씩 저장하고, 카테고리와 옵션 그룹은 이름으로 찾거나 만듭니다.
+        검증에 실패한 행은 건너뛰고, 처리한 행의 수, 초당 처리한 행의 수와 행별 에러를 반환합니다.
+        """
+        file = request.FILES.get("file")
+        if file is None:
+            raise ValidationError({"file": ["No file was submitted."]})
+        import_type = request.query_params.get("type") or get_import_type(file.name)
+        if import_type not in IMPORT_TYPES:
+            raise ValidationError(
+                {"type": [f"Import type must be one of {', '.join(IMPORT_TYPES)}."]}
+            )
+
+        importer = MenuImporter(self.get_cafe_or_404())
+        result = importer.run(read_rows(file, import_type))
+        return Response(result.to_dict())
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "type", str, enum=EXPORT_TYPES, description="파일 형식 (기본값 csv)"
+            ),
+        ],
+        responses={(200, "text/csv"): bytes, (200, "application/x-ndjson"): bytes},
+    )
+    @action(detail=False, pagination_class=None)
+    def export(self, request, *args, **kwargs):
+        """
+        카페의 전체 상품을 파일(CSV, NDJSON)로 내보냅니다.
+
+        상품은 일정한 개수씩 읽어 바로 전송되므로, 상품이 많아도 첫 번째 행이 바로 도착합니다.
+        목록과 같은 필터(search, category)를 사용할 수 있습니다.
+        """
+        export_type = request.query_params.get("type", "csv")
+        if export_type not in EXPORT_TYPES:
+            raise ValidationError(
+                {"type": [f"Export type must be one of {', '.join(EXPORT_TYPES)}."]}
+            )
+
+        queryset = self.filter_queryset(self.get_queryset()).order_by("id")
+        response = StreamingHttpResponse(
+            RENDERERS[export_type](iter_product_rows(queryset)),
+            content_type=CONTENT_TYPES[export_type],
+        )
+        filename = f"products-{self.kwargs[CAFE_URL_KEYWORD]}.{export_type}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+@extend_schema(
+    tags=[MENU_TAG],
+    responses=OpenApiTypes.OBJECT,
+)
+class MenuAPIView(CafeViewMixin, CatalogETagMixin, APIView):
+    permission_classes = (IsCafeOwner,)
+
+    def get(self, request, *args, **kwargs):
+        """
+        카페의 전체 메뉴(카테고리 -> 상품 -> 옵션 그룹 -> 옵션)를 한 번에 조회합니다.
+
+        응답의 catalog_version 과 ETag 는 메뉴가 바뀔 때마다 바뀌므로,
+        If-None-Match 로 ETag 를 보내면 바뀌지 않은 메뉴는 304 응답을 받습니다.
+        """
+        return Response(build_menu(self.get_cafe_or_404(), self.catalog_version))
@@ -0,0 +1,46 @@
+"""
+성능 측정 스크립트 모음입니다.
+
+각 스크립트는 테스트용 데이터베이스를 만든 뒤 측정을 수행하며,
+프로젝트 루트에서 아래와 같이 실행합니다.
+
+    python -m benchmarks.search
+"""
+import os
+import time
+from contextlib import contextmanager
+
+
+def setup_django(test_database_name: str = None):
+    """
+    Django 를 초기화하고, 측정에 사용할 테스트 데이터베이스를 생성합니다.
+    test_database_name 이 주어지면 그 이름으로 테스트 데이터베이스를 만듭니다.
+    SQLite 의 메모리 데이터베이스는 여러 스레드가 동시에 쓸 수 없으므로,
+    동시성을 측정할 때에는 파일을 사용합니다.
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings.development")
+
+    import django
+
+    django.setup()
+
+    from django.db import connection
+
+    if test_database_name:
+        connection.settings_dict["TEST"]["NAME"] = test_database_name
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+
+@contextmanager
+def timer(label: str, count: int = 1):
+    """
+    블록의 실행 시간을 측정하여 출력합니다.
+    count 가 주어지면 1회당 평균 시간도 함께 출력합니다.
+    """
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<40} total {elapsed * 1000:10.2f} ms"
+        f"  per op {elapsed / count * 1000:8.3f} ms"
+    )
@@ -0,0 +1,99 @@
+"""
+API 요청의 middleware, 인증 구성에 따른 응답 시간 측정 스크립트입니다.
+
+모든 요청이 Django 의 middleware 를 거치고 JWT, Basic, 세션 인증을 차례로 시도하던
+이전 구성(before)과, API 요청은 세션, CSRF 등의 middleware 를 건너뛰고 JWT 로만
+인증하는 현재 구성(after)의 응답 시간을 비교합니다.
+Basic 인증 헤더를 보낸 요청은 이전 구성에서 비밀번호를 해싱합니다.
+
+    python -m benchmarks.api --requests 2000
+"""
+import argparse
+import logging
+from unittest import mock
+
+from benchmarks import setup_django, timer
+
+FULL_STACK_MIDDLEWARE = {
+    "core.http.middleware.SessionMiddleware": (
+        "django.contrib.sessions.middleware.SessionMiddleware"
+    ),
+    "core.http.middleware.CsrfViewMiddleware": (
+        "django.middleware.csrf.CsrfViewMiddleware"
+    ),
+    "core.http.middleware.AuthenticationMiddleware": (
+        "django.contrib.auth.middleware.AuthenticationMiddleware"
+    ),
+    "core.http.middleware.MessageMiddleware": (
+        "django.contrib.messages.middleware.MessageMiddleware"
+    ),
+    "core.http.middleware.XFrameOptionsMiddleware": (
+        "django.middleware.clickjacking.XFrameOptionsMiddleware"
+    ),
+}
+
+FULL_STACK_AUTHENTICATION_CLASSES = [
+    "apps.authentication.authentication.StatelessJWTAuthentication",
+    "rest_framework.authentication.BasicAuthentication",
+    "rest_framework.authentication.SessionAuthentication",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.conf import settings
+    from django.test.utils import override_settings, setup_test_environment
+    from django.urls import reverse
+    from django.utils.module_loading import import_string
+    from rest_framework.test import APIClient
+    from rest_framework.views import APIView
+
+    from apps.authentication.models import User
+    from apps.authentication.tokens import CafehereRefreshToken
+    from apps.cafes.models import Cafe
+
+    setup_test_environment()
+    # 401 응답마다 출력되는 경고를 숨깁니다.
+    logging.getLogger("django.request").setLevel(logging.ERROR)
+
+    owner = User.objects.create_user(mobile="+82-1000000000", password="password")
+    Cafe.objects.create(name="Benchmark Cafe", owner=owner)
+    token = CafehereRefreshToken.for_user(owner).access_token
+    url = reverse("cafe-list")
+
+    profiles = {
+        "before": (
+            [FULL_STACK_MIDDLEWARE.get(path, path) for path in settings.MIDDLEWARE],
+            [import_string(path) for path in FULL_STACK_AUTHENTICATION_CLASSES],
+        ),
+        "after": (settings.MIDDLEWARE, APIView.authentication_classes),
+    }
+    credentials = {
+        "jwt": f"Bearer {token}",
+        "basic": "Basic KzgyLTEwMDAwMDAwMDA6d3Jvbmc=",
+    }
+
+    for profile, (middleware, authentication_classes) in profiles.items():
+        with override_settings(MIDDLEWARE=middleware), mock.patch.object(
+            APIView, "authentication_classes", authentication_classes
+        ):
+            for name, authorization in credentials.items():
+                # 클라이언트는 첫 요청에서 MIDDLEWARE 를 읽으므로 구성마다 새로 만듭니다.
+                # debug toolbar 가 요청을 처리하지 않도록 INTERNAL_IPS 가 아닌 주소를 사용합니다.
+                client = APIClient(REMOTE_ADDR="10.0.0.1")
+                client.credentials(HTTP_AUTHORIZATION=authorization)
+                client.get(url)
+
+                requests = args.requests if name == "jwt" else args.requests // 10
+                with timer(f"{profile} ({name})", requests):
+                    for _ in range(requests):
+                        client.get(url)
+
+
+if __name__ == "__main__":
+    main()
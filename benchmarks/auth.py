@@ -0,0 +1,65 @@
+"""
+JWT 인증 성능 측정 스크립트입니다.
+
+요청마다 유저를 조회하는 기본 JWTAuthentication 과, 토큰의 claim 으로 유저를 만드는
+StatelessJWTAuthentication 의 인증된 요청 처리량과 요청당 쿼리 수를 비교합니다.
+
+    python -m benchmarks.auth --requests 2000
+"""
+import argparse
+from unittest import mock
+
+from benchmarks import setup_django, timer
+
+AUTHENTICATION_CLASSES = {
+    "JWTAuthentication": "rest_framework_simplejwt.authentication.JWTAuthentication",
+    "StatelessJWTAuthentication": (
+        "apps.authentication.authentication.StatelessJWTAuthentication"
+    ),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext, setup_test_environment
+    from django.urls import reverse
+    from django.utils.module_loading import import_string
+    from rest_framework.test import APIClient
+    from rest_framework.views import APIView
+
+    from apps.authentication.models import User
+    from apps.authentication.tokens import CafehereRefreshToken
+    from apps.cafes.models import Cafe
+
+    setup_test_environment()
+
+    owner = User.objects.create_user(mobile="+82-1000000000", password="password")
+    Cafe.objects.create(name="Benchmark Cafe", owner=owner)
+    token = CafehereRefreshToken.for_user(owner).access_token
+    url = reverse("cafe-list")
+
+    # debug toolbar 가 요청을 처리하지 않도록 INTERNAL_IPS 가 아닌 주소를 사용합니다.
+    client = APIClient(REMOTE_ADDR="10.0.0.1")
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    for name, path in AUTHENTICATION_CLASSES.items():
+        with mock.patch.object(
+            APIView, "authentication_classes", [import_string(path)]
+        ):
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url)
+            assert response.status_code == 200, response.content
+
+            with timer(f"{name} ({len(context)} queries/request)", args.requests):
+                for _ in range(args.requests):
+                    client.get(url)
+
+
+if __name__ == "__main__":
+    main()
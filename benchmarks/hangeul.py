@@ -0,0 +1,95 @@
+"""
+초성 변환 성능 측정 스크립트입니다.
+
+문자마다 초성을 계산하던 기존 구현과, 변환 테이블을 사용하는 구현의
+초당 처리 가능한 이름의 수를 비교합니다.
+
+    python -m benchmarks.hangeul --names 100000
+"""
+import argparse
+import random
+import time
+
+from core.utils.hangeul import get_initial_consonant, get_initial_consonants
+
+
+def legacy_get_initial_consonant(input_str):
+    """
+    변환 테이블을 사용하기 전의 구현입니다.
+    """
+    initial_consonants = [
+        "ㄱ",
+        "ㄲ",
+        "ㄴ",
+        "ㄷ",
+        "ㄸ",
+        "ㄹ",
+        "ㅁ",
+        "ㅂ",
+        "ㅃ",
+        "ㅅ",
+        "ㅆ",
+        "ㅇ",
+        "ㅈ",
+        "ㅉ",
+        "ㅊ",
+        "ㅋ",
+        "ㅌ",
+        "ㅍ",
+        "ㅎ",
+    ]
+
+    result = ""
+
+    for char in input_str:
+        if char == " " or ("가" <= char <= "힣" and len(char) == 1):
+            if "가" <= char <= "힣":
+                char_code = ord(char) - ord("가")
+                initial = initial_consonants[char_code // 588]
+                result += initial
+            else:
+                result += char
+        else:
+            result += char
+
+    return result
+
+
+def measure(label, function, names):
+    start = time.perf_counter()
+    result = function(names)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<30} {len(names) / elapsed:>14,.0f} names/s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--names", type=int, default=100000)
+    args = parser.parse_args()
+
+    random.seed(0)
+    names = [
+        "".join(
+            chr(random.randint(0xAC00, 0xD7A3)) if random.random() < 0.9 else " "
+            for _ in range(random.randint(2, 15))
+        )
+        for _ in range(args.names)
+    ]
+
+    expected = measure(
+        "legacy (per character)",
+        lambda names: [legacy_get_initial_consonant(name) for name in names],
+        names,
+    )
+    single = measure(
+        "translate table",
+        lambda names: [get_initial_consonant(name) for name in names],
+        names,
+    )
+    batch = measure("translate table (batch)", get_initial_consonants, names)
+    assert expected == single == batch
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+토큰 갱신(Refresh Token Rotation) 응답 시간 측정 스크립트입니다.
+
+블랙리스트(BlacklistedToken)의 행 수를 늘려 가며, 데이터베이스에서 블랙리스트를 확인하는
+simplejwt 의 기본 구현(before)과 Bloom filter 를 먼저 거치는 구현(after)을 비교합니다.
+Bloom filter 는 공유 캐시가 필요하므로, 임시 디렉터리의 파일 캐시를 사용합니다.
+
+    python -m benchmarks.refresh --rows 0 10000 100000 --requests 500
+"""
+import argparse
+import logging
+import tempfile
+import uuid
+from datetime import timedelta
+from unittest import mock
+
+from benchmarks import setup_django, timer
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[0, 10000, 100000])
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.test.utils import override_settings, setup_test_environment
+    from django.urls import reverse
+    from django.utils import timezone
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.token_blacklist.models import (
+        BlacklistedToken,
+        OutstandingToken,
+    )
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from apps.authentication.blacklist import blacklist_filter
+    from apps.authentication.models import User
+    from apps.authentication.tokens import CafehereRefreshToken
+
+    setup_test_environment()
+    cache_dir = tempfile.TemporaryDirectory()
+    override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": cache_dir.name,
+            }
+        }
+    ).enable()
+    logging.getLogger("django.request").setLevel(logging.ERROR)
+
+    user = User.objects.create_user(mobile="+82-1000000000", password="password")
+    url = reverse("refresh")
+    # debug toolbar 가 요청을 처리하지 않도록 INTERNAL_IPS 가 아닌 주소를 사용합니다.
+    client = APIClient(REMOTE_ADDR="10.0.0.1")
+
+    def add_blacklisted_rows(count):
+        expires_at = timezone.now() + timedelta(days=1)
+        for start in range(0, count, 5000):
+            jtis = [uuid.uuid4().hex for _ in range(min(5000, count - start))]
+            OutstandingToken.objects.bulk_create(
+                OutstandingToken(user=user, jti=jti, token="", expires_at=expires_at)
+                for jti in jtis
+            )
+            BlacklistedToken.objects.bulk_create(
+                BlacklistedToken(token_id=token_id)
+                for token_id in OutstandingToken.objects.filter(
+                    jti__in=jtis
+                ).values_list("id", flat=True)
+            )
+
+    checks = {
+        "before": RefreshToken.check_blacklist,
+        "after": CafehereRefreshToken.check_blacklist,
+    }
+
+    total = 0
+    for rows in sorted(args.rows):
+        add_blacklisted_rows(rows - total)
+        total = rows
+        for name, check_blacklist in checks.items():
+            blacklist_filter.clear()
+            with mock.patch.object(
+                CafehereRefreshToken, "check_blacklist", check_blacklist
+            ):
+                token = str(CafehereRefreshToken.for_user(user))
+                # Bloom filter 는 첫 확인에서 만들어지므로 측정에서 제외합니다.
+                token = client.post(url, {"refresh": token}).data["data"]["refresh"]
+                with timer(f"{name} ({rows} blacklisted)", args.requests):
+                    for _ in range(args.requests):
+                        response = client.post(url, {"refresh": token})
+                        token = response.data["data"]["refresh"]
+
+
+if __name__ == "__main__":
+    main()
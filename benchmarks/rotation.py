@@ -0,0 +1,106 @@
+"""
+동시에 토큰을 갱신할 때의 처리량 측정 스크립트입니다.
+
+여러 스레드가 각자의 Refresh Token 으로 토큰 갱신을 반복하며, 사용된 토큰을 요청마다
+저장하는 구성(sync)과 모아서 저장하는 구성(write-behind)의 처리량을 비교합니다.
+write-behind 는 공유 캐시가 필요하므로, 임시 디렉터리의 파일 캐시를 사용합니다.
+
+    python -m benchmarks.rotation --threads 8 --requests 200
+
+SQLite 는 한 번에 하나의 쓰기만 허용하므로, 쓰기를 기다리는 시간(--timeout)을 둔
+파일 데이터베이스를 사용합니다.
+"""
+import argparse
+import logging
+import tempfile
+import threading
+import time
+
+from benchmarks import setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="스레드당 요청 수")
+    parser.add_argument("--timeout", type=float, default=30)
+    args = parser.parse_args()
+
+    setup_django(test_database_name="benchmark_rotation.sqlite3")
+
+    from django.conf import settings
+    from django.db import connections
+    from django.test.utils import override_settings, setup_test_environment
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+    from apps.authentication.models import User
+    from apps.authentication.rotation import rotation_writer
+    from apps.authentication.tokens import CafehereRefreshToken
+
+    connections["default"].settings_dict["OPTIONS"]["timeout"] = args.timeout
+    setup_test_environment()
+    cache_dir = tempfile.TemporaryDirectory()
+    override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": cache_dir.name,
+            }
+        }
+    ).enable()
+    logging.getLogger("django.request").setLevel(logging.ERROR)
+
+    user = User.objects.create_user(mobile="+82-1000000000", password="password")
+    url = reverse("refresh")
+
+    def run(token, failures):
+        # debug toolbar 가 요청을 처리하지 않도록 INTERNAL_IPS 가 아닌 주소를 사용합니다.
+        client = APIClient(REMOTE_ADDR="10.0.0.1")
+        try:
+            for _ in range(args.requests):
+                response = client.post(url, {"refresh": token})
+                if response.status_code != 200:
+                    failures.append(response.status_code)
+                    return
+                token = response.data["data"]["refresh"]
+        except Exception as exception:
+            failures.append(exception)
+        finally:
+            connections.close_all()
+
+    modes = {"sync": False, "write-behind": True}
+    for name, write_behind in modes.items():
+        tokens = [str(CafehereRefreshToken.for_user(user)) for _ in range(args.threads)]
+        rows = BlacklistedToken.objects.count()
+        failures = []
+        with override_settings(
+            TOKEN_ROTATION={**settings.TOKEN_ROTATION, "WRITE_BEHIND": write_behind}
+        ):
+            threads = [
+                threading.Thread(target=run, args=(token, failures)) for token in tokens
+            ]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            rotation_writer.flush()
+            elapsed = time.perf_counter() - start
+
+        total = args.threads * args.requests
+        written = BlacklistedToken.objects.count() - rows
+        print(
+            f"{name:<14} {total} refreshes in {elapsed * 1000:10.2f} ms"
+            f"  {total / elapsed:8.1f} req/s"
+            f"  ({written} blacklisted, {len(failures)} failed threads)"
+        )
+
+    connections["default"].creation.destroy_test_db(
+        settings.DATABASES["default"]["NAME"], verbosity=0
+    )
+
+
+if __name__ == "__main__":
+    main()
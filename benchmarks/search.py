@@ -0,0 +1,78 @@
+"""
+상품 검색 성능 측정 스크립트입니다.
+
+LIKE 검색과 검색 인덱스를 사용한 검색의 응답 시간을 비교합니다.
+
+    python -m benchmarks.search --products 20000 --repeat 50
+"""
+import argparse
+import random
+
+from benchmarks import setup_django, timer
+
+SYLLABLES = "가나다라마바사아자차카타파하커피라떼모카바닐라초코녹차케이크에이드스무디"
+QUERIES = ["라떼", "ㄹㄸ", "바닐라", "ㅊㅋ", "에이드", "없는상품"]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--products", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.utils import timezone
+
+    from apps.authentication.models import User
+    from apps.cafes.models import Cafe
+    from apps.products.models import Category, Product
+    from apps.products.search import filter_by_like, get_search_backend
+    from core.utils.hangeul import get_initial_consonant
+
+    owner = User.objects.create_user(mobile="+82-1000000000", password="password")
+    cafe = Cafe.objects.create(name="Benchmark Cafe", owner=owner)
+    category = Category.objects.create(name="Menu", cafe=cafe)
+
+    random.seed(0)
+    now = timezone.now()
+    names = {
+        "".join(random.choices(SYLLABLES, k=random.randint(3, 10)))
+        for _ in range(args.products)
+    }
+    products = Product.objects.bulk_create(
+        (
+            Product(
+                name=name,
+                description=name,
+                cost=1000,
+                price=2000,
+                expireation_date=now,
+                initial_consonant=get_initial_consonant(name),
+                category=category,
+                cafe=cafe,
+            )
+            for name in names
+        ),
+        batch_size=1000,
+    )
+    backend = get_search_backend()
+    backend.index(Product.objects.all())
+    print(f"{len(products)} products, backend: {type(backend).__name__}\n")
+
+    queryset = Product.objects.filter(cafe__owner=owner)
+    for query in QUERIES:
+        like_count = len(filter_by_like(queryset, query))
+        index_count = len(backend.filter(queryset, query))
+        assert like_count == index_count, query
+
+        with timer(f"LIKE   {query!r} ({like_count} rows)", args.repeat):
+            for _ in range(args.repeat):
+                list(filter_by_like(queryset, query))
+        with timer(f"INDEX  {query!r} ({index_count} rows)", args.repeat):
+            for _ in range(args.repeat):
+                list(backend.filter(queryset, query))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+API 요청(API_PATH_PREFIX 로 시작하는 경로)에서는 건너뛰는 middleware 입니다.
+
+API 는 JWT 로만 인증하고 JSON 으로만 응답하므로 세션, CSRF, 메시지, 세션 기반의
+유저와 X-Frame-Options 헤더가 필요하지 않습니다. admin 등 나머지 경로는 Django 의
+middleware 를 그대로 거칩니다.
+
+admin 의 system check 는 Django middleware 의 하위 클래스도 허용하므로,
+MIDDLEWARE 에서 Django 의 middleware 대신 이 모듈의 middleware 를 사용합니다.
+"""
+from django.conf import settings
+from django.contrib.auth import middleware as auth_middleware
+from django.contrib.messages import middleware as messages_middleware
+from django.contrib.sessions import middleware as sessions_middleware
+from django.middleware import clickjacking, csrf
+
+
+def is_api_request(request) -> bool:
+    return request.path_info.startswith(settings.API_PATH_PREFIX)
+
+
+class FullStackOnlyMiddlewareMixin:
+    """
+    API 요청은 처리하지 않고 다음 middleware 로 넘기는 mixin 입니다.
+    """
+
+    def __call__(self, request):
+        if is_api_request(request):
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class SessionMiddleware(
+    FullStackOnlyMiddlewareMixin, sessions_middleware.SessionMiddleware
+):
+    pass
+
+
+class CsrfViewMiddleware(FullStackOnlyMiddlewareMixin, csrf.CsrfViewMiddleware):
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        # process_view 는 __call__ 과 별도로 handler 가 호출합니다.
+        if is_api_request(request):
+            return None
+        return super().process_view(request, callback, callback_args, callback_kwargs)
+
+
+class AuthenticationMiddleware(
+    FullStackOnlyMiddlewareMixin, auth_middleware.AuthenticationMiddleware
+):
+    pass
+
+
+class MessageMiddleware(
+    FullStackOnlyMiddlewareMixin, messages_middleware.MessageMiddleware
+):
+    pass
+
+
+class XFrameOptionsMiddleware(
+    FullStackOnlyMiddlewareMixin, clickjacking.XFrameOptionsMiddleware
+):
+    pass
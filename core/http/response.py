@@ -31,6 +31,10 @@ class CafehereRenderer(JSONRenderer):
     ) -> bytes:
         response_context: Response = renderer_context["response"]
 
+        if response_context.status_code == 304:
+            # 304 응답은 본문을 가질 수 없습니다.
+            return b""
+
         if response_context.status_code == 204:
             return super().render(
                 data,
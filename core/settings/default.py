@@ -27,14 +27,17 @@ INSTALLED_APPS = [
     "apps.products",
 ]
 
+# API_PATH_PREFIX 로 시작하는 API 요청은 core.http.middleware 의 middleware 를 건너뜁니다.
+API_PATH_PREFIX = "/api/"
+
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
+    "core.http.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
-    "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
-    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.http.middleware.CsrfViewMiddleware",
+    "core.http.middleware.AuthenticationMiddleware",
+    "core.http.middleware.MessageMiddleware",
+    "core.http.middleware.XFrameOptionsMiddleware",
 ]
 
 ROOT_URLCONF = "core.urls"
@@ -97,10 +100,9 @@ REST_FRAMEWORK = {
         "core.http.response.CafehereRenderer",
         "rest_framework.renderers.BrowsableAPIRenderer",
     ],
+    # API 는 JWT 로만 인증합니다. 세션과 Basic 인증은 사용하지 않습니다.
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-        "rest_framework.authentication.BasicAuthentication",
-        "rest_framework.authentication.SessionAuthentication",
+        "apps.authentication.authentication.StatelessJWTAuthentication",
     ),
     "DEFAULT_FILTER_BACKENDS": ("django_filters.rest_framework.DjangoFilterBackend",),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
@@ -115,6 +117,62 @@ SIMPLE_JWT = {
     "BLACKLIST_AFTER_ROTATION": True,
 }
 
+# 여러 worker 프로세스(gunicorn -w 4)와 서버들이 함께 사용하는 캐시입니다.
+# 카페 owner 캐시의 무효화와 토큰 블랙리스트의 동기화는 다른 프로세스에 전달되어야 하므로,
+# 프로세스 메모리 캐시(LocMemCache)를 사용하면 안 됩니다. (core.utils.cache.is_shared_cache)
+# CACHE_LOCATION 은 Memcached 서버의 주소입니다. (docker-compose.yml 의 memcached)
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.memcached.PyMemcacheCache",
+        "LOCATION": os.environ.get("CACHE_LOCATION") or "memcached:11211",
+    }
+}
+
+# 상품 자동완성에 사용되는, 프로세스 메모리 안의 카페별 인덱스 설정입니다.
+PRODUCT_SUGGESTION_CACHE = {
+    "MAX_BYTES": 32 * 1024 * 1024,
+    "TTL": 60,
+}
+
+# 카탈로그 목록 응답 캐시 설정입니다. ALIAS 는 CACHES 의 이름입니다.
+# 캐시 키에 카탈로그 버전이 포함되므로, TIMEOUT 은 오래된 항목이 사라지는 시간입니다.
+CATALOG_RESPONSE_CACHE = {
+    "ALIAS": "default",
+    "TIMEOUT": 60,
+}
+
+# 권한 확인에 사용되는 카페 uuid -> (카페 id, owner id) 캐시 설정입니다.
+# 프로세스 메모리에 MAX_ENTRIES 개까지 TTL 초 동안 두고, CACHES 의 ALIAS 에 TIMEOUT 초 동안 둡니다.
+# ALIAS 가 프로세스 메모리 캐시라면 사용하지 않으므로, 다른 프로세스의 변경은 TTL 초 안에 반영됩니다.
+CAFE_OWNERSHIP_CACHE = {
+    "ALIAS": "default",
+    "MAX_ENTRIES": 10000,
+    "TTL": 60,
+    "TIMEOUT": 60 * 60,
+}
+
+# Refresh Token 블랙리스트 확인 앞에 두는 Bloom filter 설정입니다.
+# CAPACITY 개의 jti 를 ERROR_RATE 의 오탐률로 담고, CACHES 의 ALIAS 로 다른 프로세스와 동기화합니다.
+# 버전이 바뀌거나 TTL 초가 지나면 새로 추가된 행과, 늦게 커밋될 수 있는 빈 id(최대 MAX_GAPS 개)를 읽습니다.
+# ALIAS 는 모든 프로세스가 함께 사용하는 캐시여야 하며, 프로세스 메모리 캐시라면 항상 데이터베이스에서 확인합니다.
+TOKEN_BLACKLIST_FILTER = {
+    "ALIAS": "default",
+    "CAPACITY": 1_000_000,
+    "ERROR_RATE": 0.001,
+    "TTL": 60,
+    "MAX_GAPS": 1000,
+}
+
+# 토큰 갱신의 블랙리스트 쓰기 설정입니다. (apps.authentication.rotation)
+# WRITE_BEHIND 가 켜져 있으면 사용된 토큰을 메모리에 기록하고, FLUSH_INTERVAL 초마다
+# 또는 BATCH_SIZE 개가 모이면 한 번에 저장합니다. 저장되기 전까지는 다른 프로세스에서 다시 사용될 수 있으며,
+# TOKEN_BLACKLIST_FILTER 의 ALIAS 가 프로세스 메모리 캐시라면 켜져 있더라도 바로 저장합니다.
+TOKEN_ROTATION = {
+    "WRITE_BEHIND": False,
+    "BATCH_SIZE": 500,
+    "FLUSH_INTERVAL": 0.5,
+}
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Cafehere API",
     "DESCRIPTION": "Your CAFE is right HERE!",
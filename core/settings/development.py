@@ -1,3 +1,5 @@
+import os
+
 from .default import *
 
 DEBUG = True
@@ -24,6 +26,25 @@ DATABASES = {
     }
 }
 
+# 개발 서버와 테스트는 하나의 프로세스로 실행되므로 프로세스 메모리 캐시를 사용합니다.
+# 공유 캐시가 필요한 기능은 프로세스 메모리 캐시에서 데이터베이스를 사용하도록 바뀝니다.
+# 개발 환경에서 여러 프로세스로 실행해 볼 때는 FILE_CACHE_LOCATION 에 경로를 지정하여
+# 파일 캐시를 함께 사용할 수 있습니다. 파일 캐시는 저장할 때마다 디렉터리의 파일 수를 세어
+# 오래된 항목을 지우므로(cull), 운영 환경에서는 Memcached 를 사용합니다.
+if os.environ.get("FILE_CACHE_LOCATION"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.environ["FILE_CACHE_LOCATION"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
 SEE_SQL = False
 
 if SEE_SQL:
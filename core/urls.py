@@ -14,8 +14,6 @@ urlpatterns = [
     path("api/v1/", include("apps.authentication.urls"), name="authentication"),
     path("api/v1/cafes/", include("apps.cafes.urls"), name="cafes"),
     path("api/v1/cafes/", include("apps.products.urls"), name="products"),
-    # drf auth
-    path("api-auth/", include("rest_framework.urls")),
     # api documentation
     path(
         "docs/",
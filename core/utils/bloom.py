@@ -0,0 +1,45 @@
+import hashlib
+import math
+
+
+class BloomFilter:
+    """
+    문자열 집합의 Bloom filter 입니다.
+
+    `value in bloom` 이 False 이면 value 는 집합에 없습니다.
+    True 이면 집합에 있을 수 있으며, 추가된 값이 capacity 개 이하라면
+    없는 값이 True 가 될 확률은 error_rate 이하입니다.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray(math.ceil(self.num_bits / 8))
+
+    def _positions(self, value: str):
+        # 두 개의 64비트 해시로 num_hashes 개의 위치를 만듭니다. (double hashing)
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for index in range(self.num_hashes):
+            yield (first + index * second) % self.num_bits
+
+    def add(self, value: str):
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(value)
+        )
+
+    @property
+    def saturated(self) -> bool:
+        return self.count > self.capacity
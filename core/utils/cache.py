@@ -0,0 +1,16 @@
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+# 프로세스마다 따로 저장되는 캐시 backend 입니다.
+PROCESS_LOCAL_CACHE_BACKENDS = (LocMemCache, DummyCache)
+
+
+def is_shared_cache(alias: str) -> bool:
+    """
+    CACHES 의 alias 가 여러 프로세스(worker)가 함께 사용하는 캐시인지 반환합니다.
+
+    프로세스 메모리 캐시에 저장한 값은 다른 프로세스에서 읽을 수 없으므로,
+    다른 프로세스와 값을 나누거나 변경을 알리는 데 사용할 수 없습니다.
+    """
+    return not isinstance(caches[alias], PROCESS_LOCAL_CACHE_BACKENDS)
@@ -1,40 +1,286 @@
+"""
+한글 처리 유틸리티입니다.
+
+한글 음절(가 ~ 힣)은 아래와 같이 초성, 중성, 종성의 조합으로 계산됩니다.
+
+    음절 = 0xAC00 + (초성 * 21 + 중성) * 28 + 종성
+
+모든 변환은 미리 계산된 변환 테이블과 `str.translate` 로 처리되므로,
+상품 저장이나 대량 처리 시 문자마다 계산을 반복하지 않습니다.
+"""
+from typing import Iterable
+
+SYLLABLE_BASE = 0xAC00
+SYLLABLE_COUNT = 11172
+JUNGSEONG_COUNT = 21
+JONGSEONG_COUNT = 28
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = (
+    "",
+    "ㄱ",
+    "ㄲ",
+    "ㄳ",
+    "ㄴ",
+    "ㄵ",
+    "ㄶ",
+    "ㄷ",
+    "ㄹ",
+    "ㄺ",
+    "ㄻ",
+    "ㄼ",
+    "ㄽ",
+    "ㄾ",
+    "ㄿ",
+    "ㅀ",
+    "ㅁ",
+    "ㅂ",
+    "ㅄ",
+    "ㅅ",
+    "ㅆ",
+    "ㅇ",
+    "ㅈ",
+    "ㅊ",
+    "ㅋ",
+    "ㅌ",
+    "ㅍ",
+    "ㅎ",
+)
+
+# 두 개의 자모가 합쳐져 만들어지는 겹모음과 겹받침입니다.
+COMPOUND_VOWELS = {
+    ("ㅗ", "ㅏ"): "ㅘ",
+    ("ㅗ", "ㅐ"): "ㅙ",
+    ("ㅗ", "ㅣ"): "ㅚ",
+    ("ㅜ", "ㅓ"): "ㅝ",
+    ("ㅜ", "ㅔ"): "ㅞ",
+    ("ㅜ", "ㅣ"): "ㅟ",
+    ("ㅡ", "ㅣ"): "ㅢ",
+}
+COMPOUND_FINALS = {
+    ("ㄱ", "ㅅ"): "ㄳ",
+    ("ㄴ", "ㅈ"): "ㄵ",
+    ("ㄴ", "ㅎ"): "ㄶ",
+    ("ㄹ", "ㄱ"): "ㄺ",
+    ("ㄹ", "ㅁ"): "ㄻ",
+    ("ㄹ", "ㅂ"): "ㄼ",
+    ("ㄹ", "ㅅ"): "ㄽ",
+    ("ㄹ", "ㅌ"): "ㄾ",
+    ("ㄹ", "ㅍ"): "ㄿ",
+    ("ㄹ", "ㅎ"): "ㅀ",
+    ("ㅂ", "ㅅ"): "ㅄ",
+}
+COMPOUND_SPLITS = {
+    compound: "".join(pair)
+    for compounds in (COMPOUND_VOWELS, COMPOUND_FINALS)
+    for pair, compound in compounds.items()
+}
+
+# 두벌식 자판에서 각 자모를 입력하는 QWERTY 키입니다.
+KEYBOARD_LAYOUT = {
+    "ㅂ": "q",
+    "ㅈ": "w",
+    "ㄷ": "e",
+    "ㄱ": "r",
+    "ㅅ": "t",
+    "ㅛ": "y",
+    "ㅕ": "u",
+    "ㅑ": "i",
+    "ㅐ": "o",
+    "ㅔ": "p",
+    "ㅁ": "a",
+    "ㄴ": "s",
+    "ㅇ": "d",
+    "ㄹ": "f",
+    "ㅎ": "g",
+    "ㅗ": "h",
+    "ㅓ": "j",
+    "ㅏ": "k",
+    "ㅣ": "l",
+    "ㅋ": "z",
+    "ㅌ": "x",
+    "ㅊ": "c",
+    "ㅍ": "v",
+    "ㅠ": "b",
+    "ㅜ": "n",
+    "ㅡ": "m",
+    # Shift 키와 함께 입력하는 자모입니다.
+    "ㅃ": "Q",
+    "ㅉ": "W",
+    "ㄸ": "E",
+    "ㄲ": "R",
+    "ㅆ": "T",
+    "ㅒ": "O",
+    "ㅖ": "P",
+}
+
+_CHOSEONG_INDEX = {char: index for index, char in enumerate(CHOSEONG)}
+_JUNGSEONG_INDEX = {char: index for index, char in enumerate(JUNGSEONG)}
+_JONGSEONG_INDEX = {char: index for index, char in enumerate(JONGSEONG) if char}
+
+
+def _split_compound(jamo: str) -> str:
+    return "".join(COMPOUND_SPLITS.get(char, char) for char in jamo)
+
+
+def _to_keys(jamo: str) -> str:
+    return "".join(KEYBOARD_LAYOUT.get(char, char) for char in jamo)
+
+
+def _build_tables() -> tuple[dict, dict, dict, dict, dict]:
+    initial_consonant_table = {}
+    jamo_table = {}
+    split_jamo_table = {}
+    keystroke_table = {}
+    for offset in range(SYLLABLE_COUNT):
+        codepoint = SYLLABLE_BASE + offset
+        choseong, rest = divmod(offset, JUNGSEONG_COUNT * JONGSEONG_COUNT)
+        jungseong, jongseong = divmod(rest, JONGSEONG_COUNT)
+        jamo = CHOSEONG[choseong] + JUNGSEONG[jungseong] + JONGSEONG[jongseong]
+
+        initial_consonant_table[codepoint] = CHOSEONG[choseong]
+        jamo_table[codepoint] = jamo
+        split_jamo_table[codepoint] = _split_compound(jamo)
+        keystroke_table[codepoint] = _to_keys(split_jamo_table[codepoint])
+
+    # 단독으로 입력된 겹모음, 겹받침도 분리합니다.
+    for compound, split in COMPOUND_SPLITS.items():
+        split_jamo_table[ord(compound)] = split
+        keystroke_table[ord(compound)] = _to_keys(split)
+    for jamo, key in KEYBOARD_LAYOUT.items():
+        keystroke_table[ord(jamo)] = key
+
+    # 영문 자판 상태로 입력된 키를 자모로 되돌립니다.
+    # Shift 를 눌러도 다른 자모가 없는 키는 소문자와 같은 자모로 입력됩니다.
+    jamo_by_key = {}
+    for jamo, key in KEYBOARD_LAYOUT.items():
+        jamo_by_key[ord(key)] = jamo
+        jamo_by_key.setdefault(ord(key.upper()), jamo)
+
+    return (
+        initial_consonant_table,
+        jamo_table,
+        split_jamo_table,
+        keystroke_table,
+        jamo_by_key,
+    )
+
+
+(
+    _INITIAL_CONSONANT_TABLE,
+    _JAMO_TABLE,
+    _SPLIT_JAMO_TABLE,
+    _KEYSTROKE_TABLE,
+    _JAMO_BY_KEY_TABLE,
+) = _build_tables()
+
+
 def get_initial_consonant(input_str):
     """
     한글 문자열을 받아서 초성으로 변환하여 반환합니다.
+    한글 음절이 아닌 문자는 그대로 반환합니다.
     """
-    initial_consonants = [
-        "ㄱ",
-        "ㄲ",
-        "ㄴ",
-        "ㄷ",
-        "ㄸ",
-        "ㄹ",
-        "ㅁ",
-        "ㅂ",
-        "ㅃ",
-        "ㅅ",
-        "ㅆ",
-        "ㅇ",
-        "ㅈ",
-        "ㅉ",
-        "ㅊ",
-        "ㅋ",
-        "ㅌ",
-        "ㅍ",
-        "ㅎ",
-    ]
-
-    result = ""
-
-    for char in input_str:
-        if char == " " or ("가" <= char <= "힣" and len(char) == 1):
-            if "가" <= char <= "힣":
-                char_code = ord(char) - ord("가")
-                initial = initial_consonants[char_code // 588]
-                result += initial
+    return input_str.translate(_INITIAL_CONSONANT_TABLE)
+
+
+def get_initial_consonants(input_strs: Iterable[str]) -> list[str]:
+    """
+    여러 개의 문자열을 한 번에 초성으로 변환합니다.
+    상품 가져오기 등 대량의 이름을 처리할 때 사용합니다.
+    """
+    table = _INITIAL_CONSONANT_TABLE
+    return [input_str.translate(table) for input_str in input_strs]
+
+
+def decompose(input_str: str, split_compound: bool = False) -> str:
+    """
+    한글 음절을 초성, 중성, 종성의 자모로 분해합니다. ("값" -> "ㄱㅏㅄ")
+
+    split_compound 가 True 이면 겹모음과 겹받침도 키보드로 입력하는 단위로
+    분해합니다. ("값" -> "ㄱㅏㅂㅅ", "과" -> "ㄱㅗㅏ")
+    이 경우 입력 중인 글자의 분해 결과는 완성된 글자의 분해 결과의 접두사가 됩니다.
+    ("아멜" -> "ㅇㅏㅁㅔㄹ", "아메리" -> "ㅇㅏㅁㅔㄹㅣ")
+    """
+    if split_compound:
+        return input_str.translate(_SPLIT_JAMO_TABLE)
+    return input_str.translate(_JAMO_TABLE)
+
+
+def compose(jamo_str: str) -> str:
+    """
+    자모 문자열을 한글 음절로 조합합니다. ("ㄱㅏㅂㅅ" -> "값")
+
+    두벌식 키보드의 입력 순서를 따르므로, decompose() 의 결과뿐 아니라
+    겹모음과 겹받침이 분리된 자모 문자열도 조합할 수 있습니다.
+    조합할 수 없는 자모나 한글이 아닌 문자는 그대로 남습니다.
+    """
+    result = []
+    choseong = jungseong = jongseong = ""
+
+    def flush():
+        nonlocal choseong, jungseong, jongseong
+        if choseong and jungseong:
+            result.append(
+                chr(
+                    SYLLABLE_BASE
+                    + (
+                        _CHOSEONG_INDEX[choseong] * JUNGSEONG_COUNT
+                        + _JUNGSEONG_INDEX[jungseong]
+                    )
+                    * JONGSEONG_COUNT
+                    + (_JONGSEONG_INDEX[jongseong] if jongseong else 0)
+                )
+            )
+        else:
+            result.append(choseong + jungseong + jongseong)
+        choseong = jungseong = jongseong = ""
+
+    for char in jamo_str:
+        if char in _JUNGSEONG_INDEX:
+            if jongseong:
+                # 받침 뒤에 모음이 오면, 받침의 (마지막) 자음이 다음 글자의 초성이 됩니다.
+                split = COMPOUND_SPLITS.get(jongseong, jongseong)
+                jongseong, next_choseong = split[:-1], split[-1]
+                flush()
+                choseong, jungseong = next_choseong, char
+            elif jungseong and (jungseong, char) in COMPOUND_VOWELS:
+                jungseong = COMPOUND_VOWELS[(jungseong, char)]
+            elif jungseong:
+                flush()
+                jungseong = char
             else:
-                result += char
+                jungseong = char
+        elif char in _CHOSEONG_INDEX or char in _JONGSEONG_INDEX:
+            if choseong and jungseong and not jongseong and char in _JONGSEONG_INDEX:
+                jongseong = char
+            elif jongseong and (jongseong, char) in COMPOUND_FINALS:
+                jongseong = COMPOUND_FINALS[(jongseong, char)]
+            else:
+                flush()
+                if char in _CHOSEONG_INDEX:
+                    choseong = char
+                else:
+                    result.append(char)
         else:
-            result += char
+            flush()
+            result.append(char)
+    flush()
+    return "".join(result)
+
 
-    return result
+def to_keystrokes(input_str: str) -> str:
+    """
+    한글을 두벌식 자판에서 입력할 때 누르는 QWERTY 키로 변환합니다. ("카페" -> "zkvp")
+    한글이 아닌 문자는 그대로 반환합니다.
+    """
+    return input_str.translate(_KEYSTROKE_TABLE)
+
+
+def from_keystrokes(keys: str) -> str:
+    """
+    한/영 전환을 하지 않고 영문 자판 상태로 입력된 키를 한글로 변환합니다.
+    ("zkvp" -> "카페")
+    영문 알파벳이 아닌 문자는 그대로 반환합니다.
+    """
+    return compose(keys.translate(_JAMO_BY_KEY_TABLE))
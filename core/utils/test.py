@@ -1,8 +1,95 @@
+import tempfile
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from apps.authentication.tokens import CafehereRefreshToken
+
 
 class BaseAPITestCase(APITestCase):
+    def authenticate(self, user):
+        """
+        이후의 요청을 user 의 Access Token 으로 인증합니다.
+        API 는 JWT 로만 인증하므로 세션 로그인(force_login)은 사용할 수 없습니다.
+        """
+        token = CafehereRefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def use_shared_cache(self):
+        """
+        이 테스트 동안 CACHES 의 default 를 여러 프로세스가 함께 사용하는 파일 캐시로 바꿉니다.
+        테스트는 프로세스 메모리 캐시를 사용하므로, 공유 캐시가 필요한 기능을 테스트할 때 사용합니다.
+        """
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        caches = override_settings(
+            CACHES={
+                "default": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": temp_dir.name,
+                }
+            }
+        )
+        caches.enable()
+        self.addCleanup(caches.disable)
+
+    @contextmanager
+    def assertMaxQueries(self, num: int):
+        """
+        블록 안에서 실행된 쿼리의 수가 num 이하인지 테스트합니다.
+
+        엔드포인트마다 쿼리 수의 상한을 고정해 두면,
+        N+1 쿼리 등으로 쿼리 수가 늘어나는 변경을 테스트에서 잡아낼 수 있습니다.
+        """
+        with CaptureQueriesContext(connection) as context:
+            yield context
+
+        executed = len(context)
+        queries = "\n".join(
+            f"{index}. {query['sql']}"
+            for index, query in enumerate(context.captured_queries, start=1)
+        )
+        self.assertLessEqual(
+            executed,
+            num,
+            f"{executed} queries executed, at most {num} expected\n"
+            f"Captured queries were:\n{queries}",
+        )
+
+    @contextmanager
+    def assertUsesIndex(self, table: str, index: str):
+        """
+        블록 안에서 table 을 읽는 SELECT 쿼리들이 모두 index 를 사용하고,
+        정렬을 위한 임시 B-Tree 를 만들지 않는지 SQLite 의 실행 계획으로 테스트합니다.
+
+        페이지가 깊어지거나 데이터가 많아져도 테이블 전체를 읽거나
+        정렬(filesort)하지 않는지 확인하는 데 사용합니다.
+        """
+        if connection.vendor != "sqlite":
+            self.skipTest("EXPLAIN QUERY PLAN is only available on SQLite.")
+
+        with CaptureQueriesContext(connection) as context:
+            yield context
+
+        queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith("SELECT") and f'FROM "{table}"' in query["sql"]
+        ]
+        self.assertTrue(queries, f"No query read from {table}.")
+        for sql in queries:
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+                plan = "\n".join(row[-1] for row in cursor.fetchall())
+            message = f"{sql}\nQuery plan was:\n{plan}"
+            self.assertRegex(
+                plan, rf"SEARCH {table} USING (COVERING )?INDEX {index}\b", message
+            )
+            self.assertNotIn("USE TEMP B-TREE FOR ORDER BY", plan, message)
+
     def _test_response_format(self, response):
         """
         응답 포맷이 올바른지 테스트하는 메서드입니다.